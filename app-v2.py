@@ -1,250 +1,291 @@
-import streamlit as st
+import os
+import time
+
 import pandas as pd
-import plotly.express as px
+import streamlit as st
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+from painel.atualizador import Atualizador
+from painel.compartilhado import PlanoCompartilhado
+from painel.conversao import converter_tempo, formatar_tempo
+from painel.eventos import FonteEventos, endereco_socket
+from painel.fonte import PlanilhaRemota
+from painel.graficos import GRAFICOS_RANKING
+from painel.historico import AGREGACAO, Historico, mes_por_extenso
+from painel.incremental import ProcessadorIncremental, descrever_mudanca
+from painel.indicadores import opcoes, pagina_detalhe
+from painel.leitura import MEDICAO as MEDICAO_LEITOR, escolher_leitor, urls_csv
+from painel.mapeamento import ABAS
+from painel.medicao import REGISTRO, medir
+from painel.metas import META_NOTA, META_PERC, META_TME_CHAT, META_TME_PBX, estilos_metas, status_em_texto
+from painel.registro import FontesMultiplas, abas_registro, ler_registro
+from painel.snapshot import SnapshotsLocais
+from painel.visoes import CacheVisoes
 
 # --- Configuração da Página ---
 st.set_page_config(page_title="Dashboard de Performance", layout="wide", page_icon="🎯")
 
 SHEET_ID = "1ggF1WwNrdXBcWX6tPHyQ72zrB-0ItyjBImw3h2xVC5U"
-URL = f"https://docs.google.com/spreadsheets/d/{SHEET_ID}/export?format=xlsx"
+# PAINEL_URL troca a planilha (outra URL ou um .xlsx local, como nos benchmarks)
+URL = os.environ.get("PAINEL_URL", f"https://docs.google.com/spreadsheets/d/{SHEET_ID}/export?format=xlsx")
 
+# Leitor da planilha: "auto", "openpyxl", "calamine", "csv" (experimental) ou "completa" (ver painel.leitura).
+# "auto" usa o mais rápido medido por benchmarks/bench_leitores.py neste host.
+LEITOR = escolher_leitor(
+    os.environ.get("PAINEL_LEITOR", "auto"), medicao=os.environ.get("PAINEL_LEITOR_MEDICAO", MEDICAO_LEITOR)
+)
+
+# Intervalo da atualização em segundo plano
+ATUALIZACAO_SEGUNDOS = 60
+
+# Modo de eventos (ver painel.eventos), no lugar da planilha: arquivo JSON por linha seguido pelo painel
+# e/ou socket "host:porta"; as versões saem dos agregados correntes a cada EVENTOS_INTERVALO segundos
+EVENTOS_ARQUIVO = os.environ.get("PAINEL_EVENTOS", "")
+EVENTOS_ENDERECO = os.environ.get("PAINEL_EVENTOS_ENDERECO", "")
+EVENTOS_INTERVALO = float(os.environ.get("PAINEL_EVENTOS_INTERVALO", "2"))
+MODO_EVENTOS = bool(EVENTOS_ARQUIVO or EVENTOS_ENDERECO)
+
+# Registro de fontes (JSON, ver painel.registro): várias planilhas (operações, meses) baixadas em paralelo,
+# processadas num pool de processos (uma tarefa por planilha) e juntadas por aba; vazio usa só a planilha acima
+FONTES_REGISTRO = os.environ.get("PAINEL_FONTES", "")
+FONTES_PROCESSOS = int(os.environ.get("PAINEL_FONTES_PROCESSOS", "0")) or None  # 0: um por CPU
 
-# --- Funções utilitárias ---
-def converter_tempo(val):
-    try:
-        if pd.isna(val) or val == "-" or str(val).strip() == "":
-            return 0
-        if hasattr(val, "hour"):
-            return val.hour * 3600 + val.minute * 60 + val.second
-        partes = str(val).split(":")
-        if len(partes) == 3:
-            return int(partes[0]) * 3600 + int(partes[1]) * 60 + int(partes[2])
-        return 0
-    except:
-        return 0
-
-
-def formatar_tempo(segundos):
-    if segundos == 0:
-        return "-"
-    m, s = divmod(int(segundos), 60)
-    h, m = divmod(m, 60)
-    return f"{h:02d}:{m:02d}:{s:02d}"
-
-
-def limpar_porcentagem(val):
-    try:
-        if isinstance(val, (int, float)):
-            return float(val)
-        if isinstance(val, str):
-            v = val.replace("%", "").replace(",", ".").strip()
-            if v == "":
-                return 0.0
-            f = float(v)
-            return f / 100 if f > 1 else f
-        return 0.0
-    except:
-        return 0.0
-
-
-def to_num(s):
-    return pd.to_numeric(s, errors="coerce").fillna(0)
-
-
-def col_exists(df, name):
-    return name in df.columns
-
-
-def get_id_cols(df):
-    cols = list(df.columns)
-
-    def pick_by_candidates(cands, fallback_idx, default_val):
-        for c in cands:
-            if c in cols:
-                return df[c]
-        if len(cols) > fallback_idx:
-            return df.iloc[:, fallback_idx]
-        return pd.Series([default_val] * len(df))
-
-    nome = pick_by_candidates(["nome", "colaborador", "atendente"], 0, "N/A")
-    equipe = pick_by_candidates(["equipe", "time", "squad"], 3, "Geral")
-    horario = pick_by_candidates(["horario", "turno", "escala"], 4, "-")
-    return nome, equipe, horario
-
-
-# --- Mapeamentos de filas (por aba) ---
-FILAS_CHAT = {
-    "Suporte": [
-        ("Suporte", "qtde_chat_suporte", "tme_chat_suporte"),
-        ("Incidentes", "qtde_chat_incidentes", "tme_chat_incidentes"),
-        ("Visitas", "qtde_chat_visitas", "tme_chat_visitas"),
-        ("Migração BR", "qtde_chat_migracao_br", "tme_chat_migracao_br"),
-    ],
-    "SAC": [
-        ("Relacionamento", "qtde_chat_relacionamento", "tme_chat_relacionamento"),
-        ("Bloqueios", "qtde_chat_bloqueios", "tme_chat_bloqueios"),
-        ("Visitas", "qtde_chat_visitas", "tme_chat_visitas"),
-        ("Migração BR", "qtde_chat_migracao_br", "tme_chat_migracao_br"),
-    ],
-}
-
-COLS_PBX = [
-    ("PBX Recebidas", "qtde_pbx_r"),
-    ("PBX Efetuadas", "qtde_pbx_e"),
-]
-
-
-@st.cache_data(ttl=60)
-def load_data():
-    try:
-        xls = pd.read_excel(URL, sheet_name=None)
 
-        def processar_aba(df, nome_aba):
-            df = df.dropna(how="all", axis=1).dropna(how="all", axis=0)
-            df.columns = [str(c).lower().strip() for c in df.columns]
+@st.cache_resource
+def get_fontes():
+    # O JSON é lido uma vez por processo, não a cada rerun
+    return ler_registro(FONTES_REGISTRO) if FONTES_REGISTRO else []
 
-            data = pd.DataFrame()
 
-            # Identificação
-            nome, equipe, horario = get_id_cols(df)
-            data["Nome"] = nome.astype(str)
-            data["Equipe"] = equipe.astype(str)
-            data["Horario"] = horario.astype(str)
+MODO_REGISTRO = bool(FONTES_REGISTRO) and not MODO_EVENTOS and bool(get_fontes())
 
-            # Totais (base das metas)
-            data["Chat"] = to_num(df["qtde_chat_total"]) if col_exists(df, "qtde_chat_total") else 0
-            data["Total (PBX)"] = to_num(df["total_pbx"]) if col_exists(df, "total_pbx") else 0
+# Abas exibidas (as do registro, quando houver)
+ABAS_PAINEL = abas_registro(get_fontes()) if MODO_REGISTRO else ABAS
 
-            # Notas / % (chat) e nota PBX (mantido)
-            data["Chat (nota)"] = to_num(df["nota_chat"]) if col_exists(df, "nota_chat") else 0
-            data["Chat (nota)"] = data["Chat (nota)"].apply(lambda x: x / 10 if x > 5 else x)
-            data["Nota (%)"] = df["%_nota_chat"].apply(limpar_porcentagem) if col_exists(df, "%_nota_chat") else 0.0
+# Snapshots locais (Parquet) para reinícios sem esperar o download
+SNAPSHOTS_DIR = os.environ.get("PAINEL_SNAPSHOTS_DIR", ".snapshots")
+SNAPSHOTS_MANTER = int(os.environ.get("PAINEL_SNAPSHOTS_MANTER", "5"))
 
-            data["PBX (nota)"] = to_num(df["nota_pbx"]) if col_exists(df, "nota_pbx") else 0
-            data["PBX (nota)"] = data["PBX (nota)"].apply(lambda x: x / 10 if x > 5 else x)
+# Plano de dados compartilhado entre os processos do host (vazio desliga): um só baixa e processa,
+# os outros mapeiam os frames publicados em Arrow (ver painel.compartilhado)
+COMPARTILHADO_DIR = os.environ.get("PAINEL_COMPARTILHADO_DIR", "")
 
-            # TMEs totais (base das metas)
-            data["Chat (TME) [s]"] = df["tme_chat"].apply(converter_tempo) if col_exists(df, "tme_chat") else 0
-            data["PBX (TME) [s]"] = df["tme_pbx"].apply(converter_tempo) if col_exists(df, "tme_pbx") else 0
+# Botão "Atualizar Dados": intervalo mínimo entre duas buscas pedidas por usuários (no processo todo)
+ATUALIZAR_INTERVALO_MINIMO = int(os.environ.get("PAINEL_ATUALIZAR_MINIMO", "30"))
 
-            # --- Nota / % PBX (para exibição no detalhamento) ---
-            data["PBX (nota)"] = to_num(df["nota_pbx"]) if col_exists(df, "nota_pbx") else 0
-            data["PBX (nota)"] = data["PBX (nota)"].apply(lambda x: x / 10 if x > 5 else x)
+# Histórico de cargas (Parquet particionado por aba/mês/dia) para as tendências; dias mantidos (0 = todos)
+HISTORICO_DIR = os.environ.get("PAINEL_HISTORICO_DIR", ".historico")
+HISTORICO_DIAS = int(os.environ.get("PAINEL_HISTORICO_DIAS", "400"))
 
-            data["PBX Nota (%)"] = df["%_nota_pbx"].apply(limpar_porcentagem) if col_exists(df, "%_nota_pbx") else 0.0
+# Visões derivadas (filtro, KPIs, rankings, gráficos, metas) guardadas por versão/filtro/metas, para todas as sessões
+VISOES_MAXIMO = int(os.environ.get("PAINEL_VISOES_MAXIMO", "256"))
 
-            # Detalhamento por fila (somente exibição)
-            for label, col_qtd, col_tme in FILAS_CHAT.get(nome_aba, []):
-                data[f"Chat - {label}"] = to_num(df[col_qtd]) if col_exists(df, col_qtd) else 0
-                data[f"TME - {label} [s]"] = df[col_tme].apply(converter_tempo) if col_exists(df, col_tme) else 0
+# Só a aba selecionada é calculada e desenhada a cada rerun ("0" volta a desenhar as duas)
+SO_ABA_ATIVA = os.environ.get("PAINEL_SO_ABA_ATIVA", "1") != "0"
 
-            for label, col_qtd in COLS_PBX:
-                data[label] = to_num(df[col_qtd]) if col_exists(df, col_qtd) else 0
+# Tamanhos de ranking oferecidos nos gráficos
+TOP_OPCOES = [10, 25, 50]
 
-            return data
+# Linhas por página no detalhamento por fila
+DETALHE_PAGINAS = [50, 100, 250]
 
-        if "Suporte" not in xls or "SAC" not in xls:
-            raise Exception("As abas 'Suporte' e/ou 'SAC' não foram encontradas na planilha.")
+# Painel "Performance" (opcional, na barra lateral): quantas medições recentes mostrar
+PERFORMANCE_ULTIMAS = 20
 
-        return processar_aba(xls["Suporte"], "Suporte"), processar_aba(xls["SAC"], "SAC")
+# Mudanças de meta (feed do processamento incremental) avisadas por rerun; o resto vira um aviso só
+MUDANCAS_AVISOS = 5
+
+# Acima disso a tabela de metas é exibida sem Styler (status em colunas de texto)
+LIMITE_LINHAS_ESTILO = 2000
+
+
+@st.cache_resource
+def get_planilha():
+    if MODO_EVENTOS:
+        # Sem snapshots: num reinício, o arquivo de eventos reconstrói os agregados
+        planilha = FonteEventos(ABAS, EVENTOS_ARQUIVO or None, endereco_socket(EVENTOS_ENDERECO))
+    elif MODO_REGISTRO:
+        planilha = FontesMultiplas(
+            get_fontes(), LEITOR, snapshots_dir=SNAPSHOTS_DIR, snapshots_manter=SNAPSHOTS_MANTER, processos=FONTES_PROCESSOS
+        )
+    else:
+        snapshots = SnapshotsLocais(SNAPSHOTS_DIR, abas=ABAS, manter=SNAPSHOTS_MANTER)
+        # O leitor "csv" baixa um CSV por aba em vez do xlsx inteiro
+        url = urls_csv(SHEET_ID, ABAS) if LEITOR == "csv" else URL
+        planilha = PlanilhaRemota(url, snapshots=snapshots)
+    if COMPARTILHADO_DIR:
+        return PlanoCompartilhado(COMPARTILHADO_DIR, planilha, ABAS_PAINEL)
+    return planilha
+
+
+@st.cache_resource
+def get_processador():
+    # Guarda as abas da última versão: só linhas novas ou alteradas são reprocessadas
+    return ProcessadorIncremental(LEITOR, ABAS)
+
+
+@st.cache_resource
+def get_historico():
+    return Historico(HISTORICO_DIR, manter_dias=HISTORICO_DIAS)
+
+
+@st.cache_resource
+def get_visoes():
+    return CacheVisoes(maximo=VISOES_MAXIMO)
+
+
+@st.cache_resource
+def get_atualizador():
+    # Uma thread por processo do servidor; as sessões só leem a última versão publicada
+    historico = get_historico()
+    visoes = get_visoes()
+    processador = get_processador()
+    ultima = {}
+
+    def registrar(pub):
+        # Índices da versão nova derivados dos da anterior onde só algumas linhas mudaram
+        anterior = ultima.get("pub")
+        if anterior is not None:
+            for aba, antes, depois in zip(ABAS_PAINEL, anterior.resultado, pub.resultado):
+                posicoes = processador.alteradas(aba, antes, depois)
+                if posicoes is not None:
+                    visoes.avancar(anterior.versao, pub.versao, aba, depois, posicoes)
+        ultima["pub"] = pub
+        visoes.descartar_outras_versoes(pub.versao)
+        # Com o plano compartilhado, só o processo coordenador grava o histórico; com eventos (uma versão
+        # a cada poucos segundos), no máximo uma carga por ATUALIZACAO_SEGUNDOS
+        if not getattr(planilha, "coordenador", True):
+            return
+        if MODO_EVENTOS and pub.criado_em - ultima.get("historico", 0) < ATUALIZACAO_SEGUNDOS:
+            return
+        ultima["historico"] = pub.criado_em
+        historico.registrar(pub.versao, pub.resultado, ABAS_PAINEL, quando=pub.criado_em)
+
+    planilha = get_planilha()
+    intervalo = EVENTOS_INTERVALO if MODO_EVENTOS else ATUALIZACAO_SEGUNDOS
+
+    return Atualizador(planilha, processador, intervalo=intervalo, ao_publicar=registrar).iniciar()
+
+
+def sessao_atual():
+    ctx = get_script_run_ctx()
+    return ctx.session_id[:8] if ctx else None
+
+
+def load_data():
+    atualizador = get_atualizador()
+    publicado = atualizador.publicado()
+    # "acerto": a sessão leu a versão já publicada; "falta": precisou esperar a busca
+    REGISTRO.contar("load_data", "acerto" if publicado is not None else "falta")
+    try:
+        if publicado is None:
+            # Primeira carga do processo: aguarda a busca em andamento (sem abrir outra)
+            publicado = atualizador.atualizar()
+        return publicado
 
     except Exception as e:
         st.error(f"Erro ao carregar dados: {e}")
-        return None, None
+        return None
+
+
+def formatar_idade(epoch):
+    segundos = max(0, time.time() - epoch)
+    if segundos < 60:
+        return f"{segundos:.0f} s"
+    if segundos < 3600:
+        return f"{segundos // 60:.0f} min"
+    return f"{segundos // 3600:.0f} h {segundos % 3600 // 60:.0f} min"
+
+
+def render_versao(container, publicado):
+    # Versão e idade dos dados à vista: ninguém precisa clicar em "Atualizar" para saber se está em dia
+    atualizador = get_atualizador()
+    texto = f"Dados da versão `{publicado.versao[:8]}`, processada há {formatar_idade(publicado.criado_em)}"
+    if atualizador.conferido_em is not None:
+        texto += f" · {'eventos conferidos' if MODO_EVENTOS else 'planilha conferida'} há {formatar_idade(atualizador.conferido_em)}"
+    if atualizador.erro is not None:
+        texto += " · ⚠️ a última conferência falhou"
+    container.caption(texto)
+
+
+def render_mudancas():
+    # Agentes que bateram ou saíram de uma meta padrão desde o último rerun desta sessão
+    processador = get_processador()
+    vistas = st.session_state.setdefault("mudancas_vistas", processador.ultima_seq)
+    novas = processador.mudancas(vistas)
+    if not novas:
+        return
+    st.session_state["mudancas_vistas"] = novas[-1].seq
+    for m in novas[-MUDANCAS_AVISOS:]:
+        st.toast(descrever_mudanca(m), icon="🟢" if m.bateu else "🔴")
+    if len(novas) > MUDANCAS_AVISOS:
+        st.toast(f"E mais {len(novas) - MUDANCAS_AVISOS} mudanças de meta desde a última atualização.")
 
 
-def render_tab(df, titulo, meta_nota, meta_tme_chat_seg, meta_tme_pbx_seg, meta_perc):
+def render_graficos(titulo, graficos, top):
+    # Figuras prontas do cache de visões (None = ranking sem ninguém elegível)
+    for linha in (("nota_chat", "nota_pbx"), ("volume_chat", "volume_pbx")):
+        for coluna, nome in zip(st.columns(2), linha):
+            with coluna:
+                st.markdown(f"**{GRAFICOS_RANKING[nome][0].format(n=top)}**")
+                if graficos[nome] is not None:
+                    st.plotly_chart(graficos[nome], use_container_width=True, key=f"g_{nome}_{titulo}")
+
+
+def manter_estado(titulo):
+    # Widgets que não aparecem num rerun perdem o valor; regravar as chaves da aba fechada preserva os filtros dela
+    for chave in [k for k in st.session_state if str(k).endswith(f"_{titulo}")]:
+        st.session_state[chave] = st.session_state[chave]
+
+
+@st.fragment
+def fragmento_aba(df, titulo, versao, meta_nota, meta_tme_chat_seg, meta_tme_pbx_seg, meta_perc):
+    # Widgets da aba (filtros, top N, detalhamento, histórico) reexecutam só este trecho, sem a barra lateral,
+    # o load_data e a outra aba; mudar uma meta na barra lateral ainda reexecuta o app (tudo vem do cache)
+    with medir("aba", sessao_atual(), aba=titulo):
+        render_tab(df, titulo, versao, meta_nota, meta_tme_chat_seg, meta_tme_pbx_seg, meta_perc)
+
+
+def render_tab(df, titulo, versao, meta_nota, meta_tme_chat_seg, meta_tme_pbx_seg, meta_perc):
+    sessao = sessao_atual()
+    visoes = get_visoes()
+
     # 1. Filtros
     c1, c2 = st.columns(2)
-    equipes = sorted(list(df["Equipe"].dropna().unique()))
+    equipes = opcoes(df["Equipe"])
     sel_equipe = c1.multiselect(f"Equipe ({titulo})", equipes, default=equipes, key=f"eq_{titulo}")
 
-    horarios = sorted(list(df["Horario"].astype(str).dropna().unique()))
+    horarios = opcoes(df["Horario"])
     sel_horario = c2.multiselect(f"Horário ({titulo})", horarios, default=horarios, key=f"hr_{titulo}")
 
-    dff = df[df["Equipe"].isin(sel_equipe) & df["Horario"].astype(str).isin(sel_horario)].copy()
+    # Filtro, KPIs, rankings e tabela de metas: recalculados só para combinações novas
+    with medir("visao", sessao, aba=titulo) as m:
+        visao = visoes.visao(versao, titulo, df, sel_equipe, sel_horario)
+        m.linhas = len(visao.dff)
+    dff, kpis = visao.dff, visao.kpis
     if dff.empty:
         st.warning("Sem dados para os filtros selecionados.")
         return
 
     # 2. Metas dinâmicas (continuam no total)
-    media_vol_chat = dff["Chat"].mean()
-    media_vol_pbx = dff["Total (PBX)"].mean()
+    media_vol_chat, media_vol_pbx = kpis.media_vol_chat, kpis.media_vol_pbx
 
     # 3. KPIs
     st.markdown("### 🎯 Visão Geral")
     k1, k2, k3, k4 = st.columns(4)
-    k1.metric("Total de Atendimentos (chat)", f"{dff['Chat'].sum():,.0f}")
-    k2.metric("Nota Média (chat)", f"{dff[dff['Chat'] > 0]['Chat (nota)'].mean():.2f}")
-    k3.metric("Total de Atendimentos (PBX)", f"{dff['Total (PBX)'].sum():,.0f}")
-    k4.metric("Nota Média (PBX)", f"{dff[dff['Total (PBX)'] > 0]['PBX (nota)'].mean():.2f}")
+    k1.metric("Total de Atendimentos (chat)", f"{kpis.total_chat:,.0f}")
+    k2.metric("Nota Média (chat)", f"{kpis.nota_chat:.2f}")
+    k3.metric("Total de Atendimentos (PBX)", f"{kpis.total_pbx:,.0f}")
+    k4.metric("Nota Média (PBX)", f"{kpis.nota_pbx:.2f}")
     st.markdown("---")
 
-    # 4. Gráficos (Rankings - continuam no total)
-    g1, g2 = st.columns(2)
-    with g1:
-        st.markdown("**⭐ Top 10 Notas (chat)**")
-        top_n = dff[dff["Chat"] > 0].nlargest(10, "Chat (nota)")
-        if not top_n.empty:
-            st.plotly_chart(
-                px.bar(
-                    top_n.sort_values("Chat (nota)"),
-                    x="Chat (nota)",
-                    y="Nome",
-                    orientation="h",
-                    text_auto=".2f",
-                    color_discrete_sequence=["#2ecc71"],
-                ),
-                use_container_width=True,
-                key=f"gnc_{titulo}",
-            )
-
-    with g2:
-        st.markdown("**⭐ Top 10 Notas (PBX)**")
-        top_np = dff[dff["Total (PBX)"] > 0].nlargest(10, "PBX (nota)")
-        if not top_np.empty:
-            st.plotly_chart(
-                px.bar(
-                    top_np.sort_values("PBX (nota)"),
-                    x="PBX (nota)",
-                    y="Nome",
-                    orientation="h",
-                    text_auto=".2f",
-                    color_discrete_sequence=["#9b59b6"],
-                ),
-                use_container_width=True,
-                key=f"gnp_{titulo}",
-            )
-
-    r1, r2 = st.columns(2)
-    with r1:
-        st.markdown("**🏆 Top 10 Volume (chat total)**")
-        st.plotly_chart(
-            px.bar(
-                dff.nlargest(10, "Chat").sort_values("Chat"),
-                x="Chat",
-                y="Nome",
-                orientation="h",
-                text="Chat",
-                color_discrete_sequence=["#3498db"],
-            ),
-            use_container_width=True,
-            key=f"gvc_{titulo}",
-        )
-    with r2:
-        st.markdown("**📞 Top 10 Volume (PBX total)**")
-        st.plotly_chart(
-            px.bar(
-                dff.nlargest(10, "Total (PBX)").sort_values("Total (PBX)"),
-                x="Total (PBX)",
-                y="Nome",
-                orientation="h",
-                text="Total (PBX)",
-                color_discrete_sequence=["#e67e22"],
-            ),
-            use_container_width=True,
-            key=f"gvp_{titulo}",
-        )
+    # 4. Gráficos (Rankings - continuam no total); o top N sai das ordens pré-calculadas da versão
+    top = st.radio(
+        f"Ranking ({titulo})", TOP_OPCOES, horizontal=True, format_func=lambda n: f"Top {n}", key=f"top_{titulo}"
+    )
+    with medir("graficos", sessao, aba=titulo):
+        graficos = {nome: visoes.grafico(versao, titulo, df, sel_equipe, sel_horario, nome, top) for nome in GRAFICOS_RANKING}
+        render_graficos(titulo, graficos, top)
 
     st.markdown("---")
 
@@ -261,199 +302,237 @@ def render_tab(df, titulo, meta_nota, meta_tme_chat_seg, meta_tme_pbx_seg, meta_
     )
 
     # --- Tabela "principal" enxuta (só o necessário para metas + visão geral) ---
-    base_cols = [
-        "Nome", "Equipe", "Horario",
-        "Chat", "Chat (nota)", "Nota (%)", "Chat (TME) [s]",
-        "Total (PBX)", "PBX (TME) [s]",
-    ]
-    base_cols = [c for c in base_cols if c in dff.columns]
-    resumo = dff[base_cols].copy()
-
-    resumo["Chat (TME)"] = resumo["Chat (TME) [s]"].apply(formatar_tempo)
-    resumo["PBX (TME)"] = resumo["PBX (TME) [s]"].apply(formatar_tempo)
-
-    colunas_visiveis = ["Nome", "Equipe", "Horario", "Chat", "Chat (nota)", "Nota (%)", "Chat (TME)", "Total (PBX)", "PBX (TME)"]
-    colunas_visiveis = [c for c in colunas_visiveis if c in resumo.columns]
-    colunas_calculo = ["Chat (TME) [s]", "PBX (TME) [s]"]
-    colunas_calculo = [c for c in colunas_calculo if c in resumo.columns]
-
-    resumo = resumo[colunas_visiveis + colunas_calculo]
-
-    def highlight_metas(row):
-        styles = [""] * len(row)
-        idx = {col: i for i, col in enumerate(row.index)}
-
-        def paint(col, ok):
-            if col not in idx:
-                return
-            styles[idx[col]] = "background-color: #d4edda; color: green" if ok else "background-color: #f8d7da; color: red"
-
-        paint("Chat", row.get("Chat", 0) >= media_vol_chat)
-        paint("Chat (nota)", row.get("Chat (nota)", 0) >= meta_nota)
-        paint("Nota (%)", row.get("Nota (%)", 0) >= meta_perc)
-
-        v_chat = row.get("Chat (TME) [s]", 0)
-        if "Chat (TME)" in idx:
-            if v_chat > 0 and v_chat <= meta_tme_chat_seg:
-                styles[idx["Chat (TME)"]] = "background-color: #d4edda; color: green"
-            elif v_chat == 0:
-                styles[idx["Chat (TME)"]] = ""
-            else:
-                styles[idx["Chat (TME)"]] = "background-color: #f8d7da; color: red"
-
-        paint("Total (PBX)", row.get("Total (PBX)", 0) >= media_vol_pbx)
-
-        v_pbx = row.get("PBX (TME) [s]", 0)
-        if "PBX (TME)" in idx:
-            if v_pbx > 0 and v_pbx <= meta_tme_pbx_seg:
-                styles[idx["PBX (TME)"]] = "background-color: #d4edda; color: green"
-            elif v_pbx == 0:
-                styles[idx["PBX (TME)"]] = ""
-            else:
-                styles[idx["PBX (TME)"]] = "background-color: #f8d7da; color: red"
-
-        return styles
-
-    st_df = (
-        resumo.style.apply(highlight_metas, axis=1)
-        .format({"Chat": "{:.0f}", "Chat (nota)": "{:.2f}", "Nota (%)": "{:.1%}", "Total (PBX)": "{:.0f}"})
+    resumo, colunas_visiveis = visao.resumo, visao.colunas_visiveis
+
+    # Metas avaliadas por coluna inteira (máscaras), não linha a linha
+    status = visoes.status_metas(
+        versao, titulo, df, sel_equipe, sel_horario, (meta_nota, meta_perc, meta_tme_chat_seg, meta_tme_pbx_seg)
+    )
+
+    # Styler (ou colunas de status) + serialização da tabela pelo st.dataframe
+    with medir("tabela_metas", sessao, linhas=len(resumo), aba=titulo):
+        if len(resumo) <= LIMITE_LINHAS_ESTILO:
+            st_df = (
+                resumo.style.apply(estilos_metas, status=status, axis=None)
+                .format({"Chat": "{:.0f}", "Chat (nota)": "{:.2f}", "Nota (%)": "{:.1%}", "Total (PBX)": "{:.0f}"})
+            )
+
+            st.dataframe(
+                st_df,
+                column_order=colunas_visiveis,
+                hide_index=True,
+                use_container_width=True,
+                height=520,
+            )
+        else:
+            # Equipes grandes: sem Styler (CSS por célula); o status vai numa coluna ao lado de cada métrica
+            sinais = status_em_texto(status)
+            colunas_status = []
+            for col in colunas_visiveis:
+                colunas_status.append(col)
+                if col in sinais.columns:
+                    colunas_status.append(f"Meta {col}")
+
+            st.dataframe(
+                # O resumo vem do cache compartilhado: as colunas de status vão numa cópia
+                resumo.assign(**{f"Meta {col}": sinais[col] for col in sinais.columns}),
+                column_order=colunas_status,
+                column_config={
+                    "Chat": st.column_config.NumberColumn(format="%.0f"),
+                    "Chat (nota)": st.column_config.NumberColumn(format="%.2f"),
+                    "Nota (%)": st.column_config.NumberColumn(format="percent"),
+                    "Total (PBX)": st.column_config.NumberColumn(format="%.0f"),
+                },
+                hide_index=True,
+                use_container_width=True,
+                height=520,
+            )
+
+    # --- EXPANDER: detalhamento por fila (exibição) ---
+    # Com estado (key + on_change): a tabela só é montada com o expander aberto
+    detalhe = st.expander(
+        "🔎 Ver detalhamento por fila (somente exibição)", expanded=False, key=f"det_{titulo}", on_change="rerun"
     )
+    if detalhe.open:
+        with detalhe:
+            render_detalhe(titulo, versao, df, sel_equipe, sel_horario)
+
+    # --- EXPANDER: tendência a partir do histórico de cargas ---
+    # Também com estado: fechado, não lista as partições nem consulta o histórico
+    historico = st.expander(
+        "📈 Histórico (tendência por agente ou equipe)", expanded=False, key=f"hist_{titulo}", on_change="rerun"
+    )
+    if historico.open:
+        with historico:
+            render_historico(dff, titulo, versao, sel_equipe)
+
 
+def render_detalhe(titulo, versao, df, sel_equipe, sel_horario):
+    # Ordenação e paginação no servidor: só a página atual é formatada e enviada ao navegador
+    visoes = get_visoes()
+    det, fmt = visoes.detalhe(versao, titulo, df, sel_equipe, sel_horario)
+
+    d1, d2, d3, d4 = st.columns([3, 2, 2, 2])
+    coluna = d1.selectbox("Ordenar por", [None] + list(det.columns), format_func=lambda c: c or "(original)", key=f"do_{titulo}")
+    crescente = d2.radio("Ordem", [True, False], horizontal=True, format_func=lambda c: "↑" if c else "↓", key=f"dc_{titulo}")
+    tamanho = d3.selectbox("Linhas por página", DETALHE_PAGINAS, key=f"dt_{titulo}")
+    paginas = max(1, -(-len(det) // tamanho))
+    pagina = d4.number_input(f"Página (de {paginas})", 1, paginas, key=f"dp_{titulo}") - 1
+
+    ordem = visoes.ordem_detalhe(versao, titulo, df, sel_equipe, sel_horario, coluna, crescente)
+    pag = pagina_detalhe(det, ordem, pagina, tamanho)
     st.dataframe(
-        st_df,
-        column_order=colunas_visiveis,
+        pag.style.format({c: f for c, f in fmt.items() if c in pag.columns}),
         hide_index=True,
         use_container_width=True,
-        height=520,
+        height=420,
     )
+    st.caption(f"Linhas {pagina * tamanho + 1}–{pagina * tamanho + len(pag)} de {len(det)}")
 
-    # --- EXPANDER: detalhamento por fila (exibição) ---
-    with st.expander("🔎 Ver detalhamento por fila (somente exibição)", expanded=False):
-        # Define a ordem por aba
-        ordem = {
-            "Suporte": [
-                "Chat - Suporte", "Chat - Incidentes", "Chat - Visitas", "Chat - Migração BR", "Chat - Total",
-                "TME - Suporte", "TME - Incidentes", "TME - Visitas", "TME - Migração BR", "TME - Média",
-                "PBX - Recebidas", "PBX - Efetuadas", "PBX - Total", "PBX - TME",
-                "Chat - Nota", "Chat - % Nota", "PBX - Nota", "PBX - % Nota",
-            ],
-            "SAC": [
-                "Chat - Relacionamento", "Chat - Bloqueios", "Chat - Visitas", "Chat - Migração BR", "Chat - Total",
-                "TME - Relacionamento", "TME - Bloqueios", "TME - Visitas", "TME - Migração BR", "TME - Média",
-                "PBX - Recebidas", "PBX - Efetuadas", "PBX - Total", "PBX - TME",
-                "Chat - Nota", "Chat - % Nota", "PBX - Nota", "PBX - % Nota",
-            ],
-        }
-
-        # Mapeia colunas do seu DF -> nomes de exibição no detalhamento
-        filas = FILAS_CHAT.get(titulo, [])  # lista de tuplas: (label, col_qtd, col_tme)
-
-        # Começa com "Nome/Equipe/Horario" (se você quiser ocultar, é só remover daqui)
-        det = dff[["Nome", "Equipe", "Horario"]].copy()
-
-        # CHAT por fila (volumes)
-        for label, _, _ in filas:
-            src = f"Chat - {label}"           # já existe no DF
-            dst = f"Chat - {label}"           # nome de exibição
-            if src in dff.columns:
-                det[dst] = dff[src]
-            else:
-                det[dst] = 0
-
-        # CHAT total
-        det["Chat - Total"] = dff["Chat"] if "Chat" in dff.columns else 0
-
-        # TME por fila (formatado)
-        for label, _, _ in filas:
-            src_s = f"TME - {label} [s]"      # já existe no DF
-            dst = f"TME - {label}"            # exibição
-            if src_s in dff.columns:
-                det[dst] = dff[src_s].apply(formatar_tempo)
-            else:
-                det[dst] = "-"
-
-        # TME média (tme_chat) -> do seu DF: "Chat (TME) [s]"
-        if "Chat (TME) [s]" in dff.columns:
-            det["TME - Média"] = dff["Chat (TME) [s]"].apply(formatar_tempo)
-        else:
-            det["TME - Média"] = "-"
 
-        # PBX volumes
-        det["PBX - Recebidas"] = dff["PBX Recebidas"] if "PBX Recebidas" in dff.columns else 0
-        det["PBX - Efetuadas"] = dff["PBX Efetuadas"] if "PBX Efetuadas" in dff.columns else 0
-        det["PBX - Total"] = dff["Total (PBX)"] if "Total (PBX)" in dff.columns else 0
+def render_historico(dff, titulo, versao, sel_equipe):
+    historico = get_historico()
+    dias = historico.dias(titulo)
+    if not dias:
+        st.info("Ainda não há cargas registradas no histórico.")
+        return
 
-        # PBX TME
-        if "PBX (TME) [s]" in dff.columns:
-            det["PBX - TME"] = dff["PBX (TME) [s]"].apply(formatar_tempo)
+    h1, h2, h3 = st.columns(3)
+    metricas = [c for c in AGREGACAO if c in dff.columns]
+    metrica = h1.selectbox("Métrica", metricas, key=f"hm_{titulo}")
+    periodo = h2.date_input(
+        "Período", (max(dias[0], dias[-1].replace(day=1)), dias[-1]),
+        min_value=dias[0], max_value=dias[-1], key=f"hp_{titulo}",
+    )
+    visao = h3.radio("Visão", ["Equipe", "Agente"], horizontal=True, key=f"hv_{titulo}")
+    if not isinstance(periodo, (list, tuple)) or len(periodo) != 2:
+        st.caption("Selecione o início e o fim do período.")
+        return
+    inicio, fim = periodo
+
+    if visao == "Agente":
+        selecao = st.multiselect(
+            "Agentes", sorted(dff["Nome"].dropna().unique()),
+            default=list(dff.nlargest(5, "Chat")["Nome"]), key=f"ha_{titulo}",
+        )
+    else:
+        selecao = sel_equipe
+
+    # Figura guardada por versão, seleção, período e arquivos do histórico
+    figura = get_visoes().tendencia(versao, titulo, historico, visao, selecao, metrica, inicio, fim)
+    if figura is None:
+        st.info("Sem histórico para a seleção.")
+        return
+    st.plotly_chart(figura, use_container_width=True, key=f"gh_{titulo}")
+
+
+def render_performance():
+    """Painel lateral com os tempos recentes por etapa, os da sessão e os acertos de cache."""
+    with st.sidebar:
+        st.markdown("### ⏱️ Performance")
+        contadores = REGISTRO.contadores()
+        cache = contadores.get("load_data", {})
+        c1, c2 = st.columns(2)
+        c1.metric("load_data: acertos", cache.get("acerto", 0))
+        c2.metric("load_data: faltas", cache.get("falta", 0))
+        fonte = get_planilha()
+        fonte = getattr(fonte, "planilha", fonte)  # por baixo do plano compartilhado
+        if isinstance(fonte, FonteEventos):
+            st.caption(f"Eventos: {fonte.eventos} aplicado(s), {fonte.invalidos} inválido(s)")
+        elif isinstance(fonte, FontesMultiplas):
+            planilha = contadores.get("planilha", {})
+            st.caption(
+                f"Fontes: {len(fonte.fontes)} planilha(s), {contadores.get('fontes', {}).get('nova', 0)} versão(ões) "
+                f"nova(s); {planilha.get('nova', 0)} download(s), {planilha.get('sem_mudanca', 0)} sem mudança"
+            )
         else:
-            det["PBX - TME"] = "-"
-
-        # Notas e percentuais
-        det["Chat - Nota"] = dff["Chat (nota)"] if "Chat (nota)" in dff.columns else 0
-        det["Chat - % Nota"] = dff["Nota (%)"] if "Nota (%)" in dff.columns else 0.0
-        det["PBX - Nota"] = dff["PBX (nota)"] if "PBX (nota)" in dff.columns else 0
-        det["PBX - % Nota"] = dff["PBX Nota (%)"] if "PBX Nota (%)" in dff.columns else 0.0
-
-        # Ordena colunas exatamente como solicitado (mantendo Nome/Equipe/Horario no começo)
-        ordem_cols = ordem.get(titulo, [])
-        colunas_visiveis = ["Nome", "Equipe", "Horario"] + ordem_cols
-
-        # Garante que só vai exibir o que existe
-        colunas_visiveis = [c for c in colunas_visiveis if c in det.columns]
-        det = det[colunas_visiveis]
-
-        # Formatação
-        fmt = {}
-        for c in det.columns:
-            if c.startswith("Chat - ") and c not in ["Chat - % Nota", "Chat - Nota"]:
-                fmt[c] = "{:.0f}"
-            if c.startswith("PBX - ") and c not in ["PBX - TME", "PBX - % Nota", "PBX - Nota"]:
-                fmt[c] = "{:.0f}"
-
-        fmt.update({
-            "Chat - Nota": "{:.2f}",
-            "Chat - % Nota": "{:.1%}",
-            "PBX - Nota": "{:.2f}",
-            "PBX - % Nota": "{:.1%}",
-        })
-
-        st.dataframe(
-            det.style.format(fmt),
-            hide_index=True,
-            use_container_width=True,
-            height=420,
+            planilha = contadores.get("planilha", {})
+            st.caption(
+                f"Planilha: {planilha.get('nova', 0)} versão(ões) nova(s), "
+                f"{planilha.get('sem_mudanca', 0)} conferência(s) sem mudança"
+            )
+        pedidos = contadores.get("solicitar", {})
+        st.caption(
+            f"Botão Atualizar: {pedidos.get('busca', 0)} busca(s), {pedidos.get('coalescido', 0)} coalescido(s), "
+            f"{pedidos.get('limitado', 0)} limitado(s)"
         )
+        visoes = contadores.get("visoes", {})
+        st.caption(
+            f"Visões: {visoes.get('acerto', 0)} acerto(s), {visoes.get('falta', 0)} falta(s), "
+            f"{len(get_visoes())}/{VISOES_MAXIMO} em cache"
+        )
+
+        resumo = REGISTRO.resumo(PERFORMANCE_ULTIMAS)
+        if resumo:
+            st.markdown(f"**Por etapa (últimas {PERFORMANCE_ULTIMAS})**")
+            st.dataframe(
+                pd.DataFrame(resumo, columns=["Etapa", "Execuções", "Última (ms)", "Média (ms)", "Máx. (ms)"]),
+                column_config={c: st.column_config.NumberColumn(format="%.1f") for c in ["Última (ms)", "Média (ms)", "Máx. (ms)"]},
+                hide_index=True,
+            )
+
+        sessao = REGISTRO.ultimas(PERFORMANCE_ULTIMAS, sessao=sessao_atual())
+        if sessao:
+            st.markdown("**Esta sessão**")
+            st.dataframe(
+                pd.DataFrame(
+                    [(m.etapa, m.detalhes.get("aba", ""), m.linhas, m.segundos * 1000) for m in sessao],
+                    columns=["Etapa", "Aba", "Linhas", "ms"],
+                ),
+                column_config={"ms": st.column_config.NumberColumn(format="%.1f")},
+                hide_index=True,
+            )
 
 
 # --- Execução ---
-st.title("📊 Painel de Metas e Performance - Fevereiro/2026")
+titulo_painel = st.empty()
 
 st.sidebar.title("⚙️ Configuração de Metas")
 st.sidebar.markdown("Defina os alvos para colorir a tabela.")
 
 with st.sidebar.expander("💬 Metas de Chat", expanded=True):
-    meta_nota_sup = st.number_input("Nota Suporte (Min)", value=4.45, step=0.05)
-    meta_nota_sac = st.number_input("Nota SAC (Min)", value=4.55, step=0.05)
-    meta_perc = st.slider("% Avaliação Mínima (Chat)", 0.0, 1.0, 0.50)
-    tme_chat_str = st.text_input("TME Chat Máximo (HH:MM:SS)", "00:01:00")
+    metas_nota = {
+        aba: st.number_input(f"Nota {aba} (Min)", value=META_NOTA.get(aba, META_NOTA["Suporte"]), step=0.05)
+        for aba in ABAS_PAINEL
+    }
+    meta_perc = st.slider("% Avaliação Mínima (Chat)", 0.0, 1.0, META_PERC)
+    tme_chat_str = st.text_input("TME Chat Máximo (HH:MM:SS)", META_TME_CHAT)
     meta_tme_chat = converter_tempo(tme_chat_str)
 
 with st.sidebar.expander("📞 Metas de Telefone", expanded=True):
-    tme_pbx_str = st.text_input("TME Telefone Máximo (HH:MM:SS)", "00:00:10")
+    tme_pbx_str = st.text_input("TME Telefone Máximo (HH:MM:SS)", META_TME_PBX)
     meta_tme_pbx = converter_tempo(tme_pbx_str)
 
 st.sidebar.info("As metas de VOLUME são calculadas automaticamente com base na média da equipe filtrada.")
 
-if st.button("🔄 Atualizar Dados"):
-    st.cache_data.clear()
-    st.rerun()
-
-df_sup, df_sac = load_data()
+mostrar_performance = st.sidebar.toggle("⏱️ Performance", value=False, help="Tempos por etapa e acertos de cache")
 
-if df_sup is not None and df_sac is not None:
-    tab1, tab2 = st.tabs(["Suporte", "SAC"])
-    with tab1:
-        render_tab(df_sup, "Suporte", meta_nota_sup, meta_tme_chat, meta_tme_pbx, meta_perc)
-    with tab2:
-        render_tab(df_sac, "SAC", meta_nota_sac, meta_tme_chat, meta_tme_pbx, meta_perc)
\ No newline at end of file
+# Pede uma conferência da planilha (só dos dados): limitada no processo inteiro e sem limpar os outros caches
+c_atualizar, c_versao = st.columns([1, 4], vertical_alignment="center")
+if c_atualizar.button("🔄 Atualizar Dados"):
+    try:
+        if get_atualizador().solicitar(ATUALIZAR_INTERVALO_MINIMO) is None:
+            st.toast(f"A planilha foi conferida há menos de {ATUALIZAR_INTERVALO_MINIMO} s; os dados abaixo já são os últimos.")
+    except Exception as e:
+        st.error(f"Erro ao atualizar dados: {e}")
+
+publicado = load_data()
+if publicado is not None:
+    titulo_painel.title(f"📊 Painel de Metas e Performance - {mes_por_extenso(publicado.criado_em)}")
+    render_versao(c_versao, publicado)
+    render_mudancas()
+else:
+    titulo_painel.title("📊 Painel de Metas e Performance")
+
+if publicado is not None:
+    # Com estado (key + on_change), a aba fechada não roda; voltar a ela reaproveita as visões em cache
+    abas = st.tabs(ABAS_PAINEL, key="aba", on_change="rerun") if SO_ABA_ATIVA else st.tabs(ABAS_PAINEL)
+    for aba, titulo, df in zip(abas, ABAS_PAINEL, publicado.resultado):
+        if SO_ABA_ATIVA and not aba.open:
+            manter_estado(titulo)
+            continue
+        with aba:
+            fragmento_aba(df, titulo, publicado.versao, metas_nota[titulo], meta_tme_chat, meta_tme_pbx, meta_perc)
+
+if mostrar_performance:
+    render_performance()
@@ -0,0 +1,90 @@
+"""Benchmark: N réplicas carregando a planilha cada uma por si vs. pelo plano compartilhado (Arrow mapeado).
+
+Cada réplica é um processo; mede quantos downloads/processamentos aconteceram no host e a
+memória que a carga acrescentou a cada processo (Pss do Linux: páginas compartilhadas entram
+divididas entre os processos que as mapeiam). Confere que os frames são iguais nos dois modos.
+
+Uso: python benchmarks/bench_compartilhado.py [agentes] [replicas]
+"""
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+
+PASTA = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(PASTA))
+sys.path.insert(0, PASTA)
+
+from gerador import gerar_planilha  # noqa: E402
+
+
+def pss_kb():
+    """Pss do processo em kB (0 fora do Linux)."""
+    try:
+        with open("/proc/self/smaps_rollup", encoding="ascii") as f:
+            return next(int(linha.split()[1]) for linha in f if linha.startswith("Pss:"))
+    except OSError:
+        return 0
+
+
+def replica(modo, planilha, compartilhado, barreira, saida):
+    # Importa tudo antes de medir: a memória das bibliotecas não entra na conta
+    from painel.compartilhado import PlanoCompartilhado
+    from painel.fonte import PlanilhaRemota
+    from painel.mapeamento import ABAS
+    from painel.medicao import REGISTRO
+    from painel.processamento import ler_planilha
+
+    antes = pss_kb()
+    fonte = PlanilhaRemota(planilha)
+    if modo == "compartilhado":
+        fonte = PlanoCompartilhado(compartilhado, fonte, ABAS)
+    t0 = time.perf_counter()
+    frames = fonte.carregar(lambda conteudo: ler_planilha(conteudo, "openpyxl", ABAS))
+    segundos = time.perf_counter() - t0
+    barreira.wait()  # todas as réplicas vivas e carregadas antes de medir a memória
+    downloads = REGISTRO.contadores().get("planilha", {}).get("nova", 0)
+    soma = float(sum(df["Chat"].astype("float64").sum() for df in frames))
+    saida.put((downloads, pss_kb() - antes, segundos, soma))
+    barreira.wait()
+
+
+def rodar(modo, replicas, planilha, compartilhado):
+    ctx = multiprocessing.get_context("spawn")
+    barreira, saida = ctx.Barrier(replicas), ctx.Queue()
+    processos = [
+        ctx.Process(target=replica, args=(modo, planilha, compartilhado, barreira, saida)) for _ in range(replicas)
+    ]
+    for p in processos:
+        p.start()
+    resultados = [saida.get() for _ in processos]
+    for p in processos:
+        p.join()
+    return resultados
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+    replicas = int(sys.argv[2]) if len(sys.argv) > 2 else 4
+    with tempfile.TemporaryDirectory() as tmp:
+        planilha = os.path.join(tmp, "planilha.xlsx")
+        with open(planilha, "wb") as f:
+            f.write(gerar_planilha(n))
+        print(f"agentes por aba: {n} | réplicas: {replicas}")
+        somas = set()
+        for modo in ("independente", "compartilhado"):
+            resultados = rodar(modo, replicas, planilha, os.path.join(tmp, "compartilhado"))
+            downloads = sum(r[0] for r in resultados)
+            memoria = sum(r[1] for r in resultados) / 1024
+            lenta = max(r[2] for r in resultados)
+            somas.update(r[3] for r in resultados)
+            print(
+                f"{modo:>13}: {downloads} download(s) | memória da carga somada {memoria:7.1f} MB "
+                f"({memoria / replicas:.1f} MB/réplica) | réplica mais lenta {lenta:.2f} s"
+            )
+        assert len(somas) == 1, somas
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""Benchmark: conversões por célula (`.apply`) vs. versões em lote de `painel.conversao`.
+
+Antes de cronometrar, confere que as duas versões dão o mesmo resultado nos dados gerados; os casos
+de borda ficam em tests/test_conversao.py.
+
+Uso: python benchmarks/bench_conversao.py [linhas]
+"""
+import datetime
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from painel.conversao import (  # noqa: E402
+    converter_tempo,
+    limpar_porcentagem,
+    nota_em_escala_5,
+    porcentagem_em_fracao,
+    tempo_em_segundos,
+)
+
+
+def gerar_tempos(n, rng):
+    """Coluna sintética no formato que o openpyxl devolve: time, strings, "-", vazios e NaN."""
+    h, m, s = rng.integers(0, 3, n), rng.integers(0, 60, n), rng.integers(0, 60, n)
+    tipo = rng.choice(["time", "str", "traco", "vazio", "nan"], size=n, p=[0.6, 0.3, 0.04, 0.03, 0.03])
+    vals = []
+    for t, hh, mm, ss in zip(tipo, h, m, s):
+        if t == "time":
+            vals.append(datetime.time(int(hh), int(mm), int(ss)))
+        elif t == "str":
+            vals.append(f"{hh:02d}:{mm:02d}:{ss:02d}")
+        elif t == "traco":
+            vals.append("-")
+        elif t == "vazio":
+            vals.append("")
+        else:
+            vals.append(np.nan)
+    return pd.Series(vals, dtype=object)
+
+
+def gerar_porcentagens(n, rng):
+    """Mistura de "87%", "0,87", floats 0-1 e vazios, como vem do export."""
+    p = rng.random(n)
+    tipo = rng.choice(["pct", "virgula", "float", "nan"], size=n, p=[0.5, 0.2, 0.25, 0.05])
+    vals = []
+    for t, x in zip(tipo, p):
+        if t == "pct":
+            vals.append(f"{x * 100:.0f}%")
+        elif t == "virgula":
+            vals.append(f"{x:.2f}".replace(".", ","))
+        elif t == "float":
+            vals.append(float(x))
+        else:
+            vals.append(np.nan)
+    return pd.Series(vals, dtype=object)
+
+
+def cronometrar(fn, repeticoes=5):
+    melhor = float("inf")
+    for _ in range(repeticoes):
+        t0 = time.perf_counter()
+        fn()
+        melhor = min(melhor, time.perf_counter() - t0)
+    return melhor
+
+
+def comparar(nome, por_celula, em_lote):
+    t_celula, t_lote = cronometrar(por_celula), cronometrar(em_lote)
+    print(f"{nome:<14} apply: {t_celula * 1000:8.1f} ms | lote: {t_lote * 1000:8.1f} ms | {t_celula / t_lote:5.1f}x")
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 50_000
+    rng = np.random.default_rng(0)
+
+    tempos = gerar_tempos(n, rng)
+    assert (tempos.apply(converter_tempo).to_numpy() == tempo_em_segundos(tempos)).all()
+    porcentagens = gerar_porcentagens(n, rng)
+    assert np.array_equal(
+        porcentagens.apply(limpar_porcentagem).to_numpy(), porcentagem_em_fracao(porcentagens), equal_nan=True
+    )
+    notas = pd.Series(rng.choice([4.2, 4.8, 5.0, 9.1, 10.0], size=n))
+
+    print(f"linhas: {n}")
+    comparar("tempo", lambda: tempos.apply(converter_tempo), lambda: tempo_em_segundos(tempos))
+    comparar("porcentagem", lambda: porcentagens.apply(limpar_porcentagem), lambda: porcentagem_em_fracao(porcentagens))
+    comparar("nota 0-10", lambda: notas.apply(lambda x: x / 10 if x > 5 else x), lambda: nota_em_escala_5(notas))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""Benchmark: detalhamento por fila inteiro (TMEs formatados + Styler) vs. página ordenada no servidor.
+
+O caminho antigo formatava todos os TMEs com `formatar_tempo` e estilizava todas as linhas a cada rerun;
+o novo guarda a tabela em segundos e formata/estiliza só a página exibida.
+
+Uso: python benchmarks/bench_detalhe.py [agentes] [tamanho da página]
+"""
+import os
+import sys
+import time
+
+import numpy as np
+
+PASTA = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(PASTA))
+sys.path.insert(0, PASTA)
+
+from gerador import gerar_aba  # noqa: E402
+from painel.conversao import formatar_tempo  # noqa: E402
+from painel.indicadores import colunas_tempo_detalhe, montar_detalhe, ordem_detalhe, pagina_detalhe  # noqa: E402
+from painel.processamento import processar_aba  # noqa: E402
+
+REPETICOES = 5
+
+
+def detalhe_inteiro(dff, aba):
+    """Referência: a tabela completa, como era montada e estilizada em todo rerun."""
+    det, fmt = montar_detalhe(dff, aba)
+    det = det.assign(**{c: det[c].apply(formatar_tempo) for c in colunas_tempo_detalhe(det)})
+    det.style.format(fmt)._compute()
+    return det
+
+
+def medir(funcao):
+    t0 = time.perf_counter()
+    for _ in range(REPETICOES):
+        resultado = funcao()
+    return (time.perf_counter() - t0) / REPETICOES, resultado
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 20_000
+    tamanho = int(sys.argv[2]) if len(sys.argv) > 2 else 50
+    bruto = gerar_aba("Suporte", n, rng=np.random.default_rng(0)).dropna(how="all")
+    bruto.columns = [str(c).lower().strip() for c in bruto.columns]
+    dff = processar_aba(bruto, "Suporte")
+
+    t_inteiro, ref = medir(lambda: detalhe_inteiro(dff, "Suporte"))
+    t_montar, (det, fmt) = medir(lambda: montar_detalhe(dff, "Suporte"))
+    t_ordem, ordem = medir(lambda: ordem_detalhe(det, "Chat - Total", False))
+
+    def pagina():
+        pag = pagina_detalhe(det, ordem, 0, tamanho)
+        pag.style.format(fmt)._compute()
+        return pag
+
+    t_pagina, pag = medir(pagina)
+    assert pag.equals(ref.sort_values("Chat - Total", ascending=False, kind="stable").head(tamanho))
+
+    print(f"agentes: {n} | página: {tamanho} linhas")
+    print(f"tabela inteira por rerun:        {t_inteiro * 1000:8.1f} ms")
+    print(f"montagem (uma vez por filtro):   {t_montar * 1000:8.1f} ms")
+    print(f"ordenação (uma vez por coluna):  {t_ordem * 1000:8.1f} ms")
+    print(f"página por rerun:                {t_pagina * 1000:8.1f} ms | speedup {t_inteiro / t_pagina:.0f}x")
+
+
+if __name__ == "__main__":
+    main()
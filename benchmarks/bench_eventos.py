@@ -0,0 +1,91 @@
+"""Benchmark: ingestão por eventos (agregados correntes) vs. baixar e processar a planilha inteira.
+
+Confere que os frames dos agregados são os mesmos de um groupby direto sobre todos os eventos
+(mesmas colunas e tipos de `processar_aba`) e mede o custo por evento, o de montar os frames
+publicados e o de uma carga completa da planilha do mesmo tamanho.
+
+Uso: python benchmarks/bench_eventos.py [agentes] [eventos por agente]
+"""
+import json
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+PASTA = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(PASTA))
+sys.path.insert(0, PASTA)
+
+from gerador import ABAS, gerar_eventos, gerar_planilha  # noqa: E402
+from painel.conversao import converter_tempo  # noqa: E402
+from painel.eventos import FonteEventos, ler_evento  # noqa: E402
+from painel.mapeamento import COLS_PBX, FILAS_CHAT  # noqa: E402
+from painel.processamento import compactar, ler_planilha  # noqa: E402
+
+
+def referencia(eventos, aba):
+    """Os mesmos frames, por groupby sobre todos os eventos da aba (sem estado)."""
+    ev = pd.DataFrame([e for e in eventos if e["aba"] == aba])
+    ev["duracao"] = [np.nan if d is None else float(converter_tempo(d) if isinstance(d, str) else d) for d in ev["duracao"]]
+    ev["nota"] = ev["nota"].astype("float64").where(lambda s: s <= 5, lambda s: s / 10)
+    g = ev.groupby("nome", sort=False)
+
+    def soma(mascara, valores=None):
+        v = pd.Series(1.0 if valores is None else valores, index=ev.index).where(mascara, 0.0).fillna(0.0)
+        return v.groupby(ev["nome"], sort=False).sum().to_numpy()
+
+    def media(num, den):
+        return np.divide(num, den, out=np.zeros_like(num), where=den > 0)
+
+    chat, pbx = ev["tipo"] == "chat", ev["tipo"] != "chat"
+    com_dur, com_nota = ev["duracao"].notna(), ev["nota"].notna()
+    n_chat, n_pbx = soma(chat), soma(pbx)
+    data = pd.DataFrame({"Nome": list(g.groups), "Equipe": g["equipe"].last().to_numpy(), "Horario": g["horario"].last().to_numpy()})
+    data["Chat"] = n_chat
+    data["Total (PBX)"] = n_pbx
+    data["Chat (nota)"] = media(soma(chat & com_nota, ev["nota"]), soma(chat & com_nota))
+    data["PBX (nota)"] = media(soma(pbx & com_nota, ev["nota"]), soma(pbx & com_nota))
+    data["Nota (%)"] = media(soma(chat & com_nota), n_chat)
+    data["PBX Nota (%)"] = media(soma(pbx & com_nota), n_pbx)
+    data["Chat (TME) [s]"] = np.rint(media(soma(chat & com_dur, ev["duracao"]), soma(chat & com_dur)))
+    data["PBX (TME) [s]"] = np.rint(media(soma(pbx & com_dur, ev["duracao"]), soma(pbx & com_dur)))
+    for label, _, _ in FILAS_CHAT[aba]:
+        fila = chat & (ev["fila"] == label)
+        data[f"Chat - {label}"] = soma(fila)
+        data[f"TME - {label} [s]"] = np.rint(media(soma(fila & com_dur, ev["duracao"]), soma(fila & com_dur)))
+    for (label, _), tipo in zip(COLS_PBX, ("pbx_recebida", "pbx_efetuada")):
+        data[label] = soma(ev["tipo"] == tipo)
+    return compactar(data, aba)
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 5_000
+    por_agente = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    eventos = gerar_eventos(n, por_agente)
+    linhas = [json.dumps(e, ensure_ascii=False).encode("utf-8") for e in eventos]
+
+    fonte = FonteEventos(ABAS)
+    t0 = time.perf_counter()
+    fonte.aplicar(ler_evento(linha, ABAS) for linha in linhas)
+    t_eventos = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    frames = fonte.carregar()
+    t_quadro = time.perf_counter() - t0
+    for aba, df in zip(ABAS, frames):
+        pd.testing.assert_frame_equal(df, referencia(eventos, aba))
+
+    conteudo = gerar_planilha(n)
+    t0 = time.perf_counter()
+    ler_planilha(conteudo, "openpyxl", ABAS)
+    t_planilha = time.perf_counter() - t0
+
+    print(f"agentes: {n} por aba | eventos: {len(eventos)} ({fonte.invalidos} inválidos)")
+    print(f"por evento (JSON + agregado):  {t_eventos / len(eventos) * 1e6:8.1f} µs")
+    print(f"frames publicados (por versão): {t_quadro * 1000:8.1f} ms")
+    print(f"planilha inteira (por carga):   {t_planilha * 1000:8.1f} ms (sem o download)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+"""Benchmark: várias fontes (painel.registro) carregadas em sequência vs. em paralelo.
+
+As planilhas são servidas por HTTP local com uma latência fixa por download, como as exportações
+do Google Sheets. Em sequência, cada fonte é baixada e tem as abas processadas uma após a outra;
+em paralelo, os downloads vão num pool de threads e, num pool de processos, cada planilha é lida
+numa tarefa (uma vez só) e as abas são processadas numa tarefa cada. A cada rodada
+todas as planilhas mudam; confere que os frames juntados são iguais nos dois modos.
+
+Uso: python benchmarks/bench_fontes.py [agentes por aba] [latência em s] [rodadas] [processos]
+
+Com uma CPU, o modo paralelo processa nas próprias threads; `processos` > 1 força o pool de processos.
+"""
+import functools
+import http.server
+import io
+import os
+import statistics
+import sys
+import tempfile
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+PASTA = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(PASTA))
+sys.path.insert(0, PASTA)
+
+from gerador import gerar_aba  # noqa: E402
+from painel.mapeamento import COLUNA_FONTE  # noqa: E402
+from painel.registro import FonteRegistrada, FontesMultiplas  # noqa: E402
+
+FILAS_COBRANCA = [
+    ("Negociação", "qtde_chat_negociacao", "tme_chat_negociacao"),
+    ("Acordos", "qtde_chat_acordos", "tme_chat_acordos"),
+]
+
+# nome da fonte -> abas (e filas próprias)
+FONTES = {
+    "Atendimento 2026-09": (["Suporte", "SAC"], {}),
+    "Atendimento 2026-10": (["Suporte", "SAC"], {}),
+    "Cobrança 2026-10": (["Cobrança", "SAC"], {"Cobrança": FILAS_COBRANCA}),
+    "Parceiros 2026-10": (["Suporte"], {}),
+}
+
+
+def gravar_fontes(pasta, n, rodada):
+    for i, (nome, (abas, filas)) in enumerate(FONTES.items()):
+        rng = np.random.default_rng(rodada * 100 + i)
+        buf = io.BytesIO()
+        with pd.ExcelWriter(buf, engine="openpyxl") as w:
+            for aba in abas:
+                gerar_aba(aba, n, rng=rng, filas=filas.get(aba)).to_excel(w, sheet_name=aba, index=False)
+        caminho = os.path.join(pasta, f"fonte{i}.xlsx")
+        with open(caminho, "wb") as f:
+            f.write(buf.getvalue())
+        # Last-Modified tem resolução de segundos: cada rodada anda um minuto
+        agora = time.time() + rodada * 60
+        os.utime(caminho, (agora, agora))
+
+
+def servir(pasta, latencia):
+    class Lento(http.server.SimpleHTTPRequestHandler):
+        def do_GET(self):
+            time.sleep(latencia)
+            super().do_GET()
+
+        def log_message(self, *args):
+            pass
+
+    servidor = http.server.ThreadingHTTPServer(("127.0.0.1", 0), functools.partial(Lento, directory=pasta))
+    threading.Thread(target=servidor.serve_forever, daemon=True).start()
+    return servidor
+
+
+def cronometrar(fonte):
+    t0 = time.perf_counter()
+    frames = fonte.carregar()
+    return time.perf_counter() - t0, frames
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 5_000
+    latencia = float(sys.argv[2]) if len(sys.argv) > 2 else 0.5
+    rodadas = int(sys.argv[3]) if len(sys.argv) > 3 else 4
+    processos = int(sys.argv[4]) if len(sys.argv) > 4 else None
+
+    with tempfile.TemporaryDirectory() as pasta:
+        servidor = servir(pasta, latencia)
+        base = f"http://127.0.0.1:{servidor.server_address[1]}"
+        fontes = [
+            FonteRegistrada(nome, f"{base}/fonte{i}.xlsx", tuple(abas), filas)
+            for i, (nome, (abas, filas)) in enumerate(FONTES.items())
+        ]
+        sequencial = FontesMultiplas(fontes, paralelo=False)
+        paralelo = FontesMultiplas(fontes, processos=processos, paralelo=True)
+        tempos_seq, tempos_par = [], []
+        try:
+            for rodada in range(rodadas):
+                gravar_fontes(pasta, n, rodada)
+                t_seq, frames_seq = cronometrar(sequencial)
+                t_par, frames_par = cronometrar(paralelo)
+                for a, b in zip(frames_seq, frames_par):
+                    pd.testing.assert_frame_equal(a, b)
+                tempos_seq.append(t_seq)
+                tempos_par.append(t_par)
+                # Sem mudança nas planilhas: só as conferências (304), em paralelo
+                t_igual, frames = cronometrar(paralelo)
+                assert all(a is b for a, b in zip(frames, frames_par))
+        finally:
+            paralelo.fechar()
+            servidor.shutdown()
+
+    linhas = {aba: len(df) for aba, df in zip(paralelo.abas, frames_par)}
+    fontes_por_aba = {aba: df[COLUNA_FONTE].nunique() for aba, df in zip(paralelo.abas, frames_par)}
+    seq, par = statistics.median(tempos_seq[1:] or tempos_seq), statistics.median(tempos_par[1:] or tempos_par)
+    print(f"fontes: {len(fontes)} | agentes por aba: {n} | latência por download: {latencia * 1000:.0f} ms | CPUs: {os.cpu_count()} | processos: {paralelo.processos} | leitor: {paralelo.leitor}")
+    print("linhas por aba (fontes): " + ", ".join(f"{aba} {linhas[aba]} ({fontes_por_aba[aba]})" for aba in linhas))
+    print(f"sequencial:             {seq * 1000:8.0f} ms (mediana das rodadas)")
+    print(f"paralelo:               {par * 1000:8.0f} ms ({seq / par:.1f}x)")
+    print(f"paralelo, 1ª rodada:    {tempos_par[0] * 1000:8.0f} ms (inclui subir o pool de processos, se houver)")
+    print(f"sem mudança (304):      {t_igual * 1000:8.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""Benchmark: figuras dos rankings com `px.bar` por rerun vs. `graph_objects` e vs. figura já no cache de visões.
+
+Confere que as barras (x, y) são as mesmas nos dois caminhos e compara o tamanho do JSON enviado ao navegador
+(com o template do Streamlit, como no app: inteiro no px.bar, só a paleta e o estilo de scatter nas figuras do painel).
+
+Uso: python benchmarks/bench_graficos.py [agentes] [repeticoes]
+"""
+import os
+import sys
+import time
+
+import numpy as np
+import plotly.express as px
+import plotly.io as pio
+import streamlit  # registra o template "streamlit" do Plotly como padrão, como no app
+
+PASTA = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(PASTA))
+sys.path.insert(0, PASTA)
+
+from gerador import gerar_aba  # noqa: E402
+from painel.graficos import GRAFICOS_RANKING, altura_ranking, figura_ranking  # noqa: E402
+from painel.indicadores import RANKINGS  # noqa: E402
+from painel.processamento import processar_aba  # noqa: E402
+from painel.visoes import CacheVisoes  # noqa: E402
+
+TOPS = [10, 25, 50]
+
+
+def figuras_px(rankings, n):
+    """Como o app montava os gráficos antes (plotly.express, uma figura nova por rerun)."""
+    figuras = []
+    for nome, (_, cor, formato) in GRAFICOS_RANKING.items():
+        ranking, coluna = getattr(rankings, nome), RANKINGS[nome][0]
+        rotulo = {"text_auto": ".2f"} if formato != "%{x}" else {"text": coluna}
+        figuras.append(
+            px.bar(
+                ranking, x=coluna, y="Nome", orientation="h", color_discrete_sequence=[cor], height=altura_ranking(n),
+                **rotulo,
+            )
+        )
+    return figuras
+
+
+def figuras_go(rankings, n):
+    return [
+        figura_ranking(getattr(rankings, nome), RANKINGS[nome][0], cor, formato, altura_ranking(n))
+        for nome, (_, cor, formato) in GRAFICOS_RANKING.items()
+    ]
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 2_000
+    repeticoes = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    bruto = gerar_aba("Suporte", n, rng=np.random.default_rng(0)).dropna(how="all")
+    bruto.columns = [str(c).lower().strip() for c in bruto.columns]
+    df = processar_aba(bruto, "Suporte")
+    visoes = CacheVisoes()
+    equipes, horarios = sorted(df["Equipe"].dropna().unique()), sorted(df["Horario"].dropna().unique())
+
+    print(f"agentes: {n} | repetições: {repeticoes} | template: {pio.templates.default} (streamlit {streamlit.__version__})")
+    for top in TOPS:
+        rankings = visoes.rankings("v", "Suporte", df, equipes, horarios, top)
+        antes, depois = figuras_px(rankings, top), figuras_go(rankings, top)
+        for a, b in zip(antes, depois):
+            np.testing.assert_array_equal(a.data[0].x, b.data[0].x)
+            np.testing.assert_array_equal(a.data[0].y, b.data[0].y)
+
+        tempos = {}
+        for rotulo, montar in [
+            ("px.bar", lambda: figuras_px(rankings, top)),
+            ("graph_objects", lambda: figuras_go(rankings, top)),
+            ("cache", lambda: [visoes.grafico("v", "Suporte", df, equipes, horarios, nome, top) for nome in GRAFICOS_RANKING]),
+        ]:
+            t0 = time.perf_counter()
+            for _ in range(repeticoes):
+                montar()
+            tempos[rotulo] = (time.perf_counter() - t0) / repeticoes
+
+        bytes_px = sum(len(pio.to_json(f, validate=False)) for f in antes)
+        bytes_go = sum(len(pio.to_json(f, validate=False)) for f in depois)
+        print(
+            f"Top {top:>2}: " + " | ".join(f"{r} {t * 1000:7.2f} ms" for r, t in tempos.items())
+            + f" | JSON {bytes_px} -> {bytes_go} bytes | speedup {tempos['px.bar'] / tempos['cache']:.0f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""Benchmark: filtro + KPIs varrendo o frame (`filtrar`/`calcular_kpis`) vs. índice Equipe×Horário.
+
+Confere que os dois caminhos dão o mesmo frame e os mesmos KPIs para várias seleções.
+
+Uso: python benchmarks/bench_grupos.py [agentes]
+"""
+import math
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+PASTA = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(PASTA))
+sys.path.insert(0, PASTA)
+
+from gerador import gerar_aba  # noqa: E402
+from painel.indicadores import calcular_kpis, filtrar, opcoes  # noqa: E402
+from painel.indices import IndiceGrupos  # noqa: E402
+from painel.processamento import processar_aba  # noqa: E402
+
+
+def selecoes(df, rng, quantidade=20):
+    equipes, horarios = opcoes(df["Equipe"]), opcoes(df["Horario"])
+    yield equipes, horarios
+    yield [], horarios
+    for _ in range(quantidade):
+        yield (
+            list(rng.choice(equipes, rng.integers(1, len(equipes) + 1), replace=False)),
+            list(rng.choice(horarios, rng.integers(1, len(horarios) + 1), replace=False)),
+        )
+
+
+def conferir(ref, novo):
+    for a, b in zip(ref, novo):
+        assert (math.isnan(a) and math.isnan(b)) or math.isclose(a, b, rel_tol=1e-12), (ref, novo)
+    # As médias de volume viram meta (>=): precisam ser idênticas, não só próximas
+    assert ref.media_vol_chat == novo.media_vol_chat or math.isnan(ref.media_vol_chat)
+    assert ref.media_vol_pbx == novo.media_vol_pbx or math.isnan(ref.media_vol_pbx)
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 50_000
+    rng = np.random.default_rng(0)
+    bruto = gerar_aba("Suporte", n, rng=rng).dropna(how="all")
+    bruto.columns = [str(c).lower().strip() for c in bruto.columns]
+    df = processar_aba(bruto, "Suporte")
+
+    t0 = time.perf_counter()
+    indice = IndiceGrupos(df)
+    t_indice = time.perf_counter() - t0
+
+    sels = list(selecoes(df, rng))
+    t_varredura = t_grupos = 0.0
+    for equipes, horarios in sels:
+        t0 = time.perf_counter()
+        dff = filtrar(df, equipes, horarios)
+        ref = calcular_kpis(dff)
+        t_varredura += time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        dff_idx = indice.filtrar(df, equipes, horarios)
+        novo = indice.kpis(equipes, horarios)
+        t_grupos += time.perf_counter() - t0
+
+        pd.testing.assert_frame_equal(dff, dff_idx)
+        conferir(ref, novo)
+
+    print(f"agentes: {n} | grupos: {len(indice)} | seleções: {len(sels)} | índice montado em {t_indice * 1000:.1f} ms")
+    print(f"varredura (isin + médias): {t_varredura / len(sels) * 1000:7.2f} ms por seleção")
+    print(f"índice de grupos:          {t_grupos / len(sels) * 1000:7.2f} ms por seleção")
+    print(f"speedup: {t_varredura / t_grupos:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
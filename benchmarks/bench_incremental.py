@@ -0,0 +1,121 @@
+"""Benchmark: versão nova da planilha com poucas linhas alteradas, processada inteira vs. incremental.
+
+Confere que o processamento incremental dá exatamente os frames do completo, que os índices
+derivados da versão anterior (`atualizado`) são idênticos aos montados do zero, e mede os dois
+caminhos. Um agente novo (mudança de estrutura) também precisa dar o mesmo resultado, e o feed
+precisa trazer exatamente os agentes que cruzaram a meta de TME do chat.
+
+O tempo incremental inclui a comparação com a versão anterior e o feed, que o completo não produz:
+em abas pequenas (ou com muitas linhas alteradas) a aba é processada inteira e esse custo fica.
+
+Uso: python benchmarks/bench_incremental.py [agentes] [linhas alteradas]
+"""
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+PASTA = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(PASTA))
+sys.path.insert(0, PASTA)
+
+from gerador import ABAS, gerar_aba  # noqa: E402
+from painel.incremental import ProcessadorIncremental  # noqa: E402
+from painel.indices import IndiceGrupos, IndiceRankings  # noqa: E402
+from painel.mapeamento import colunas_usadas  # noqa: E402
+from painel.metas import META_TME_CHAT, _tme_ok  # noqa: E402
+from painel.conversao import converter_tempo  # noqa: E402
+from painel.processamento import processar_planilha  # noqa: E402
+
+REPETICOES = 3
+
+
+def medir(funcao):
+    t0 = time.perf_counter()
+    for _ in range(REPETICOES):
+        resultado = funcao()
+    return (time.perf_counter() - t0) / REPETICOES, resultado
+
+
+def alterar(xls, k, rng):
+    """Cópia das abas com `k` agentes (linhas não vazias) com volume, nota e TME novos."""
+    novo = {}
+    for aba, df in xls.items():
+        df = df.copy()
+        linhas = rng.choice(np.flatnonzero(df["Nome"].notna().to_numpy()), k, replace=False)
+        df.loc[df.index[linhas], "qtde_chat_total"] = rng.integers(0, 500, k)
+        df.loc[df.index[linhas], "nota_chat"] = rng.choice([3.9, 4.5, 4.9, 9.3], k)
+        df.loc[df.index[linhas], "tme_chat"] = [f"00:{s // 60:02d}:{s % 60:02d}" for s in rng.integers(1, 240, k)]
+        novo[aba] = df
+    return novo
+
+
+def conferir(incremental, completo):
+    for inc, ref in zip(incremental, completo):
+        pd.testing.assert_frame_equal(inc, ref)
+
+
+def conferir_feed_tme(processador, anteriores, frames):
+    """Agentes no feed com "Chat (TME)" = os que mudaram de situação na meta de TME (mesma ordem de linhas)."""
+    meta = converter_tempo(META_TME_CHAT)
+    for aba, antes, depois in zip(ABAS, anteriores, frames):
+        ok_antes = _tme_ok(antes["Chat (TME) [s]"], meta).to_numpy(dtype=object, na_value=None)
+        ok_depois = _tme_ok(depois["Chat (TME) [s]"], meta).to_numpy(dtype=object, na_value=None)
+        esperado = set(depois["Nome"].to_numpy()[ok_antes != ok_depois])
+        no_feed = {m.nome for m in processador.mudancas() if m.aba == aba and m.coluna == "Chat (TME)"}
+        assert esperado and no_feed == esperado, (aba, len(esperado), len(no_feed))
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 20_000
+    k = int(sys.argv[2]) if len(sys.argv) > 2 else 50
+    rng = np.random.default_rng(0)
+    # Só as colunas que os leitores trazem da planilha
+    v1 = {aba: gerar_aba(aba, n, rng=rng) for aba in ABAS}
+    v1 = {aba: df[[c for c in df.columns if c.lower() in colunas_usadas(aba)]] for aba, df in v1.items()}
+    v2 = alterar(v1, k, rng)
+
+    def incremental():
+        processador = ProcessadorIncremental(abas=ABAS, feed_maximo=4 * k * len(ABAS))  # o feed inteiro para conferir
+        anteriores = processador.processar_brutas(v1)
+        t0 = time.perf_counter()
+        frames = processador.processar_brutas(v2)
+        return time.perf_counter() - t0, (processador, anteriores, frames)
+
+    t_completo, completo = medir(lambda: processar_planilha(v2, ABAS))
+    tempos, execucoes = zip(*(incremental() for _ in range(REPETICOES)))
+    t_incremental, (processador, anteriores, frames) = sum(tempos) / REPETICOES, execucoes[-1]
+    conferir(frames, completo)
+    conferir_feed_tme(processador, anteriores, frames)
+
+    print(f"agentes: {n} por aba | alterados: {k} por aba | eventos no feed: {len(processador.mudancas())}")
+    print(f"processamento completo:     {t_completo * 1000:8.1f} ms")
+    print(f"processamento incremental:  {t_incremental * 1000:8.1f} ms | speedup {t_completo / t_incremental:.1f}x")
+
+    for aba, antes, depois in zip(ABAS, anteriores, frames):
+        posicoes = processador.alteradas(aba, antes, depois)
+        assert len(posicoes) == k
+        grupos, rankings = IndiceGrupos(antes), IndiceRankings(antes)
+        t_grupos, ref_grupos = medir(lambda: IndiceGrupos(depois))
+        t_grupos_inc, grupos_inc = medir(lambda: grupos.atualizado(depois, posicoes))
+        t_rank, ref_rank = medir(lambda: IndiceRankings(depois))
+        t_rank_inc, rank_inc = medir(lambda: rankings.atualizado(depois, posicoes))
+        assert all(np.array_equal(grupos_inc.agregados[c], v) for c, v in ref_grupos.agregados.items())
+        assert all(np.array_equal(rank_inc.ordens[c], v) for c, v in ref_rank.ordens.items())
+        print(
+            f"{aba}: índice de grupos {t_grupos * 1000:.1f} -> {t_grupos_inc * 1000:.1f} ms | "
+            f"rankings {t_rank * 1000:.1f} -> {t_rank_inc * 1000:.1f} ms"
+        )
+
+    # Agente novo no fim de cada aba: as posições não batem mais, mas o resultado continua exato
+    v3 = {aba: pd.concat([df, df.iloc[[1]].assign(Nome="Agente novo")], ignore_index=True) for aba, df in v2.items()}
+    novos = processador.processar_brutas(v3)
+    conferir(novos, processar_planilha(v3, ABAS))
+    assert all(processador.alteradas(aba, a, b) is None for aba, a, b in zip(ABAS, frames, novos))
+    print("agente novo: frames idênticos ao processamento completo")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""Benchmark dos leitores de `painel.leitura`: confere que todos geram os mesmos frames
+processados e grava o mais rápido deste host em `.leitor.json` (usado por PAINEL_LEITOR=auto).
+
+Uso: python benchmarks/bench_leitores.py [linhas] [colunas_extras] [arquivo_saida]
+"""
+import io
+import json
+import os
+import sys
+import time
+
+import pandas as pd
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from gerador import ABAS, gerar_planilha  # noqa: E402
+from painel.leitura import LEITORES, MEDICAO, leitores_disponiveis  # noqa: E402
+from painel.mapeamento import ID_COLS, colunas_usadas  # noqa: E402
+from painel.processamento import processar_planilha  # noqa: E402
+
+
+def csv_por_aba(xlsx):
+    """Simula o export CSV do Google Sheets: um CSV por aba com os valores da planilha.
+
+    É o `to_csv` do pandas, não um export gviz real: o tempo do leitor "csv" vale como ordem de
+    grandeza, e a igualdade conferida aqui não cobre a tipagem do gviz.
+    """
+    abas = pd.read_excel(io.BytesIO(xlsx), sheet_name=ABAS)
+    return {aba: df.to_csv(index=False).encode() for aba, df in abas.items()}
+
+
+def processar(nome, conteudo):
+    xls = LEITORES[nome](conteudo, {aba: colunas_usadas(aba) for aba in ABAS}, [c for c, _, _ in ID_COLS])
+    return processar_planilha(xls, ABAS)
+
+
+def cronometrar(fn, repeticoes=3):
+    melhor = float("inf")
+    for _ in range(repeticoes):
+        t0 = time.perf_counter()
+        res = fn()
+        melhor = min(melhor, time.perf_counter() - t0)
+    return res, melhor
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 2_000
+    extras = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    saida = sys.argv[3] if len(sys.argv) > 3 else MEDICAO
+
+    xlsx = gerar_planilha(n, extras)
+    entradas = {nome: xlsx for nome in LEITORES}
+    entradas["csv"] = csv_por_aba(xlsx)
+
+    referencia, tempos = None, {}
+    print(f"linhas por aba: {n} | colunas extras: {extras}")
+    for nome in leitores_disponiveis():
+        frames, tempos[nome] = cronometrar(lambda: processar(nome, entradas[nome]))
+        if referencia is None:
+            referencia = frames
+        for ref, df in zip(referencia, frames):
+            pd.testing.assert_frame_equal(ref, df)
+        print(f"{nome:<10} {tempos[nome]:7.2f} s")
+
+    faltando = sorted(set(LEITORES) - set(tempos))
+    if faltando:
+        print(f"indisponíveis: {', '.join(faltando)}")
+
+    # "completa" é só a referência; o CSV depende da origem, então fica de fora da escolha automática
+    candidatos = {k: v for k, v in tempos.items() if k not in ("completa", "csv")}
+    escolhido = min(candidatos, key=candidatos.get)
+    with open(saida, "w", encoding="utf-8") as f:
+        json.dump({"leitor": escolhido, "tempos": tempos, "medido_em": time.time()}, f, indent=2)
+    print(f"mais rápido: {escolhido} (gravado em {saida})")
+
+
+if __name__ == "__main__":
+    main()
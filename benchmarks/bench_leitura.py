@@ -0,0 +1,72 @@
+"""Benchmark: `pd.read_excel(sheet_name=None)` vs. leitura seletiva (`painel.leitura.ler_abas`).
+
+Gera uma pasta de trabalho com Suporte/SAC, colunas que o painel não usa e abas extras,
+confere que as colunas mapeadas saem iguais nos dois caminhos e mede tempo e pico de memória.
+
+Uso: python benchmarks/bench_leitura.py [linhas] [colunas_extras]
+"""
+import io
+import os
+import sys
+import time
+import tracemalloc
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from gerador import ABAS, gerar_planilha  # noqa: E402
+from painel.leitura import ler_abas  # noqa: E402
+from painel.mapeamento import ID_COLS, colunas_usadas  # noqa: E402
+
+
+def leitura_completa(conteudo):
+    return pd.read_excel(io.BytesIO(conteudo), sheet_name=None)
+
+
+def leitura_seletiva(conteudo):
+    return ler_abas(conteudo, {aba: colunas_usadas(aba) for aba in ABAS}, [c for c, _, _ in ID_COLS])
+
+
+def medir(fn, conteudo):
+    """(resultado, segundos, pico de memória em bytes); a memória é medida numa segunda execução."""
+    t0 = time.perf_counter()
+    res = fn(conteudo)
+    dt = time.perf_counter() - t0
+    tracemalloc.start()
+    fn(conteudo)
+    _, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return res, dt, pico
+
+
+def conferir(completa, seletiva):
+    for aba in ABAS:
+        ref = completa[aba].dropna(how="all")
+        ref.columns = [str(c).lower().strip() for c in ref.columns]
+        sel = seletiva[aba]
+        sel.columns = [str(c).lower().strip() for c in sel.columns]
+        assert list(ref.index) == list(sel.index), aba
+        for col in sel.columns:
+            # Sem as linhas vazias, colunas inteiras não viram float64 por causa do NaN
+            pd.testing.assert_series_equal(ref[col], sel[col], check_names=False, check_dtype=False)
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 5_000
+    extras = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    conteudo = gerar_planilha(n, extras)
+
+    completa, t_comp, m_comp = medir(leitura_completa, conteudo)
+    seletiva, t_sel, m_sel = medir(leitura_seletiva, conteudo)
+    conferir(completa, seletiva)
+
+    print(f"linhas por aba: {n} | colunas extras: {extras} | xlsx: {len(conteudo) / 1e6:.1f} MB")
+    print(f"read_excel (todas as abas): {t_comp:7.2f} s | pico {m_comp / 1e6:7.1f} MB")
+    print(f"ler_abas (seletiva):        {t_sel:7.2f} s | pico {m_sel / 1e6:7.1f} MB")
+    print(f"speedup: {t_comp / t_sel:.1f}x | memória: {m_comp / m_sel:.1f}x menor")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""Benchmark: `highlight_metas` linha a linha vs. `avaliar_metas`/`estilos_metas` por coluna.
+
+Uso: python benchmarks/bench_metas.py [linhas]
+"""
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from painel.conversao import formatar_tempos  # noqa: E402
+from painel.metas import VERDE, VERMELHO, avaliar_metas, estilos_metas  # noqa: E402
+
+META_NOTA, META_PERC, META_TME_CHAT, META_TME_PBX = 4.45, 0.5, 60, 10
+
+
+def gerar_resumo(n, seed=0):
+    """Tabela de metas sintética, com NaN e TME = 0 ("sem dado")."""
+    rng = np.random.default_rng(seed)
+    r = pd.DataFrame({
+        "Nome": [f"Agente {i}" for i in range(n)],
+        "Equipe": rng.choice(["A", "B", "C"], n),
+        "Horario": rng.choice(["08-14", "14-20"], n),
+        "Chat": rng.integers(0, 300, n).astype(float),
+        "Chat (nota)": rng.choice([4.0, 4.45, 4.9, np.nan], n),
+        "Nota (%)": rng.choice([0.3, 0.5, 0.8, np.nan], n),
+        "Total (PBX)": rng.integers(0, 50, n),
+        "Chat (TME) [s]": rng.choice([0, 30, 60, 90], n),
+        "PBX (TME) [s]": rng.choice([0, 5, 10, 15], n),
+    })
+    r["Chat (TME)"] = formatar_tempos(r["Chat (TME) [s]"])
+    r["PBX (TME)"] = formatar_tempos(r["PBX (TME) [s]"])
+    return r
+
+
+def estilos_por_linha(resumo, media_vol_chat, media_vol_pbx):
+    """Referência: a regra antiga do `render_tab`, um closure por linha."""
+    def highlight_metas(row):
+        styles = [""] * len(row)
+        idx = {col: i for i, col in enumerate(row.index)}
+
+        def paint(col, ok):
+            if col in idx:
+                styles[idx[col]] = VERDE if ok else VERMELHO
+
+        paint("Chat", row.get("Chat", 0) >= media_vol_chat)
+        paint("Chat (nota)", row.get("Chat (nota)", 0) >= META_NOTA)
+        paint("Nota (%)", row.get("Nota (%)", 0) >= META_PERC)
+        paint("Total (PBX)", row.get("Total (PBX)", 0) >= media_vol_pbx)
+        for col, meta in (("Chat (TME)", META_TME_CHAT), ("PBX (TME)", META_TME_PBX)):
+            v = row.get(f"{col} [s]", 0)
+            if col in idx:
+                styles[idx[col]] = VERDE if 0 < v <= meta else ("" if v == 0 else VERMELHO)
+        return styles
+
+    estilos = resumo.apply(highlight_metas, axis=1, result_type="expand")
+    estilos.columns = resumo.columns
+    return estilos
+
+
+def estilos_por_coluna(resumo, media_vol_chat, media_vol_pbx):
+    status = avaliar_metas(resumo, media_vol_chat, media_vol_pbx, META_NOTA, META_PERC, META_TME_CHAT, META_TME_PBX)
+    return estilos_metas(resumo, status)
+
+
+def cronometrar(fn, repeticoes=3):
+    melhor = float("inf")
+    for _ in range(repeticoes):
+        t0 = time.perf_counter()
+        fn()
+        melhor = min(melhor, time.perf_counter() - t0)
+    return melhor
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+    resumo = gerar_resumo(n)
+    medias = resumo["Chat"].mean(), resumo["Total (PBX)"].mean()
+
+    antigo, novo = estilos_por_linha(resumo, *medias), estilos_por_coluna(resumo, *medias)
+    assert (antigo.to_numpy() == novo.to_numpy()).all()
+
+    t_linha = cronometrar(lambda: estilos_por_linha(resumo, *medias))
+    t_coluna = cronometrar(lambda: estilos_por_coluna(resumo, *medias))
+    print(f"linhas: {n}")
+    print(f"highlight_metas (axis=1): {t_linha * 1000:8.1f} ms")
+    print(f"avaliar_metas (máscaras): {t_coluna * 1000:8.1f} ms")
+    print(f"speedup:                  {t_linha / t_coluna:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,192 @@
+"""Benchmark do pipeline inteiro, etapa por etapa: leitura, transformação, filtro, KPIs, rankings e estilo.
+
+Gera (e guarda em `benchmarks/.dados/`) planilhas sintéticas de vários tamanhos, executa cada etapa
+como o painel executa (`load_data` -> `processar_planilha` -> `render_tab`, nas duas abas) e anexa
+o melhor tempo de cada etapa em `benchmarks/resultados.jsonl`. Com --comparar, confronta com a
+última medição do mesmo host, leitor e tamanho e sai com erro se alguma etapa piorou além da tolerância.
+
+Uso: python benchmarks/bench_pipeline.py [--agentes 100,1000,10000] [--leitor auto] [--repeticoes 3]
+                                         [--saida arquivo.jsonl] [--comparar] [--tolerancia 0.25]
+"""
+import argparse
+import datetime
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+
+import pandas as pd
+
+PASTA = os.path.dirname(os.path.abspath(__file__))
+RAIZ = os.path.dirname(PASTA)
+sys.path.insert(0, RAIZ)
+sys.path.insert(0, PASTA)
+
+from gerador import ABAS, gerar_planilha  # noqa: E402
+from painel.conversao import converter_tempo  # noqa: E402
+from painel.indicadores import calcular_kpis, calcular_rankings, filtrar, montar_resumo, opcoes  # noqa: E402
+from painel.leitura import LEITORES, escolher_leitor  # noqa: E402
+from painel.mapeamento import ID_COLS, colunas_usadas  # noqa: E402
+from painel.metas import (  # noqa: E402
+    META_NOTA, META_PERC, META_TME_CHAT, META_TME_PBX, avaliar_metas, estilos_metas, status_em_texto,
+)
+from painel.processamento import processar_planilha  # noqa: E402
+
+# Mesmo valor do app-v2.py
+LIMITE_LINHAS_ESTILO = 2000
+ETAPAS = ["leitura", "transformacao", "filtro", "kpis", "rankings", "estilo"]
+RUIDO_SEGUNDOS = 0.005  # diferenças menores que isso não contam como regressão
+
+
+def planilha(n, extras, seed=0):
+    """xlsx sintético de `n` agentes, gerado uma vez e reaproveitado do disco."""
+    caminho = os.path.join(PASTA, ".dados", f"planilha_{n}_{extras}_{seed}.xlsx")
+    if not os.path.exists(caminho):
+        os.makedirs(os.path.dirname(caminho), exist_ok=True)
+        with open(f"{caminho}.tmp", "wb") as f:
+            f.write(gerar_planilha(n, extras, seed))
+        os.replace(f"{caminho}.tmp", caminho)
+    with open(caminho, "rb") as f:
+        return f.read()
+
+
+# --- Etapas (espelham o que load_data e render_tab fazem com cada aba) ---
+def leitura(leitor, conteudo):
+    return LEITORES[leitor](conteudo, {aba: colunas_usadas(aba) for aba in ABAS}, [c for c, _, _ in ID_COLS])
+
+
+def transformacao(xls):
+    return processar_planilha(xls, ABAS)
+
+
+def filtro(df):
+    # Metade das equipes selecionada, todos os horários
+    equipes = opcoes(df["Equipe"])
+    horarios = opcoes(df["Horario"])
+    sel_equipe = equipes[: max(len(equipes) // 2, 1)]
+    return filtrar(df, sel_equipe, horarios)
+
+
+def estilo(dff, kpis):
+    resumo, _ = montar_resumo(dff)
+    status = avaliar_metas(
+        resumo, kpis.media_vol_chat, kpis.media_vol_pbx, META_NOTA["Suporte"], META_PERC,
+        converter_tempo(META_TME_CHAT), converter_tempo(META_TME_PBX),
+    )
+    if len(resumo) > LIMITE_LINHAS_ESTILO:
+        return status_em_texto(status)
+    styler = resumo.style.apply(estilos_metas, status=status, axis=None).format(
+        {"Chat": "{:.0f}", "Chat (nota)": "{:.2f}", "Nota (%)": "{:.1%}", "Total (PBX)": "{:.0f}"}
+    )
+    # O que o st.dataframe executa do Styler antes de serializar
+    styler._compute()
+    return styler._translate(False, False)
+
+
+def cronometrar(fn, repeticoes):
+    melhor = float("inf")
+    for _ in range(repeticoes):
+        t0 = time.perf_counter()
+        res = fn()
+        melhor = min(melhor, time.perf_counter() - t0)
+    return res, melhor
+
+
+def medir(leitor, conteudo, repeticoes):
+    """Melhor tempo (s) de cada etapa, somando as duas abas nas etapas de render_tab."""
+    tempos = dict.fromkeys(ETAPAS, 0.0)
+    xls, tempos["leitura"] = cronometrar(lambda: leitura(leitor, conteudo), repeticoes)
+    frames, tempos["transformacao"] = cronometrar(lambda: transformacao(xls), repeticoes)
+    for df in frames:
+        dff, dt = cronometrar(lambda: filtro(df), repeticoes)
+        tempos["filtro"] += dt
+        kpis, dt = cronometrar(lambda: calcular_kpis(dff), repeticoes)
+        tempos["kpis"] += dt
+        _, dt = cronometrar(lambda: calcular_rankings(dff), repeticoes)
+        tempos["rankings"] += dt
+        _, dt = cronometrar(lambda: estilo(dff, kpis), repeticoes)
+        tempos["estilo"] += dt
+    return tempos
+
+
+def commit_atual():
+    try:
+        return subprocess.run(
+            ["git", "-C", RAIZ, "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def anterior(saida, registro):
+    """Última medição gravada com o mesmo host, leitor e tamanho (ou None)."""
+    if not os.path.exists(saida):
+        return None
+    chave = ("host", "leitor", "agentes", "extras")
+    ultimo = None
+    with open(saida, encoding="utf-8") as f:
+        for linha in f:
+            r = json.loads(linha)
+            if all(r.get(c) == registro[c] for c in chave):
+                ultimo = r
+    return ultimo
+
+
+def regressoes(antes, agora, tolerancia):
+    return [
+        (etapa, antes["etapas"][etapa], t)
+        for etapa, t in agora["etapas"].items()
+        if etapa in antes["etapas"] and t > antes["etapas"][etapa] * (1 + tolerancia) and t - antes["etapas"][etapa] > RUIDO_SEGUNDOS
+    ]
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    ap.add_argument("--agentes", default="100,1000,10000", help="tamanhos separados por vírgula (até 100000)")
+    ap.add_argument("--extras", type=int, default=10, help="colunas que o painel não usa, por aba")
+    ap.add_argument("--leitor", default="auto", help="leitor de painel.leitura (auto usa .leitor.json)")
+    ap.add_argument("--repeticoes", type=int, default=3)
+    ap.add_argument("--saida", default=os.path.join(PASTA, "resultados.jsonl"))
+    ap.add_argument("--comparar", action="store_true", help="falha se piorar em relação à última medição")
+    ap.add_argument("--tolerancia", type=float, default=0.25, help="piora relativa aceita (0.25 = 25%%)")
+    args = ap.parse_args()
+
+    leitor = escolher_leitor(args.leitor)
+    if leitor == "csv":
+        leitor = "openpyxl"  # o benchmark gera xlsx
+    falhas = []
+    print(f"leitor: {leitor} | repetições: {args.repeticoes}")
+    print(f"{'agentes':>8} " + " ".join(f"{e:>13}" for e in ETAPAS) + f" {'total':>9}")
+    for n in (int(x) for x in args.agentes.split(",")):
+        conteudo = planilha(n, args.extras)
+        registro = {
+            "quando": datetime.datetime.now().isoformat(timespec="seconds"),
+            "host": platform.node(),
+            "commit": commit_atual(),
+            "python": platform.python_version(),
+            "pandas": pd.__version__,
+            "leitor": leitor,
+            "agentes": n,
+            "extras": args.extras,
+            "etapas": medir(leitor, conteudo, args.repeticoes),
+        }
+        etapas = registro["etapas"]
+        print(f"{n:>8} " + " ".join(f"{etapas[e] * 1000:>10.1f} ms" for e in ETAPAS) + f" {sum(etapas.values()):>7.2f} s")
+
+        antes = anterior(args.saida, registro)
+        if args.comparar and antes is not None:
+            for etapa, t0, t1 in regressoes(antes, registro, args.tolerancia):
+                falhas.append(f"{n} agentes, {etapa}: {t0 * 1000:.1f} ms -> {t1 * 1000:.1f} ms (commit {antes['commit']})")
+        with open(args.saida, "a", encoding="utf-8") as f:
+            f.write(json.dumps(registro, ensure_ascii=False) + "\n")
+
+    if falhas:
+        print("\nRegressões:")
+        print("\n".join(f"  {f}" for f in falhas))
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
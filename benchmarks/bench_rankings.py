@@ -0,0 +1,64 @@
+"""Benchmark: top N com `nlargest` por rerun (`calcular_rankings`) vs. ordens pré-calculadas (`IndiceRankings`).
+
+Confere que os dois caminhos dão os mesmos frames para várias seleções e tamanhos de top.
+
+Uso: python benchmarks/bench_rankings.py [agentes]
+"""
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+PASTA = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(PASTA))
+sys.path.insert(0, PASTA)
+
+from bench_grupos import selecoes  # noqa: E402
+from gerador import gerar_aba  # noqa: E402
+from painel.indicadores import calcular_rankings, filtrar  # noqa: E402
+from painel.indices import IndiceGrupos, IndiceRankings  # noqa: E402
+from painel.processamento import processar_aba  # noqa: E402
+
+TOPS = [10, 25, 50]
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 50_000
+    rng = np.random.default_rng(0)
+    bruto = gerar_aba("Suporte", n, rng=rng).dropna(how="all")
+    bruto.columns = [str(c).lower().strip() for c in bruto.columns]
+    df = processar_aba(bruto, "Suporte")
+
+    t0 = time.perf_counter()
+    grupos, indice = IndiceGrupos(df), IndiceRankings(df)
+    t_indice = time.perf_counter() - t0
+
+    sels = list(selecoes(df, rng))
+    t_nlargest = t_indice_top = 0.0
+    for equipes, horarios in sels:
+        dff = filtrar(df, equipes, horarios)
+        sel = grupos.selecionar(equipes, horarios)
+        linhas = None if sel.all() else grupos.mascara_linhas(sel)
+        for top in TOPS:
+            t0 = time.perf_counter()
+            ref = calcular_rankings(dff, top)
+            t_nlargest += time.perf_counter() - t0
+
+            t0 = time.perf_counter()
+            novo = indice.rankings(df, top, linhas)
+            t_indice_top += time.perf_counter() - t0
+
+            for a, b in zip(ref, novo):
+                pd.testing.assert_frame_equal(a, b)
+
+    total = len(sels) * len(TOPS)
+    print(f"agentes: {n} | seleções x tops: {total} | índice montado em {t_indice * 1000:.1f} ms")
+    print(f"nlargest por rerun:   {t_nlargest / total * 1000:7.2f} ms (4 rankings)")
+    print(f"ordens pré-calculadas: {t_indice_top / total * 1000:7.2f} ms (4 rankings)")
+    print(f"speedup: {t_nlargest / t_indice_top:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
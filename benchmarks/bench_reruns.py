@@ -0,0 +1,80 @@
+"""Benchmark: latência de rerun do app ao mudar um filtro de equipe ou uma meta (streamlit.testing.AppTest).
+
+O AppTest sempre reexecuta o script inteiro, então o rerun do fragmento da aba é lido da etapa "aba"
+registrada pelo próprio app (painel.medicao.REGISTRO). Compara:
+
+- rerun inteiro desenhando as duas abas (como era antes de PAINEL_SO_ABA_ATIVA e dos fragmentos);
+- rerun inteiro só com a aba ativa (o que ainda acontece ao mudar uma meta na barra lateral);
+- rerun só do fragmento da aba (o que acontece ao mudar um filtro, o top N ou o detalhamento).
+
+Uso: python benchmarks/bench_reruns.py [agentes] [repeticoes]
+"""
+import os
+import sys
+import tempfile
+import time
+
+PASTA = os.path.dirname(os.path.abspath(__file__))
+RAIZ = os.path.dirname(PASTA)
+sys.path.insert(0, RAIZ)
+sys.path.insert(0, PASTA)
+
+from streamlit.testing.v1 import AppTest  # noqa: E402
+
+from gerador import gerar_planilha  # noqa: E402
+from painel.medicao import REGISTRO  # noqa: E402
+
+APP = os.path.join(RAIZ, "app-v2.py")
+
+
+def medir_reruns(so_aba_ativa, repeticoes):
+    os.environ["PAINEL_SO_ABA_ATIVA"] = "1" if so_aba_ativa else "0"
+    at = AppTest.from_file(APP, default_timeout=300).run()
+    if at.exception:
+        raise RuntimeError(at.exception[0].message)
+    equipes = at.multiselect(key="eq_Suporte").options
+
+    filtro, fragmento, meta = [], [], []
+    for i in range(repeticoes):
+        # Seleções novas a cada repetição: nada vem pronto do cache de visões
+        selecao = equipes[: 1 + i % len(equipes)] if i % 2 else equipes[i % len(equipes):]
+        at.multiselect(key="eq_Suporte").set_value(selecao)
+        t0 = time.perf_counter()
+        at.run()
+        filtro.append(time.perf_counter() - t0)
+        fragmento.append(next(m.segundos for m in REGISTRO.ultimas() if m.etapa == "aba" and m.detalhes["aba"] == "Suporte"))
+
+        at.sidebar.number_input[0].set_value(4.0 + i / 100)
+        t0 = time.perf_counter()
+        at.run()
+        meta.append(time.perf_counter() - t0)
+    return filtro, fragmento, meta
+
+
+def mediana(valores):
+    return sorted(valores)[len(valores) // 2]
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 5_000
+    repeticoes = int(sys.argv[2]) if len(sys.argv) > 2 else 6
+    with tempfile.TemporaryDirectory() as tmp:
+        planilha = os.path.join(tmp, "planilha.xlsx")
+        with open(planilha, "wb") as f:
+            f.write(gerar_planilha(n))
+        os.environ.update(
+            PAINEL_URL=planilha, PAINEL_LEITOR="openpyxl",
+            PAINEL_SNAPSHOTS_DIR=os.path.join(tmp, "snapshots"), PAINEL_HISTORICO_DIR=os.path.join(tmp, "historico"),
+        )
+        ambas, _, meta_ambas = medir_reruns(False, repeticoes)
+        ativa, fragmento, meta_ativa = medir_reruns(True, repeticoes)
+
+    print(f"agentes por aba: {n} | repetições: {repeticoes} (medianas)")
+    print(f"filtro, rerun inteiro com as duas abas:   {mediana(ambas) * 1000:8.1f} ms")
+    print(f"filtro, rerun inteiro só com a aba ativa: {mediana(ativa) * 1000:8.1f} ms")
+    print(f"filtro, rerun do fragmento da aba:        {mediana(fragmento) * 1000:8.1f} ms")
+    print(f"meta, rerun inteiro (duas abas -> ativa): {mediana(meta_ambas) * 1000:8.1f} -> {mediana(meta_ativa) * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""Benchmark: frames processados com tipos largos (texto/float64/int64) vs. compactos (categorias,
+float32, int32). Mede memória por frame e o tempo do filtro de equipes/horários do `render_tab`.
+
+Uso: python benchmarks/bench_tipos.py [agentes]
+"""
+import os
+import sys
+import time
+
+import pandas as pd
+
+PASTA = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(PASTA))
+sys.path.insert(0, PASTA)
+
+from gerador import ABAS, gerar_aba  # noqa: E402
+from painel.indicadores import filtrar, opcoes  # noqa: E402
+from painel.processamento import processar_aba  # noqa: E402
+
+
+def largo(df):
+    """O frame como era antes da compactação: identidade em texto, volumes float64, segundos int64."""
+    tipos = {}
+    for col, dtype in df.dtypes.items():
+        if isinstance(dtype, pd.CategoricalDtype):
+            tipos[col] = "str"
+        elif dtype == "float32":
+            tipos[col] = "float64"
+        elif dtype == "int32":
+            tipos[col] = "int64"
+    return df.astype(tipos)
+
+
+def filtro_antigo(df, equipes, horarios):
+    """Referência: o filtro antigo do `render_tab`, com `astype(str)` a cada rerun."""
+    return df[df["Equipe"].isin(equipes) & df["Horario"].astype(str).isin(horarios)].copy()
+
+
+def cronometrar(fn, repeticoes=20):
+    melhor = float("inf")
+    for _ in range(repeticoes):
+        t0 = time.perf_counter()
+        res = fn()
+        melhor = min(melhor, time.perf_counter() - t0)
+    return res, melhor
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 50_000
+    print(f"agentes por aba: {n}")
+    for aba in ABAS:
+        bruto = gerar_aba(aba, n).dropna(how="all")
+        bruto.columns = [str(c).lower().strip() for c in bruto.columns]
+        compacto = processar_aba(bruto, aba)
+        antes = largo(compacto)
+
+        equipes = opcoes(compacto["Equipe"])
+        sel_equipe = equipes[: len(equipes) // 2]
+        horarios = opcoes(compacto["Horario"])[1:]
+
+        ref, t_antes = cronometrar(lambda: filtro_antigo(antes, sel_equipe, horarios))
+        novo, t_novo = cronometrar(lambda: filtrar(compacto, sel_equipe, horarios))
+        pd.testing.assert_frame_equal(ref, largo(novo), check_categorical=False)
+
+        m_antes = antes.memory_usage(deep=True).sum()
+        m_novo = compacto.memory_usage(deep=True).sum()
+        print(f"{aba:8} memória: {m_antes / 1e6:6.2f} MB -> {m_novo / 1e6:6.2f} MB ({m_antes / m_novo:.1f}x menor)")
+        print(f"{'':8} filtro:  {t_antes * 1000:6.2f} ms -> {t_novo * 1000:6.2f} ms ({t_antes / t_novo:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
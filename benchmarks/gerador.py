@@ -0,0 +1,145 @@
+"""Gerador de planilhas sintéticas (Suporte/SAC) no formato da planilha real.
+
+Usa os nomes de coluna de `painel.mapeamento` (FILAS_CHAT, COLS_PBX, ...) e mistura os formatos
+que aparecem na prática: TME como hora do Excel, "HH:MM:SS", "H:MM:SS" e "-"; porcentagens como
+número, "45%", "45,5%", "0,4" e "-"; linhas vazias no meio. Equipes crescem com o número de agentes.
+
+Com destino .jsonl, gera eventos (interações por agente) para o modo de eventos (ver painel.eventos).
+
+Uso: python benchmarks/gerador.py <agentes> <arquivo.xlsx | eventos.jsonl> [colunas_extras] [semente]
+"""
+import datetime
+import io
+import json
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from painel.mapeamento import ABAS, COLS_NOTA, COLS_PBX, COLS_PERC, FILAS_CHAT  # noqa: E402
+
+HORARIOS = ["08:00-14:00", "09:00-15:00", "14:00-20:00", "15:00-21:00"]
+AGENTES_POR_EQUIPE = 25
+
+
+def _tempos(n, rng, maximo):
+    """Coluna de TME com formatos misturados (objetos, como o openpyxl devolve)."""
+    seg = rng.integers(0, maximo, n)
+    horas = [datetime.time(s // 3600, s // 60 % 60, s % 60) for s in seg]
+    texto = [f"{s // 3600:02d}:{s // 60 % 60:02d}:{s % 60:02d}" for s in seg]
+    curto = [f"{s // 3600}:{s // 60 % 60:02d}:{s % 60:02d}" for s in seg]
+    formato = rng.choice(4, n, p=[0.6, 0.25, 0.1, 0.05])
+    return [(h, t, c, "-")[f] for h, t, c, f in zip(horas, texto, curto, formato)]
+
+
+def _porcentagens(n, rng):
+    p = rng.integers(0, 1001, n) / 1000
+    formato = rng.choice(5, n, p=[0.5, 0.2, 0.15, 0.1, 0.05])
+    return [
+        (v, f"{v * 100:.0f}%", f"{v * 100:.1f}%".replace(".", ","), f"{v:.2f}".replace(".", ","), "-")[f]
+        for v, f in zip(p, formato)
+    ]
+
+
+def gerar_aba(nome_aba, n, extras=0, rng=None, filas=None):
+    rng = rng if rng is not None else np.random.default_rng(0)
+    equipes = [f"Equipe {i + 1:03d}" for i in range(max(n // AGENTES_POR_EQUIPE, 3))]
+    d = {
+        "Nome": [f"Agente {i}" for i in range(n)],
+        "Email": [f"agente{i}@empresa.com" for i in range(n)],
+        "Supervisor": rng.choice(["Ana", "Bruno", "Carla"], n),
+        "Equipe": rng.choice(equipes, n),
+        "Horario": rng.choice(HORARIOS, n),
+    }
+    filas = FILAS_CHAT[nome_aba] if filas is None else filas
+    qtd_filas = rng.integers(0, 120, (n, len(filas)))
+    d["qtde_chat_total"] = qtd_filas.sum(axis=1)
+    escalas = {"nota_chat": [4.2, 4.5, 4.8, 9.1, 9.6], "nota_pbx": [4.0, 4.6, 5.0, 8.0, 9.0]}
+    for _, col in COLS_NOTA:
+        d[col] = rng.choice(escalas.get(col, [4.5]), n)
+    for _, col in COLS_PERC:
+        d[col] = _porcentagens(n, rng)
+    d["tme_chat"] = _tempos(n, rng, 240)
+    d["tme_pbx"] = _tempos(n, rng, 40)
+    for _, col in COLS_PBX:
+        d[col] = rng.integers(0, 40, n)
+    d["total_pbx"] = sum(d[col] for _, col in COLS_PBX)
+    for i, (_, col_qtd, col_tme) in enumerate(filas):
+        d[col_qtd] = qtd_filas[:, i]
+        d[col_tme] = _tempos(n, rng, 300)
+    for i in range(extras):
+        d[f"observacao_{i}"] = rng.choice(["ok", "revisar", ""], n)
+    df = pd.DataFrame(d)
+    df.iloc[:: max(n // 20, 1)] = None  # algumas linhas vazias no meio
+    return df
+
+
+def gerar_planilha(n, extras=0, seed=0):
+    """xlsx (bytes) com Suporte/SAC de `n` agentes e duas abas de apoio que o painel não lê."""
+    rng = np.random.default_rng(seed)
+    buf = io.BytesIO()
+    with pd.ExcelWriter(buf, engine="openpyxl") as w:
+        for aba in ABAS:
+            gerar_aba(aba, n, extras, rng).to_excel(w, sheet_name=aba, index=False)
+        for i in range(2):
+            pd.DataFrame(rng.random((n, extras + 10))).to_excel(w, sheet_name=f"Apoio {i}", index=False)
+    return buf.getvalue()
+
+
+def gerar_eventos(n, por_agente=20, seed=0, inicio=None):
+    """Eventos (dicionários) de `n` agentes por aba, em ordem de `ts` ao longo de 8 horas.
+
+    Mistura durações em segundos e "HH:MM:SS", notas 0-5 e 0-10, e interações sem nota ou sem duração.
+    """
+    rng = np.random.default_rng(seed)
+    inicio = time.time() if inicio is None else inicio
+    equipes = [f"Equipe {i + 1:03d}" for i in range(max(n // AGENTES_POR_EQUIPE, 3))]
+    agentes = [
+        (aba, f"Agente {i}", equipe, horario)
+        for aba in ABAS
+        for i, equipe, horario in zip(range(n), rng.choice(equipes, n), rng.choice(HORARIOS, n))
+    ]
+    total = len(agentes) * por_agente
+    quem = rng.integers(0, len(agentes), total)
+    tipo = rng.choice(["chat", "pbx_recebida", "pbx_efetuada"], total, p=[0.6, 0.25, 0.15])
+    fila = rng.integers(0, 4, total)
+    duracao = rng.integers(5, 400, total)
+    formato = rng.choice(3, total, p=[0.8, 0.15, 0.05])  # segundos, "HH:MM:SS", sem duração
+    nota = rng.choice([3.0, 4.0, 4.5, 5.0, 8.0, 10.0], total)
+    avaliada = rng.random(total) < 0.6
+    ts = inicio + np.sort(rng.random(total)) * 8 * 3600
+
+    eventos = []
+    for k in range(total):
+        aba, nome, equipe, horario = agentes[quem[k]]
+        d = int(duracao[k])
+        evento = {"aba": aba, "nome": nome, "equipe": equipe, "horario": horario, "tipo": str(tipo[k])}
+        if tipo[k] == "chat":
+            evento["fila"] = FILAS_CHAT[aba][fila[k]][0]
+        evento["duracao"] = (d, f"{d // 3600:02d}:{d // 60 % 60:02d}:{d % 60:02d}", None)[formato[k]]
+        evento["nota"] = float(nota[k]) if avaliada[k] else None
+        evento["ts"] = round(float(ts[k]), 3)
+        eventos.append(evento)
+    return eventos
+
+
+def main():
+    if len(sys.argv) < 3:
+        sys.exit(__doc__.strip().splitlines()[-1])
+    n, destino = int(sys.argv[1]), sys.argv[2]
+    extras = int(sys.argv[3]) if len(sys.argv) > 3 else 0
+    seed = int(sys.argv[4]) if len(sys.argv) > 4 else 0
+    if destino.endswith(".jsonl"):
+        with open(destino, "w", encoding="utf-8") as f:
+            f.writelines(json.dumps(e, ensure_ascii=False) + "\n" for e in gerar_eventos(n, seed=seed))
+        return
+    with open(destino, "wb") as f:
+        f.write(gerar_planilha(n, extras, seed))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1 @@
+"""Núcleo de dados do painel de metas (sem dependência de interface)."""
@@ -0,0 +1,5 @@
+import sys
+
+from painel.cli import main
+
+sys.exit(main())
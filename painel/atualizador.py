@@ -0,0 +1,117 @@
+"""Atualização da planilha em segundo plano, com publicação atômica da última versão."""
+import collections
+import logging
+import threading
+import time
+from concurrent.futures import Future
+
+from painel.medicao import REGISTRO
+
+log = logging.getLogger(__name__)
+
+# O que as sessões leem: trocado de uma vez só, nunca alterado no lugar
+Publicacao = collections.namedtuple("Publicacao", ["versao", "resultado", "criado_em"])
+
+
+class Atualizador:
+    """Uma thread por processo que mantém `planilha.carregar(processar)` fresco.
+
+    As sessões só leem `publicado()`; ninguém espera o download, exceto na primeira carga
+    de um processo sem snapshot. Pedidos simultâneos de `atualizar()` são coalescidos:
+    quem chega com uma busca em andamento espera o resultado dela em vez de abrir outra.
+    """
+
+    def __init__(self, planilha, processar, intervalo=60, ao_publicar=None):
+        self.planilha = planilha
+        self.processar = processar
+        self.intervalo = intervalo
+        self.ao_publicar = ao_publicar  # chamado com cada Publicacao nova (ex.: gravar histórico)
+        self.erro = None  # última falha (a versão publicada anterior continua valendo)
+        self.conferido_em = None  # fim da última busca bem-sucedida (epoch), mudando a versão ou não
+        self._ultima_busca = None  # início da última busca (relógio monotônico), para o limite de `solicitar`
+        self._publicado = None
+        self._primeira = threading.Event()
+        self._parar = threading.Event()
+        self._lock = threading.Lock()
+        self._em_andamento = None
+        self._thread = None
+
+    def iniciar(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._loop, name="painel-atualizador", daemon=True)
+            self._thread.start()
+        return self
+
+    def parar(self):
+        self._parar.set()
+
+    def _loop(self):
+        while not self._parar.is_set():
+            try:
+                self.atualizar()
+                if self.planilha.restaurado:
+                    continue  # publicou o snapshot do disco: confere a planilha já
+            except Exception:
+                log.exception("Falha ao atualizar a planilha")
+            self._parar.wait(self.intervalo)
+
+    def atualizar(self):
+        """Busca e publica a versão atual; chamadas concorrentes compartilham a mesma busca."""
+        return self._buscar(0)
+
+    def solicitar(self, intervalo_minimo=30):
+        """`atualizar()` pedido por um usuário: None (sem buscar) se a última busca começou há menos
+        de `intervalo_minimo` s; com uma busca em andamento, espera o resultado dela."""
+        return self._buscar(intervalo_minimo, origem="solicitar")
+
+    def _buscar(self, intervalo_minimo, origem=None):
+        with self._lock:
+            futuro = self._em_andamento
+            dono = futuro is None
+            if dono:
+                if self._ultima_busca is not None and time.monotonic() - self._ultima_busca < intervalo_minimo:
+                    REGISTRO.contar(origem, "limitado")
+                    return None
+                futuro = self._em_andamento = Future()
+                self._ultima_busca = time.monotonic()
+        if origem is not None:
+            REGISTRO.contar(origem, "busca" if dono else "coalescido")
+        if not dono:
+            return futuro.result()
+
+        try:
+            resultado = self.planilha.carregar(self.processar, revalidar=False)
+            pub = self._publicado
+            if pub is None or pub.versao != self.planilha.versao:
+                self._publicado = Publicacao(self.planilha.versao, resultado, self.planilha.criado_em)
+                self._primeira.set()
+                self._avisar(self._publicado)
+            self.erro = None
+            self.conferido_em = time.time()
+            futuro.set_result(self._publicado)
+        except Exception as e:
+            self.erro = e
+            futuro.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                self._em_andamento = None
+        return self._publicado
+
+    def _avisar(self, pub):
+        if self.ao_publicar is None:
+            return
+        try:
+            self.ao_publicar(pub)
+        except Exception:
+            # Falha no consumidor não derruba a publicação
+            log.exception("Falha ao tratar a versão %s publicada", pub.versao[:12])
+
+    def publicado(self):
+        """Última versão publicada (ou None se ainda não houve nenhuma)."""
+        return self._publicado
+
+    def aguardar(self, timeout=None):
+        """Espera a primeira publicação; devolve None se estourar o tempo."""
+        self._primeira.wait(timeout)
+        return self._publicado
@@ -0,0 +1,96 @@
+"""Modo em lote: processa a planilha (arquivo ou URL) e grava frames e metas por agente, sem a interface.
+
+Uso: python -m painel <arquivo.xlsx | URL> [--saida pasta] [--formato parquet|csv|json] [--leitor auto]
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+from painel.conversao import converter_tempo
+from painel.fonte import PlanilhaRemota
+from painel.indicadores import calcular_kpis, resultado_metas
+from painel.leitura import LEITORES, escolher_leitor
+from painel.mapeamento import ABAS
+from painel.metas import META_NOTA, META_PERC, META_TME_CHAT, META_TME_PBX
+from painel.processamento import ler_planilha
+
+FORMATOS = ["parquet", "csv", "json"]
+
+
+def gravar(df, caminho, formato):
+    if formato == "parquet":
+        df.to_parquet(caminho, index=False)
+    elif formato == "csv":
+        df.to_csv(caminho, index=False, encoding="utf-8")
+    else:
+        df.to_json(caminho, orient="records", force_ascii=False, indent=1)
+
+
+def _numero(v):
+    """KPI em JSON: NaN (ninguém atendeu) vira null."""
+    v = float(v)
+    return None if v != v else v
+
+
+def executar(entrada, saida, formato="parquet", leitor="auto", metas=None):
+    """Processa `entrada` e grava em `saida`; devolve o resumo gravado em `resumo.json`."""
+    metas = metas or {}
+    leitor = escolher_leitor(leitor)
+    if leitor == "csv":
+        leitor = "openpyxl"  # a entrada aqui é sempre um xlsx
+    conteudo, versao = PlanilhaRemota(entrada).baixar()
+    frames = ler_planilha(conteudo, leitor, ABAS)
+
+    os.makedirs(saida, exist_ok=True)
+    resumo = {"entrada": entrada, "versao": versao, "gerado_em": time.time(), "leitor": leitor, "abas": {}}
+    tme_chat = converter_tempo(metas.get("tme_chat", META_TME_CHAT))
+    tme_pbx = converter_tempo(metas.get("tme_pbx", META_TME_PBX))
+    for aba, df in zip(ABAS, frames):
+        meta_nota = metas.get("nota", {}).get(aba, META_NOTA[aba])
+        meta_perc = metas.get("perc", META_PERC)
+        gravar(df, os.path.join(saida, f"{aba}.{formato}"), formato)
+        gravar(
+            resultado_metas(df, meta_nota, meta_perc, tme_chat, tme_pbx),
+            os.path.join(saida, f"{aba}_metas.{formato}"),
+            formato,
+        )
+        kpis = calcular_kpis(df)
+        resumo["abas"][aba] = {
+            "agentes": len(df),
+            "metas": {"nota": meta_nota, "perc": meta_perc, "tme_chat_seg": tme_chat, "tme_pbx_seg": tme_pbx},
+            "kpis": {k: _numero(v) for k, v in kpis._asdict().items()},
+        }
+    with open(os.path.join(saida, "resumo.json"), "w", encoding="utf-8") as f:
+        json.dump(resumo, f, ensure_ascii=False, indent=1)
+    return resumo
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(prog="python -m painel", description=__doc__.split("\n")[0])
+    ap.add_argument("entrada", help="caminho do xlsx ou URL de exportação")
+    ap.add_argument("--saida", default="saida", help="pasta de saída (padrão: ./saida)")
+    ap.add_argument("--formato", choices=FORMATOS, default="parquet")
+    ap.add_argument("--leitor", choices=["auto"] + list(LEITORES), default="auto")
+    for aba in ABAS:
+        ap.add_argument(f"--meta-nota-{aba.lower()}", type=float, default=META_NOTA[aba], dest=f"nota_{aba}")
+    ap.add_argument("--meta-perc", type=float, default=META_PERC)
+    ap.add_argument("--meta-tme-chat", default=META_TME_CHAT, help="HH:MM:SS")
+    ap.add_argument("--meta-tme-pbx", default=META_TME_PBX, help="HH:MM:SS")
+    args = ap.parse_args(argv)
+
+    metas = {
+        "nota": {aba: getattr(args, f"nota_{aba}") for aba in ABAS},
+        "perc": args.meta_perc,
+        "tme_chat": args.meta_tme_chat,
+        "tme_pbx": args.meta_tme_pbx,
+    }
+    try:
+        resumo = executar(args.entrada, args.saida, args.formato, args.leitor, metas)
+    except Exception as e:
+        print(f"Erro ao processar {args.entrada}: {e}", file=sys.stderr)
+        return 1
+    for aba, info in resumo["abas"].items():
+        print(f"{aba}: {info['agentes']} agentes -> {os.path.join(args.saida, aba)}.{args.formato}")
+    return 0
@@ -0,0 +1,203 @@
+"""Plano de dados compartilhado entre os processos do servidor num mesmo host.
+
+Um processo por vez (o coordenador, dono de um lock de arquivo) baixa e processa a planilha e
+publica os frames como arquivos Arrow IPC; os demais só mapeiam esses arquivos em memória. O feed
+de mudanças de metas do coordenador (ver painel.incremental) vai junto, para os outros processos.
+"""
+import json
+import logging
+import os
+import shutil
+import time
+
+import pyarrow as pa
+
+from painel.medicao import REGISTRO, medir
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+log = logging.getLogger(__name__)
+
+MANIFESTO = "atual.json"
+LOCK = ".coordenador.lock"
+MUDANCAS = "mudancas.json"
+
+
+def _travar(arquivo):
+    """Lock exclusivo sem espera; o sistema o libera sozinho se o processo morrer."""
+    try:
+        if fcntl is not None:
+            fcntl.flock(arquivo.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        else:
+            msvcrt.locking(arquivo.fileno(), msvcrt.LK_NBLCK, 1)
+    except OSError:
+        return False
+    return True
+
+
+def gravar_arrow(caminho, df):
+    tabela = pa.Table.from_pandas(df)
+    with pa.OSFile(caminho, "wb") as f, pa.ipc.new_file(f, tabela.schema) as escritor:
+        escritor.write_table(tabela)
+
+
+def mapear_arrow(caminho):
+    """Frame lido do arquivo mapeado: colunas numéricas apontam para o mapa (somente leitura), sem cópia."""
+    with pa.memory_map(caminho) as mapa:
+        tabela = pa.ipc.open_file(mapa).read_all()
+    return tabela.to_pandas(split_blocks=True)
+
+
+class PlanoCompartilhado:
+    """Fonte com a mesma interface de `PlanilhaRemota` (`carregar`, `versao`, `criado_em`, `restaurado`).
+
+    Em cada `carregar`, o processo tenta ser o coordenador: se consegue o lock, carrega a
+    `planilha` e, a cada versão nova, grava `pasta/<hash>/<aba>.arrow` e troca o manifesto
+    `atual.json` de uma vez (arquivo temporário + rename). Os outros processos leem o
+    manifesto e mapeiam a versão indicada. Todos, inclusive o coordenador, servem os frames
+    do mapa, então o cache de páginas do sistema guarda uma cópia só por host.
+
+    Se o coordenador morrer, o lock é liberado e o próximo processo a atualizar assume.
+
+    Quando `processar` tem feed (`mudancas`/`receber_mudancas`, como `ProcessadorIncremental`), cada
+    versão leva em `mudancas.json` os eventos gerados pelo coordenador, com a `seq` dele; os outros
+    processos acrescentam ao próprio feed os que ainda não viram ao mapear uma versão nova.
+    """
+
+    def __init__(self, pasta, planilha, abas, manter=3, espera=120):
+        self.pasta = pasta
+        self.planilha = planilha
+        self.abas = tuple(abas)
+        self.manter = manter
+        self.espera = espera  # quanto um processo sem dados espera a primeira publicação
+        self.versao = None
+        self.resultado = None
+        self.criado_em = None
+        self.restaurado = False
+        self._lock = None  # arquivo com o lock enquanto este processo for o coordenador
+        self._origem = None  # identifica o feed deste processo enquanto coordenador
+        self._feed_desde = 0  # `seq` do feed local ao assumir (o que veio antes foi recebido de outro)
+        self._feed_visto = None  # (origem, última seq) do feed recebido
+
+    @property
+    def coordenador(self):
+        return self._lock is not None
+
+    def _coordenar(self, processar=None):
+        if self._lock is None:
+            os.makedirs(self.pasta, exist_ok=True)
+            arquivo = open(os.path.join(self.pasta, LOCK), "a+b")
+            if _travar(arquivo):
+                log.info("Processo %s assumiu a coordenação de %s", os.getpid(), self.pasta)
+                self._lock = arquivo
+                self._origem = f"{os.getpid()}-{time.time()}"
+                self._feed_desde = getattr(processar, "ultima_seq", 0)
+            else:
+                arquivo.close()
+        return self._lock is not None
+
+    def _manifesto(self):
+        try:
+            with open(os.path.join(self.pasta, MANIFESTO), encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _publicar(self, versao, frames, criado_em, mudancas=None):
+        destino = os.path.join(self.pasta, versao[:12])
+        if not os.path.isdir(destino):
+            tmp = os.path.join(self.pasta, f".tmp_{versao[:12]}_{os.getpid()}")
+            os.makedirs(tmp, exist_ok=True)
+            try:
+                for aba, df in zip(self.abas, frames):
+                    gravar_arrow(os.path.join(tmp, f"{aba}.arrow"), df)
+                if mudancas is not None:
+                    with open(os.path.join(tmp, MUDANCAS), "w", encoding="utf-8") as f:
+                        json.dump({"origem": self._origem, "mudancas": [m._asdict() for m in mudancas]}, f)
+                os.replace(tmp, destino)
+            finally:
+                shutil.rmtree(tmp, ignore_errors=True)
+        manifesto = {"versao": versao, "pasta": versao[:12], "criado_em": criado_em, "abas": list(self.abas)}
+        tmp = os.path.join(self.pasta, f".{MANIFESTO}.{os.getpid()}")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(manifesto, f)
+        os.replace(tmp, os.path.join(self.pasta, MANIFESTO))
+        self._limpar(manifesto["pasta"])
+        return manifesto
+
+    def _limpar(self, atual):
+        """Remove as versões mais antigas; quem ainda as tem mapeadas continua lendo (no Windows, tenta de novo depois)."""
+        pastas = sorted(
+            (n for n in os.listdir(self.pasta) if not n.startswith(".") and os.path.isdir(os.path.join(self.pasta, n))),
+            key=lambda n: os.path.getmtime(os.path.join(self.pasta, n)),
+        )
+        for nome in [n for n in pastas if n != atual][: max(len(pastas) - self.manter, 0)]:
+            shutil.rmtree(os.path.join(self.pasta, nome), ignore_errors=True)
+
+    def _receber_mudancas(self, processar, primeira):
+        """Eventos do feed do coordenador publicados com a versão mapeada que este processo não viu."""
+        receber = getattr(processar, "receber_mudancas", None)
+        if receber is None:
+            return
+        try:
+            with open(os.path.join(self.pasta, self.versao[:12], MUDANCAS), encoding="utf-8") as f:
+                dados = json.load(f)
+        except (OSError, ValueError):
+            return
+        origem, mudancas = dados["origem"], dados["mudancas"]
+        # Um coordenador novo começa o feed do zero: tudo o que ele publicou é novo para este processo
+        visto = self._feed_visto[1] if self._feed_visto is not None and self._feed_visto[0] == origem else 0
+        novas = [m for m in mudancas if m["seq"] > visto]
+        if novas and not primeira:
+            # Na primeira versão mapeada não há "antes" neste processo (como na primeira carga do coordenador)
+            receber([{k: v for k, v in m.items() if k != "seq"} for m in novas])
+        self._feed_visto = (origem, max([visto] + [m["seq"] for m in mudancas]))
+
+    def _mapear(self, manifesto):
+        if manifesto["versao"] == self.versao:
+            REGISTRO.contar("compartilhado", "sem_mudanca")
+            return self.resultado
+        caminho = os.path.join(self.pasta, manifesto["pasta"])
+        with medir("mapear") as m:
+            self.resultado = tuple(mapear_arrow(os.path.join(caminho, f"{aba}.arrow")) for aba in self.abas)
+            m.linhas = sum(len(df) for df in self.resultado)
+        self.versao, self.criado_em = manifesto["versao"], manifesto["criado_em"]
+        REGISTRO.contar("compartilhado", "mapeado")
+        return self.resultado
+
+    def carregar(self, processar, revalidar=False):
+        """Frames da versão publicada no host; só o coordenador chama `planilha.carregar`."""
+        limite = time.monotonic() + self.espera
+        while True:
+            if self._coordenar(processar):
+                frames = self.planilha.carregar(processar, revalidar=revalidar)
+                self.restaurado = self.planilha.restaurado
+                manifesto = self._manifesto()
+                if manifesto is None or manifesto["versao"] != self.planilha.versao:
+                    # Só o que este processo gerou: o recebido de um coordenador anterior já foi publicado
+                    mudancas = processar.mudancas(self._feed_desde) if hasattr(processar, "mudancas") else None
+                    with medir("publicar_compartilhado", linhas=sum(len(df) for df in frames)):
+                        manifesto = self._publicar(self.planilha.versao, frames, self.planilha.criado_em, mudancas)
+                resultado = self._mapear(manifesto)
+                # A planilha (e o processador incremental, se houver) passa a guardar os frames mapeados:
+                # a cópia processada em memória é liberada
+                self.planilha.resultado = resultado
+                adotar = getattr(processar, "adotar", None)
+                if adotar is not None and frames is not resultado:
+                    adotar(frames, resultado)
+                return resultado
+
+            manifesto = self._manifesto()
+            if manifesto is not None:
+                anterior = self.versao
+                resultado = self._mapear(manifesto)
+                if self.versao != anterior:
+                    self._receber_mudancas(processar, primeira=anterior is None)
+                return resultado
+            if time.monotonic() > limite:
+                raise TimeoutError(f"Nenhuma versão publicada em {self.pasta} após {self.espera}s")
+            time.sleep(0.5)
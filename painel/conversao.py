@@ -0,0 +1,255 @@
+"""Conversões de células da planilha (tempo, porcentagem, números)."""
+import datetime
+
+import numpy as np
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+except ImportError:  # pyarrow vem com o streamlit; sem ele usamos o caminho puro em Python
+    pa = None
+
+
+# --- Conversões por célula (referência) ---
+def converter_tempo(val):
+    try:
+        if pd.isna(val) or val == "-" or str(val).strip() == "":
+            return 0
+        if hasattr(val, "hour"):
+            return val.hour * 3600 + val.minute * 60 + val.second
+        partes = str(val).split(":")
+        if len(partes) == 3:
+            return int(partes[0]) * 3600 + int(partes[1]) * 60 + int(partes[2])
+        return 0
+    except:
+        return 0
+
+
+def formatar_tempo(segundos):
+    if segundos == 0:
+        return "-"
+    m, s = divmod(int(segundos), 60)
+    h, m = divmod(m, 60)
+    return f"{h:02d}:{m:02d}:{s:02d}"
+
+
+def limpar_porcentagem(val):
+    try:
+        if isinstance(val, (int, float)):
+            return float(val)
+        if isinstance(val, str):
+            v = val.replace("%", "").replace(",", ".").strip()
+            if v == "":
+                return 0.0
+            f = float(v)
+            return f / 100 if f > 1 else f
+        return 0.0
+    except:
+        return 0.0
+
+
+def to_num(s):
+    # Sempre float64: o dtype não depende de o leitor ter visto linhas vazias (NaN) na coluna
+    return pd.to_numeric(s, errors="coerce").fillna(0).astype("float64")
+
+
+# --- Conversões em lote (colunas inteiras) ---
+_ZERO, _NOVE, _DOIS_PONTOS = ord("0"), ord("9"), ord(":")
+_HMS_REGEX = r"^([0-9]{1,9}):([0-9]{1,9}):([0-9]{1,9})$"
+_LARGURA_MAX = 64
+
+
+def _hms_largura_fixa(u, lens):
+    """Segundos para strings "HH:MM:SS" de um array numpy de unicode; -1 onde o layout não bate."""
+    largura = u.dtype.itemsize // 4
+    if largura < 8:
+        return np.full(len(u), -1, dtype=np.int64)
+    cod = u.view(np.uint32).reshape(len(u), largura)[:, :8].astype(np.int64)
+    d = cod[:, [0, 1, 3, 4, 6, 7]] - _ZERO
+    ok = (
+        (lens == 8)
+        & (cod[:, 2] == _DOIS_PONTOS)
+        & (cod[:, 5] == _DOIS_PONTOS)
+        & ((d >= 0) & (d <= _NOVE - _ZERO)).all(axis=1)
+    )
+    seg = (d[:, 0] * 10 + d[:, 1]) * 3600 + (d[:, 2] * 10 + d[:, 3]) * 60 + d[:, 4] * 10 + d[:, 5]
+    return np.where(ok, seg, -1)
+
+
+def _tempo_textos(textos):
+    """Segundos para um array de str, com a mesma semântica de `converter_tempo`."""
+    n = len(textos)
+    out = np.zeros(n, dtype=np.int64)
+    if n == 0:
+        return out
+
+    lens = np.fromiter(map(len, textos), dtype=np.int64, count=n)
+    # Caminho rápido: layout canônico "HH:MM:SS" (o que a planilha exporta).
+    curtos = lens <= _LARGURA_MAX
+    rapido = np.full(n, -1, dtype=np.int64)
+    if curtos.any():
+        rapido[curtos] = _hms_largura_fixa(textos[curtos].astype(str), lens[curtos])
+    ok = rapido >= 0
+    out[ok] = rapido[ok]
+
+    # "H:M:S" precisa de ao menos 5 caracteres; "-", "" e afins ficam em 0.
+    resto = np.flatnonzero(~ok & (lens >= 5))
+    if len(resto) == 0:
+        return out
+
+    # Só strings com exatamente dois ":" podem virar tempo; o resto é 0.
+    s = pd.Series(textos[resto], dtype=object)
+    candidatos = (s.str.count(":") == 2).to_numpy()
+    if not candidatos.any():
+        return out
+    resto, s = resto[candidatos], s[candidatos]
+
+    partes = s.str.extract(_HMS_REGEX)
+    regular = partes.notna().all(axis=1).to_numpy()
+    if regular.any():
+        p = partes[regular].astype(np.int64).to_numpy()
+        out[resto[regular]] = p[:, 0] * 3600 + p[:, 1] * 60 + p[:, 2]
+
+    # Formatos irregulares (espaços, sinais, "_"): delega à versão por célula.
+    for i, val in zip(resto[~regular], s[~regular]):
+        out[i] = converter_tempo(val)
+    return out
+
+
+_DECIMAL_REGEX = r"^[+-]?(?:[0-9]+\.?[0-9]*|\.[0-9]+)(?:[eE][+-]?[0-9]+)?$"
+
+
+def _agrupar_tipos(vals):
+    """Códigos por tipo (via factorize) + função que monta máscaras por predicado sobre o tipo."""
+    codigos, tipos = pd.factorize(np.fromiter(map(type, vals), dtype=object, count=len(vals)))
+
+    def mascara(pred):
+        return np.isin(codigos, [i for i, t in enumerate(tipos) if pred(t)])
+
+    return mascara
+
+
+def _porcentagem_textos(textos):
+    """Frações para um array de str, com a mesma semântica de `limpar_porcentagem`."""
+    # Tira "%", troca vírgula decimal e apara espaços; decimais simples são convertidos em lote.
+    if pa is not None:
+        v = pa.array(textos, type=pa.string())
+        v = pc.utf8_trim_whitespace(pc.replace_substring(pc.replace_substring(v, "%", ""), ",", "."))
+        simples = pc.match_substring_regex(v, _DECIMAL_REGEX)
+        out = np.array(pc.cast(pc.if_else(simples, v, "0"), pa.float64()), dtype=np.float64)
+        simples = simples.to_numpy(zero_copy_only=False)
+        vazios = pc.equal(v, "").to_numpy(zero_copy_only=False)
+        irregulares = [(i, v[i].as_py()) for i in np.flatnonzero(~simples & ~vazios)]
+    else:
+        v = pd.Series(textos, dtype=object)
+        v = v.str.replace("%", "", regex=False).str.replace(",", ".", regex=False).str.strip()
+        simples = v.str.fullmatch(_DECIMAL_REGEX).to_numpy(dtype=bool)
+        out = np.zeros(len(textos), dtype=np.float64)
+        out[simples] = v[simples].astype(np.float64).to_numpy()
+        irregulares = [(i, v.iat[i]) for i in np.flatnonzero(~simples & (v != "").to_numpy())]
+
+    # O resto ("inf", "1_0", lixo) usa float() por célula; o que não converte fica 0.
+    for i, texto in irregulares:
+        try:
+            out[i] = float(texto)
+        except ValueError:
+            pass
+
+    return np.where(out > 1, out / 100, out)
+
+
+def porcentagem_em_fracao(s):
+    """Versão em lote de `limpar_porcentagem`: strings "50%"/"0,5" viram fração, números passam direto."""
+    s = pd.Series(s) if not isinstance(s, pd.Series) else s
+    if pd.api.types.is_numeric_dtype(s.dtype):
+        return s.to_numpy(dtype=np.float64)
+
+    vals = s.to_numpy(dtype=object)
+    out = np.zeros(len(vals), dtype=np.float64)
+    mascara = _agrupar_tipos(vals)
+
+    numeros = mascara(lambda t: issubclass(t, (int, float)))
+    if numeros.any():
+        out[numeros] = vals[numeros].astype(np.float64)
+    textos = mascara(lambda t: issubclass(t, str))
+    if textos.any():
+        out[textos] = _porcentagem_textos(vals[textos])
+    return out
+
+
+def nota_em_escala_5(s):
+    """Notas na escala 0-10 (> 5) viram 0-5; mantém o dtype inteiro se nada for reescalado."""
+    if not isinstance(s, pd.Series):
+        return s / 10 if s > 5 else s
+    acima = s > 5
+    if not acima.any():
+        return s
+    s = s.astype(np.float64)
+    s[acima] = s[acima] / 10
+    return s
+
+
+def _segundos_do_dia(objs):
+    """h*3600 + m*60 + s para um array de datetime.time / datetime.datetime."""
+    if pa is not None:
+        try:
+            us = pa.array(objs, type=pa.time64("us")).cast(pa.int64()).to_numpy(zero_copy_only=False)
+            return us // 1_000_000
+        except (pa.ArrowInvalid, pa.ArrowTypeError):
+            pass
+    return np.fromiter((v.hour * 3600 + v.minute * 60 + v.second for v in objs), dtype=np.int64, count=len(objs))
+
+
+def tempo_em_segundos(s):
+    """Versão em lote de `converter_tempo`: recebe uma coluna e devolve um array int64 de segundos."""
+    s = pd.Series(s) if not isinstance(s, pd.Series) else s
+    n = len(s)
+
+    if pd.api.types.is_datetime64_any_dtype(s.dtype):
+        dt = s.dt
+        seg = dt.hour * 3600 + dt.minute * 60 + dt.second
+        return seg.fillna(0).to_numpy(dtype=np.int64)
+    if pd.api.types.is_numeric_dtype(s.dtype) or pd.api.types.is_timedelta64_dtype(s.dtype):
+        # Números e Timedelta nunca produzem "H:M:S" via str() -> sempre 0.
+        return np.zeros(n, dtype=np.int64)
+
+    vals = s.to_numpy(dtype=object)
+    out = np.zeros(n, dtype=np.int64)
+    tipo_em = _agrupar_tipos(vals)
+
+    def mascara(*aceitos):
+        return tipo_em(lambda t: t in aceitos)
+
+    textos = mascara(str)
+    if textos.any():
+        out[textos] = _tempo_textos(vals[textos])
+
+    horas = mascara(datetime.time)
+    if horas.any():
+        out[horas] = _segundos_do_dia(vals[horas])
+
+    datas = mascara(datetime.datetime, pd.Timestamp)
+    if datas.any():
+        dt = pd.Series(vals[datas]).map(lambda v: v.time())
+        out[datas] = _segundos_do_dia(dt.to_numpy(dtype=object))
+
+    # Nulos, números e bool dão 0; qualquer outro tipo (ex.: timedelta) usa a versão por célula.
+    outros = ~(textos | horas | datas | mascara(float, int, bool, np.float64, np.int64, type(None)))
+    for i in np.flatnonzero(outros):
+        out[i] = converter_tempo(vals[i])
+    return out
+
+
+def formatar_tempos(segundos):
+    """Versão em lote de `formatar_tempo`: segundos -> "HH:MM:SS" (0 vira "-")."""
+    seg = pd.Series(segundos)
+    total = seg.fillna(0).to_numpy().astype(np.int64)
+    m, s = np.divmod(total, 60)
+    h, m = np.divmod(m, 60)
+
+    def dois_digitos(x):
+        return pd.Series(x, index=seg.index).astype(str).str.zfill(2)
+
+    texto = dois_digitos(h) + ":" + dois_digitos(m) + ":" + dois_digitos(s)
+    return texto.where(seg.to_numpy() != 0, "-")
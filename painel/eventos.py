@@ -0,0 +1,376 @@
+"""Ingestão por eventos: agregados correntes por agente no lugar da planilha inteira.
+
+Cada evento (uma linha JSON) é uma interação encerrada:
+
+    {"aba": "Suporte", "nome": "Ana", "equipe": "Equipe 1", "horario": "08:00-14:00",
+     "tipo": "chat", "fila": "Incidentes", "duracao": 95, "nota": 4.5, "ts": 1760000000.0}
+
+`tipo` é "chat", "pbx_recebida" ou "pbx_efetuada"; `duracao` (segundos ou "HH:MM:SS") e `nota`
+(0-5 ou 0-10) são opcionais (um valor que não converte invalida o evento), `fila` só vale para chat, `equipe`/`horario` valem a partir do
+evento e `ts` só é usado pelo `painel.replay`. Cada evento atualiza somas e contagens do agente em
+O(1); os frames (as mesmas colunas de `processar_aba`) saem dessas somas só quando publicados.
+"""
+import hashlib
+import json
+import logging
+import os
+import socketserver
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+from painel.conversao import converter_tempo
+from painel.mapeamento import ABAS, COLS_NOTA, COLS_PBX, COLS_PERC, FILAS_CHAT, ID_COLS
+from painel.medicao import medir
+from painel.processamento import compactar
+
+log = logging.getLogger(__name__)
+
+TIPOS = ("chat", "pbx_recebida", "pbx_efetuada")
+
+# Equipe/horário de quem ainda não informou (os mesmos padrões da planilha)
+EQUIPE_PADRAO, HORARIO_PADRAO = ID_COLS[1][2], ID_COLS[2][2]
+
+# Sem eventos novos, de quanto em quanto tempo o arquivo é conferido
+ESPERA_ARQUIVO = 0.2
+
+# Bytes lidos do socket por vez
+BLOCO_SOCKET = 65536
+
+
+class EventoInvalido(ValueError):
+    pass
+
+
+def ler_evento(linha, abas=tuple(ABAS)):
+    """Evento validado a partir de uma linha JSON (str ou bytes)."""
+    try:
+        evento = json.loads(linha)
+    except ValueError as e:
+        raise EventoInvalido(f"JSON inválido: {e}") from None
+    if not isinstance(evento, dict):
+        raise EventoInvalido("o evento precisa ser um objeto JSON")
+    if evento.get("aba") not in abas:
+        raise EventoInvalido(f"aba desconhecida: {evento.get('aba')!r}")
+    if evento.get("tipo") not in TIPOS:
+        raise EventoInvalido(f"tipo desconhecido: {evento.get('tipo')!r}")
+    if not str(evento.get("nome") or "").strip():
+        raise EventoInvalido("evento sem nome do agente")
+    return evento
+
+
+def _numero(evento, campo):
+    """Campo numérico opcional: None se ausente ou vazio."""
+    valor = evento.get(campo)
+    if valor is None or valor == "" or valor == "-":
+        return None
+    if campo == "duracao" and isinstance(valor, str):
+        # `converter_tempo` dá 0 ("sem dado") ao que não é "H:M:S"; aqui esse 0 entraria na média do TME
+        partes = valor.strip().split(":")
+        if len(partes) != 3 or not all(p.strip().isdigit() for p in partes):
+            raise EventoInvalido(f"{campo} inválido: {valor!r}")
+        return float(converter_tempo(valor))
+    try:
+        numero = float(valor)
+    except (TypeError, ValueError):
+        raise EventoInvalido(f"{campo} inválido: {valor!r}") from None
+    if not np.isfinite(numero) or (campo == "duracao" and numero < 0):
+        raise EventoInvalido(f"{campo} inválido: {valor!r}")
+    return numero
+
+
+def _media(soma, n):
+    return np.divide(soma, n, out=np.zeros_like(soma), where=n > 0)
+
+
+class AgregadosAba:
+    """Somas e contagens por agente de uma aba, numa matriz (agente x campo) que cresce por dobra."""
+
+    def __init__(self, aba, capacidade=1024):
+        self.aba = aba
+        self.filas = [label for label, _, _ in FILAS_CHAT.get(aba, [])]
+        campos = [
+            "chat", "chat_tme_n", "chat_tme", "chat_nota_n", "chat_nota",
+            "pbx_r", "pbx_e", "pbx_tme_n", "pbx_tme", "pbx_nota_n", "pbx_nota",
+        ]
+        for i in range(len(self.filas)):
+            campos += [f"fila{i}", f"fila{i}_tme_n", f"fila{i}_tme"]
+        self.campo = c = {nome: i for i, nome in enumerate(campos)}
+        # tipo -> campos (contagem, TMEs, soma dos TMEs, notas, soma das notas); fila -> (contagem, TMEs, soma)
+        tipos = (("chat", "chat", "chat"), ("pbx_recebida", "pbx_r", "pbx"), ("pbx_efetuada", "pbx_e", "pbx"))
+        self._campos_tipo = {
+            tipo: (c[contagem], c[f"{p}_tme_n"], c[f"{p}_tme"], c[f"{p}_nota_n"], c[f"{p}_nota"])
+            for tipo, contagem, p in tipos
+        }
+        self._campos_fila = {
+            label: (c[f"fila{i}"], c[f"fila{i}_tme_n"], c[f"fila{i}_tme"]) for i, label in enumerate(self.filas)
+        }
+        self.valores = np.zeros((capacidade, len(campos)))
+        self.posicao = {}  # nome -> linha
+        self.nomes, self.equipes, self.horarios = [], [], []
+
+    def __len__(self):
+        return len(self.nomes)
+
+    def _linha(self, evento):
+        nome = str(evento["nome"]).strip()
+        i = self.posicao.get(nome)
+        if i is None:
+            i = self.posicao[nome] = len(self.nomes)
+            self.nomes.append(nome)
+            self.equipes.append(EQUIPE_PADRAO)
+            self.horarios.append(HORARIO_PADRAO)
+            if i == len(self.valores):
+                self.valores = np.concatenate([self.valores, np.zeros_like(self.valores)])
+        if evento.get("equipe"):
+            self.equipes[i] = str(evento["equipe"])
+        if evento.get("horario"):
+            self.horarios[i] = str(evento["horario"])
+        return i
+
+    def aplicar(self, evento):
+        duracao, nota = _numero(evento, "duracao"), _numero(evento, "nota")
+        if nota is not None and nota > 5:
+            nota /= 10  # escala 0-10, como em `nota_em_escala_5`
+        contagem, tme_n, tme, nota_n, soma_nota = self._campos_tipo[evento["tipo"]]
+        fila = self._campos_fila.get(evento.get("fila")) if evento["tipo"] == "chat" else None
+        i = self._linha(evento)  # antes de `self.valores`, que pode ter crescido
+        linha = self.valores[i]
+        linha[contagem] += 1
+        if duracao is not None:
+            linha[tme_n] += 1
+            linha[tme] += duracao
+        if nota is not None:
+            linha[nota_n] += 1
+            linha[soma_nota] += nota
+        if fila is not None:
+            linha[fila[0]] += 1
+            if duracao is not None:
+                linha[fila[1]] += 1
+                linha[fila[2]] += duracao
+
+    def quadro(self):
+        """Frame com as colunas, a ordem e os tipos de `processar_aba`; TMEs são as médias arredondadas."""
+        n = len(self)
+        v, c = self.valores[:n], self.campo
+
+        def col(nome):
+            return v[:, c[nome]]
+
+        def tme(prefixo):
+            return np.rint(_media(col(f"{prefixo}_tme"), col(f"{prefixo}_tme_n")))
+
+        pbx = col("pbx_r") + col("pbx_e")
+        medias = {
+            "Chat (nota)": _media(col("chat_nota"), col("chat_nota_n")),
+            "PBX (nota)": _media(col("pbx_nota"), col("pbx_nota_n")),
+            "Nota (%)": _media(col("chat_nota_n"), col("chat")),
+            "PBX Nota (%)": _media(col("pbx_nota_n"), pbx),
+        }
+        data = pd.DataFrame({"Nome": self.nomes, "Equipe": self.equipes, "Horario": self.horarios})
+        data["Chat"] = col("chat")
+        data["Total (PBX)"] = pbx
+        for label, _ in COLS_NOTA + COLS_PERC:
+            data[label] = medias[label]
+        data["Chat (TME) [s]"] = tme("chat")
+        data["PBX (TME) [s]"] = tme("pbx")
+        for i, label in enumerate(self.filas):
+            data[f"Chat - {label}"] = col(f"fila{i}")
+            data[f"TME - {label} [s]"] = tme(f"fila{i}")
+        for (label, _), campo in zip(COLS_PBX, ("pbx_r", "pbx_e")):
+            data[label] = col(campo)
+        return compactar(data, self.aba)
+
+
+class _Recebedor(socketserver.StreamRequestHandler):
+    def handle(self):
+        # Um `receber` por bloco lido (várias linhas), não por linha; a linha incompleta espera o resto
+        resto = b""
+        while True:
+            bloco = self.rfile.read1(BLOCO_SOCKET)
+            if not bloco:
+                break
+            bloco = resto + bloco
+            fim = bloco.rfind(b"\n") + 1
+            resto = bloco[fim:]
+            if fim:
+                self.server.fonte.receber(bloco[:fim].splitlines())
+        if resto.strip():
+            self.server.fonte.receber([resto])
+
+
+class _Servidor(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+class FonteEventos:
+    """Fonte com a interface de `PlanilhaRemota` (`carregar`, `versao`, `criado_em`, `restaurado`).
+
+    Os eventos chegam pelo `arquivo` (JSON por linha, seguido como um `tail -F`, desde o começo:
+    o próprio arquivo reconstrói os agregados num reinício) e/ou por um socket TCP em `endereco`
+    (host, porta). Com os dois, o que chega pelo socket é anexado ao arquivo e aplicado ao ser
+    lido dele, então o arquivo continua sendo o registro completo. Sem nenhum dos dois, os eventos
+    chegam só por `aplicar`/`receber` (testes e benchmarks).
+
+    `carregar` publica uma versão nova só se chegaram eventos desde a anterior; `processar` não é
+    usado (não há conteúdo bruto para converter).
+    """
+
+    def __init__(self, abas=tuple(ABAS), arquivo=None, endereco=None):
+        self.abas = tuple(abas)
+        self.arquivo = arquivo
+        self.endereco = endereco
+        self.versao = None
+        self.resultado = None
+        self.criado_em = None
+        self.restaurado = False
+        self.eventos = 0  # eventos aplicados
+        self.invalidos = 0
+        self._agregados = {aba: AgregadosAba(aba) for aba in self.abas}
+        self._publicados = None  # `eventos` na última publicação
+        self._sessao = hashlib.sha256(f"{os.getpid()}-{time.time()}".encode()).hexdigest()[:6]
+        self._lock = threading.Lock()
+        self._lock_arquivo = threading.Lock()
+        self._parar = threading.Event()
+        self._iniciado = False
+        self._servidor = None
+        self._saida = None  # arquivo aberto para anexar o que chega pelo socket
+
+    def aplicar(self, eventos):
+        """Aplica eventos já lidos (dicionários); os inválidos são contados e descartados."""
+        aplicados = invalidos = 0
+        with self._lock:
+            for evento in eventos:
+                try:
+                    self._agregados[evento["aba"]].aplicar(evento)
+                    aplicados += 1
+                except (EventoInvalido, KeyError):
+                    invalidos += 1
+            self.eventos += aplicados
+            self.invalidos += invalidos
+        return aplicados, invalidos
+
+    def receber(self, linhas):
+        """Linhas JSON recebidas (socket ou replay): anexadas ao arquivo, se houver, ou aplicadas."""
+        if self.arquivo is not None:
+            dados = b"".join(
+                linha if linha.endswith(b"\n") else linha + b"\n"
+                for linha in (linha if isinstance(linha, bytes) else linha.encode("utf-8") for linha in linhas)
+            )
+            with self._lock_arquivo:
+                f = self._arquivo_saida()
+                f.write(dados)
+                f.flush()
+            return
+        self._consumir(linhas)
+
+    def _arquivo_saida(self):
+        """O mesmo arquivo aberto para anexar enquanto o caminho apontar para ele (reaberto após rotação)."""
+        try:
+            atual = os.stat(self.arquivo).st_ino
+        except OSError:
+            atual = None
+        if self._saida is not None and atual != os.fstat(self._saida.fileno()).st_ino:
+            self._saida.close()
+            self._saida = None
+        if self._saida is None:
+            self._saida = open(self.arquivo, "ab")
+        return self._saida
+
+    def _consumir(self, linhas):
+        eventos, invalidos = [], 0
+        for linha in linhas:
+            if not linha.strip():
+                continue
+            try:
+                eventos.append(ler_evento(linha, self.abas))
+            except EventoInvalido as e:
+                invalidos += 1
+                log.warning("Evento descartado: %s", e)
+        self.aplicar(eventos)
+        if invalidos:
+            with self._lock:
+                self.invalidos += invalidos
+
+    def _ler_novos(self, f):
+        """Linhas completas acrescentadas desde a última leitura (a última incompleta fica para depois)."""
+        inicio = f.tell()
+        bloco = f.read()
+        fim = bloco.rfind(b"\n") + 1
+        f.seek(inicio + fim)
+        return bloco[:fim].splitlines()
+
+    def _seguir(self, f):
+        while not self._parar.is_set():
+            linhas = self._ler_novos(f)
+            if linhas:
+                with medir("eventos", linhas=len(linhas)):
+                    self._consumir(linhas)
+                continue
+            try:
+                atual = os.stat(self.arquivo)
+            except OSError:
+                atual = None
+            aberto = os.fstat(f.fileno())
+            # Rotação (outro arquivo no caminho) ou truncamento: lê o arquivo novo desde o começo
+            if atual is not None and (atual.st_ino != aberto.st_ino or atual.st_size < f.tell()):
+                f.close()
+                f = open(self.arquivo, "rb")
+                continue
+            self._parar.wait(ESPERA_ARQUIVO)
+        f.close()
+
+    def iniciar(self):
+        """Lê o arquivo existente (reconstruindo os agregados) e começa a seguir o arquivo e o socket."""
+        if self._iniciado:
+            return self
+        self._iniciado = True
+        if self.arquivo is not None:
+            open(self.arquivo, "ab").close()
+            f = open(self.arquivo, "rb")
+            with medir("eventos_replay") as m:
+                self._consumir(self._ler_novos(f))
+                m.linhas = self.eventos
+            threading.Thread(target=self._seguir, args=(f,), name="painel-eventos", daemon=True).start()
+        if self.endereco is not None:
+            self._servidor = _Servidor(tuple(self.endereco), _Recebedor)
+            self._servidor.fonte = self
+            threading.Thread(target=self._servidor.serve_forever, name="painel-eventos-socket", daemon=True).start()
+            log.info("Recebendo eventos em %s:%s", *self._servidor.server_address[:2])
+        return self
+
+    def parar(self):
+        self._parar.set()
+        if self._servidor is not None:
+            self._servidor.shutdown()
+            self._servidor.server_close()
+        with self._lock_arquivo:
+            if self._saida is not None:
+                self._saida.close()
+                self._saida = None
+
+    def carregar(self, processar=None, revalidar=False):
+        """Frames dos agregados atuais; os mesmos objetos enquanto não chegar nenhum evento novo."""
+        self.iniciar()
+        with self._lock:
+            if self.resultado is not None and self.eventos == self._publicados:
+                return self.resultado
+            with medir("eventos_quadro") as m:
+                frames = tuple(self._agregados[aba].quadro() for aba in self.abas)
+                m.linhas = sum(len(df) for df in frames)
+            self._publicados = self.eventos
+            self.resultado = frames
+            self.versao = f"e{self.eventos:07d}-{self._sessao}"
+            self.criado_em = time.time()
+        return self.resultado
+
+
+def endereco_socket(texto):
+    """"host:porta" (ou só a porta, em 127.0.0.1) -> (host, porta); vazio -> None."""
+    if not texto:
+        return None
+    host, _, porta = texto.rpartition(":")
+    return host or "127.0.0.1", int(porta)
@@ -0,0 +1,145 @@
+"""Download da planilha com requisição condicional e hash do conteúdo."""
+import hashlib
+import logging
+import os
+import threading
+import time
+import urllib.error
+import urllib.request
+
+from painel.medicao import REGISTRO, medir
+
+log = logging.getLogger(__name__)
+
+
+class PlanilhaRemota:
+    """Baixa a planilha só quando ela muda e reaproveita o último resultado processado.
+
+    Envia If-None-Match / If-Modified-Since com os validadores da última resposta; se o
+    servidor responder 304, ou se os bytes baixados tiverem o mesmo SHA-256 da última
+    versão processada, `carregar` devolve o resultado em memória sem parsear de novo.
+    `url` também pode ser um caminho local (útil para testes e modo offline).
+
+    Com `snapshots` (um `SnapshotsLocais`), cada versão processada é gravada em disco; um
+    processo novo começa servindo o último snapshot e revalida em segundo plano.
+    """
+
+    def __init__(self, url, timeout=30, snapshots=None):
+        self.url = url
+        self.timeout = timeout
+        self.versao = None  # SHA-256 do conteúdo processado por último
+        self.resultado = None
+        self.snapshots = snapshots
+        self.criado_em = None  # quando o resultado atual foi processado (epoch)
+        self.restaurado = False  # resultado veio do snapshot e ainda não foi conferido na origem
+        self._validadores = {}  # url -> (ETag, Last-Modified) da versão processada
+        self._pendentes = {}  # validadores da última resposta, confirmados após processar
+        self._partes = {}  # fonte com várias URLs: aba -> bytes da versão processada
+        self._lock = threading.Lock()
+
+    def _baixar_url(self, url):
+        """Bytes de uma URL, ou None se o servidor disse que nada mudou (304)."""
+        req = urllib.request.Request(url)
+        etag, last_modified = self._validadores.get(url, (None, None))
+        if self.resultado is not None:
+            if etag:
+                req.add_header("If-None-Match", etag)
+            if last_modified:
+                req.add_header("If-Modified-Since", last_modified)
+        try:
+            with urllib.request.urlopen(req, timeout=self.timeout) as resp:
+                self._pendentes[url] = (resp.headers.get("ETag"), resp.headers.get("Last-Modified"))
+                return resp.read()
+        except urllib.error.HTTPError as e:
+            if e.code == 304:
+                return None
+            raise
+
+    def _ler(self, url):
+        if os.path.exists(url):
+            with open(url, "rb") as f:
+                return f.read()
+        return self._baixar_url(url)
+
+    def baixar(self):
+        """(conteúdo, hash) da versão atual; conteúdo None quando é igual à última processada.
+
+        Com `url` sendo um dicionário aba -> URL (ex.: CSV por aba), o conteúdo é aba -> bytes;
+        abas que responderem 304 reaproveitam os bytes da versão anterior.
+        """
+        if isinstance(self.url, dict):
+            novos = {aba: self._ler(u) for aba, u in self.url.items()}
+            if all(b is None for b in novos.values()):
+                return None, self.versao
+            conteudo = {aba: self._partes[aba] if b is None else b for aba, b in novos.items()}
+            h = hashlib.sha256()
+            for aba in sorted(conteudo):
+                h.update(aba.encode() + b"\0" + len(conteudo[aba]).to_bytes(8, "big"))
+                h.update(conteudo[aba])
+            versao = h.hexdigest()
+            if versao == self.versao:
+                self._partes = conteudo  # mesma versão (ex.: restaurada de snapshot): guarda as partes
+        else:
+            conteudo = self._ler(self.url)
+            if conteudo is None:
+                return None, self.versao
+            versao = hashlib.sha256(conteudo).hexdigest()
+        if versao == self.versao:
+            return None, versao
+        return conteudo, versao
+
+    def _restaurar_snapshot(self):
+        """Carrega o snapshot mais recente do disco; True se havia um."""
+        try:
+            ultimo = self.snapshots.ultimo()
+        except Exception:
+            log.exception("Falha ao ler snapshot local")
+            return False
+        if ultimo is None:
+            return False
+        self.versao, self.resultado, self.criado_em = ultimo
+        self.restaurado = True
+        return True
+
+    def _revalidar(self, processar):
+        try:
+            self.carregar(processar)
+        except Exception:
+            log.exception("Falha ao revalidar a planilha em segundo plano")
+
+    def carregar(self, processar, revalidar=True):
+        """Resultado de `processar(conteudo)`, recalculado só quando o conteúdo mudou.
+
+        Se o resultado vier de um snapshot, `revalidar` confere a planilha numa thread à parte;
+        quem já tem a própria rotina de atualização passa False e olha `restaurado`.
+        """
+        with self._lock:
+            if self.resultado is None and self.snapshots is not None and self._restaurar_snapshot():
+                # stale-while-revalidate: responde já com o snapshot e confere a planilha em paralelo
+                if revalidar:
+                    threading.Thread(target=self._revalidar, args=(processar,), daemon=True).start()
+                return self.resultado
+
+            with medir("download") as m:
+                conteudo, versao = self.baixar()
+                if conteudo is not None:
+                    m.detalhes["bytes"] = sum(map(len, conteudo.values())) if isinstance(conteudo, dict) else len(conteudo)
+            REGISTRO.contar("planilha", "sem_mudanca" if conteudo is None else "nova")
+            self.restaurado = False
+            if conteudo is None and self.resultado is not None:
+                self._validadores.update(self._pendentes)
+                return self.resultado
+            self.resultado = processar(conteudo)
+            self.versao = versao
+            self.criado_em = time.time()
+            self._validadores.update(self._pendentes)
+            if isinstance(conteudo, dict):
+                self._partes = conteudo
+
+        if self.snapshots is not None:
+            try:
+                with medir("snapshot", linhas=sum(len(df) for df in self.resultado)):
+                    self.snapshots.salvar(versao, self.resultado)
+            except Exception:
+                log.exception("Falha ao gravar snapshot local")
+        return self.resultado
@@ -0,0 +1,75 @@
+"""Figuras Plotly dos rankings e das tendências, montadas direto com graph_objects (sem plotly.express)."""
+import functools
+
+import plotly.graph_objects as go
+import plotly.io as pio
+
+# Ranking -> (título do gráfico, cor das barras, formato do rótulo)
+GRAFICOS_RANKING = {
+    "nota_chat": ("⭐ Top {n} Notas (chat)", "#2ecc71", "%{x:.2f}"),
+    "nota_pbx": ("⭐ Top {n} Notas (PBX)", "#9b59b6", "%{x:.2f}"),
+    "volume_chat": ("🏆 Top {n} Volume (chat total)", "#3498db", "%{x}"),
+    "volume_pbx": ("📞 Top {n} Volume (PBX total)", "#e67e22", "%{x}"),
+}
+
+# Acima de tantos pontos a tendência usa traços WebGL (Scattergl) em vez de SVG
+LIMITE_WEBGL = 1000
+
+
+@functools.lru_cache
+def _template(nome):
+    """Do template `nome`, só o que barras e linhas usam: a paleta e o estilo de `scatter`.
+
+    O template do Streamlit traz escalas de cores de heatmap, contour etc. (~3,6 kB) e ia inteiro em
+    cada figura; com theme="streamlit", o frontend completa o layout e troca as cores provisórias.
+    """
+    tema = pio.templates[nome]
+    return go.layout.Template(layout={"colorway": tema.layout.colorway}, data={"scatter": tema.data.scatter})
+
+
+def altura_ranking(n):
+    """Acima do Top 10 as barras ganham altura proporcional para os nomes continuarem legíveis."""
+    return None if n <= 10 else 22 * n
+
+
+def figura_ranking(ranking, coluna, cor, formato, altura=None):
+    """Barras horizontais de um ranking; o rótulo vem de `texttemplate`, sem repetir os valores em `text`."""
+    barras = go.Bar(
+        x=ranking[coluna].to_numpy(),
+        y=ranking["Nome"].to_numpy(),
+        orientation="h",
+        marker_color=cor,
+        texttemplate=formato,
+        textposition="auto",
+        hovertemplate=f"{coluna}=%{{x}}<br>Nome=%{{y}}<extra></extra>",
+        showlegend=False,
+    )
+    return go.Figure(
+        barras,
+        layout=dict(
+            xaxis_title_text=coluna, yaxis_title_text="Nome", barmode="relative", margin_t=60, height=altura,
+            template=_template(pio.templates.default),
+        ),
+    )
+
+
+def figura_tendencia(tendencia, x, y, cor, limite_webgl=LIMITE_WEBGL):
+    """Uma linha (com marcadores) por valor de `cor`; séries grandes vão para WebGL."""
+    traco = go.Scattergl if len(tendencia) > limite_webgl else go.Scatter
+    dados = [
+        traco(
+            x=grupo[x].to_numpy(),
+            y=grupo[y].to_numpy(),
+            name=str(nome),
+            mode="lines+markers",
+            hovertemplate=f"{cor}={nome}<br>{x}=%{{x}}<br>{y}=%{{y}}<extra></extra>",
+        )
+        for nome, grupo in tendencia.groupby(cor, sort=False, observed=True)
+    ]
+    return go.Figure(
+        dados,
+        layout=dict(
+            xaxis_title_text=x, yaxis_title_text=y, legend_title_text=cor, margin_t=60,
+            template=_template(pio.templates.default),
+        ),
+    )
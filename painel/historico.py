@@ -0,0 +1,204 @@
+"""Histórico das cargas da planilha em Parquet particionado (aba / mês / dia)."""
+import datetime
+import glob
+import json
+import os
+import shutil
+import threading
+import time
+
+import pandas as pd
+import pyarrow.dataset as ds
+
+# Como cada métrica vira um valor por equipe e dia; nas médias, 0 é "sem dado" e fica de fora
+AGREGACAO = {
+    "Chat": "sum",
+    "Total (PBX)": "sum",
+    "Chat (nota)": "mean",
+    "PBX (nota)": "mean",
+    "Nota (%)": "mean",
+    "Chat (TME) [s]": "mean",
+    "PBX (TME) [s]": "mean",
+}
+
+# Arquivo de cada partição `dia=` (a última carga de cada agente no dia) e índice dos dias de cada aba
+FECHAMENTO = "fechamento.parquet"
+MANIFESTO = "manifesto.json"
+
+MESES = [
+    "Janeiro", "Fevereiro", "Março", "Abril", "Maio", "Junho",
+    "Julho", "Agosto", "Setembro", "Outubro", "Novembro", "Dezembro",
+]
+
+
+def mes_por_extenso(quando):
+    """Epoch -> "Fevereiro/2026"."""
+    data = datetime.date.fromtimestamp(quando)
+    return f"{MESES[data.month - 1]}/{data.year}"
+
+
+def _ultima_por_agente(dados):
+    """Linhas da carga mais recente de cada agente (todas as linhas dela, se o nome se repetir)."""
+    ultima = dados.groupby("Nome", dropna=False, observed=True)["capturado_em"].transform("max")
+    return dados[dados["capturado_em"] == ultima].reset_index(drop=True)
+
+
+class Historico:
+    """Uma partição por aba e dia: `pasta/aba=<aba>/mes=<AAAA-MM>/dia=<AAAA-MM-DD>/fechamento.parquet`.
+
+    A planilha é acumulada no mês, então a tendência só precisa do fechamento de cada dia: cada
+    carga é fundida ao arquivo do dia, que guarda a última linha de cada agente (uma versão nova
+    não acrescenta arquivo). `aba=<aba>/manifesto.json` lista os dias e a última versão de cada um;
+    `dias` e `assinatura` leem só o manifesto (relido quando muda), e as consultas montam a lista
+    de arquivos por ele, com as partições do período pedido. Dias com mais de `manter_dias` (0 =
+    todos) são apagados a cada registro.
+    """
+
+    def __init__(self, pasta, manter_dias=0):
+        self.pasta = pasta
+        self.manter_dias = manter_dias
+        self._manifestos = {}  # aba -> (mtime do manifesto, dia ISO -> {"versao", "capturado_em"})
+        self._lock = threading.Lock()
+
+    def _pasta_dia(self, aba, dia):
+        return os.path.join(self.pasta, f"aba={aba}", f"mes={dia:%Y-%m}", f"dia={dia:%Y-%m-%d}")
+
+    def _caminho_manifesto(self, aba):
+        return os.path.join(self.pasta, f"aba={aba}", MANIFESTO)
+
+    def _manifesto(self, aba):
+        """dia ISO -> última carga do dia; o arquivo só é relido quando muda (um `stat` por chamada)."""
+        caminho = self._caminho_manifesto(aba)
+        try:
+            mtime = os.stat(caminho).st_mtime_ns
+        except OSError:
+            if not os.path.isdir(os.path.join(self.pasta, f"aba={aba}")):
+                return {}
+            return self._migrar(aba)
+        guardado = self._manifestos.get(aba)
+        if guardado is not None and guardado[0] == mtime:
+            return guardado[1]
+        try:
+            with open(caminho, encoding="utf-8") as f:
+                dias = json.load(f)["dias"]
+        except (OSError, ValueError, KeyError):
+            return self._migrar(aba)
+        self._manifestos[aba] = (mtime, dias)
+        return dias
+
+    def _gravar_manifesto(self, aba, dias):
+        caminho = self._caminho_manifesto(aba)
+        tmp = f"{caminho}.{os.getpid()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"dias": dict(sorted(dias.items()))}, f)
+        os.replace(tmp, caminho)
+        self._manifestos[aba] = (os.stat(caminho).st_mtime_ns, dias)
+
+    def _gravar_dia(self, pasta, dados):
+        os.makedirs(pasta, exist_ok=True)
+        destino = os.path.join(pasta, FECHAMENTO)
+        tmp = f"{destino}.{os.getpid()}.tmp"
+        dados.to_parquet(tmp, index=False)
+        os.replace(tmp, destino)
+
+    def _migrar(self, aba):
+        """Histórico de antes do manifesto (um arquivo por carga): funde cada dia no fechamento e monta o manifesto."""
+        dias = {}
+        for pasta in sorted(glob.glob(os.path.join(self.pasta, f"aba={aba}", "mes=*", "dia=*"))):
+            cargas = sorted(glob.glob(os.path.join(pasta, "*.parquet")))
+            if not cargas:
+                continue
+            dados = _ultima_por_agente(pd.concat([pd.read_parquet(c) for c in cargas], ignore_index=True))
+            self._gravar_dia(pasta, dados)
+            for carga in cargas:
+                if os.path.basename(carga) != FECHAMENTO:
+                    os.remove(carga)
+            ultima = dados.loc[dados["capturado_em"].idxmax()]
+            dias[pasta.rsplit("dia=", 1)[1]] = {
+                "versao": str(ultima["versao"]), "capturado_em": ultima["capturado_em"].timestamp()
+            }
+        self._gravar_manifesto(aba, dias)
+        return dias
+
+    def registrar(self, versao, frames, abas, quando=None):
+        """Funde uma versão (frames na ordem de `abas`) ao fechamento do dia; a mesma versão no mesmo dia é ignorada."""
+        quando = quando or time.time()
+        momento = datetime.datetime.fromtimestamp(quando)
+        dia = momento.date().isoformat()
+        with self._lock:
+            for aba, df in zip(abas, frames):
+                dias = dict(self._manifesto(aba))
+                if dias.get(dia, {}).get("versao") == versao:
+                    continue
+                pasta = self._pasta_dia(aba, momento.date())
+                dados = df.reset_index(drop=True).assign(capturado_em=pd.Timestamp(momento), versao=versao)
+                anterior = os.path.join(pasta, FECHAMENTO)
+                if dia in dias and os.path.exists(anterior):
+                    dados = _ultima_por_agente(pd.concat([pd.read_parquet(anterior), dados], ignore_index=True))
+                self._gravar_dia(pasta, dados)
+                if quando >= dias.get(dia, {}).get("capturado_em", 0):
+                    dias[dia] = {"versao": versao, "capturado_em": quando}
+                self._gravar_manifesto(aba, self._aplicar_retencao(aba, dias, momento.date()))
+
+    def _aplicar_retencao(self, aba, dias, hoje):
+        """Apaga as partições de dia (e os meses vazios) fora da janela de `manter_dias`."""
+        if not self.manter_dias:
+            return dias
+        limite = hoje - datetime.timedelta(days=self.manter_dias)
+        for dia in [d for d in dias if datetime.date.fromisoformat(d) < limite]:
+            data = datetime.date.fromisoformat(dia)
+            pasta = self._pasta_dia(aba, data)
+            shutil.rmtree(pasta, ignore_errors=True)
+            mes = os.path.dirname(pasta)
+            if os.path.isdir(mes) and not os.listdir(mes):
+                os.rmdir(mes)
+            del dias[dia]
+        return dias
+
+    def dias(self, aba):
+        """Dias com carga registrada para a aba, em ordem."""
+        return [datetime.date.fromisoformat(d) for d in sorted(self._manifesto(aba))]
+
+    def _arquivos(self, aba, inicio, fim):
+        return [
+            os.path.join(self._pasta_dia(aba, datetime.date.fromisoformat(dia)), FECHAMENTO)
+            for dia in sorted(self._manifesto(aba))
+            if inicio <= datetime.date.fromisoformat(dia) <= fim
+        ]
+
+    def assinatura(self, aba, inicio, fim):
+        """Última versão de cada dia do período, do manifesto; muda sempre que uma carga nova entra (chave de cache das tendências)."""
+        return tuple(
+            (dia, carga["versao"], carga["capturado_em"])
+            for dia, carga in sorted(self._manifesto(aba).items())
+            if inicio <= datetime.date.fromisoformat(dia) <= fim
+        )
+
+    def consultar(self, aba, inicio, fim, colunas=None, filtro=None):
+        """Fechamento de cada dia da aba entre `inicio` e `fim` (datas, inclusive), com uma coluna `dia`."""
+        arquivos = self._arquivos(aba, inicio, fim)
+        if not arquivos:
+            return pd.DataFrame(columns=(colunas or []) + ["capturado_em", "dia"])
+        if colunas is not None:
+            colunas = list(dict.fromkeys(colunas + ["capturado_em"]))
+        df = ds.dataset(arquivos, format="parquet").to_table(columns=colunas, filter=filtro).to_pandas()
+        df["dia"] = df["capturado_em"].dt.normalize()
+        return df
+
+    def tendencia_agentes(self, aba, nomes, metrica, inicio, fim):
+        """Valor de `metrica` por dia para cada agente de `nomes` (dia, Nome, metrica)."""
+        filtro = ds.field("Nome").isin(list(nomes))
+        df = self.consultar(aba, inicio, fim, ["Nome", metrica], filtro)
+        return df[["dia", "Nome", metrica]].sort_values(["Nome", "dia"]).reset_index(drop=True)
+
+    def tendencia_equipes(self, aba, equipes, metrica, inicio, fim):
+        """`metrica` agregada por equipe e dia (soma para volumes, média sem zeros para o resto)."""
+        filtro = ds.field("Equipe").isin(list(equipes))
+        df = self.consultar(aba, inicio, fim, ["Equipe", metrica], filtro)
+        if df.empty:
+            return pd.DataFrame(columns=["dia", "Equipe", metrica])
+        df[metrica] = df[metrica].astype("float64")
+        if AGREGACAO.get(metrica, "mean") == "mean":
+            df = df[df[metrica] != 0]
+        agg = df.groupby(["dia", "Equipe"], as_index=False)[metrica].agg(AGREGACAO.get(metrica, "mean"))
+        return agg.sort_values(["Equipe", "dia"]).reset_index(drop=True)
@@ -0,0 +1,222 @@
+"""Processamento incremental entre versões da planilha e feed das mudanças de metas.
+
+A cada versão, cada aba bruta é comparada com a anterior valor a valor, por agente (nome): só as
+linhas novas ou alteradas passam por `processar_linhas`; as outras são copiadas do frame processado
+anterior. As mudanças de atingimento das metas padrão viram eventos (`Mudanca`).
+"""
+import collections
+import itertools
+import threading
+
+import numpy as np
+import pandas as pd
+
+from painel.conversao import converter_tempo, formatar_tempo
+from painel.mapeamento import ABAS
+from painel.medicao import medir
+from painel.metas import COLS_TME, META_NOTA, META_PERC, META_TME_CHAT, META_TME_PBX, avaliar_metas
+from painel.processamento import (
+    CATEGORIAS,
+    conferir_abas,
+    get_id_cols,
+    ler_brutas,
+    normalizar_bruto,
+    processar_linhas,
+)
+
+# Um agente (ou a linha de um agente) mudou de situação numa meta: bateu True/False, ou None (sem avaliação)
+Mudanca = collections.namedtuple("Mudanca", ["seq", "aba", "nome", "coluna", "bateu", "antes", "depois"])
+
+# Estado de uma aba após processar uma versão: aba bruta normalizada, chave de cada linha e frame processado
+_Estado = collections.namedtuple("_Estado", ["bruto", "chaves", "frame"])
+
+# Metas avaliadas no feed (as de volume dependem da média da equipe e mudam para todos de uma vez)
+COLUNAS_FEED = ["Chat (nota)", "Nota (%)", "Chat (TME)", "PBX (TME)"]
+
+# Abas menores que isso, ou com mais dessa fração de linhas alteradas, são processadas inteiras: processar
+# só as alteradas e remontar o frame custa o mesmo ou mais (benchmarks/bench_incremental.py)
+LINHAS_MINIMAS_PARCIAL = 3000
+FRACAO_MAXIMA_PARCIAL = 0.5
+
+
+def chaves_agentes(bruto):
+    """Nome de cada linha; com nomes repetidos, nome + ocorrência (as linhas continuam distintas).
+
+    Nomes vazios viram "" antes: no pandas 3, `astype(str)` mantém o NaN, que não soma com texto.
+    """
+    nome = pd.Index(get_id_cols(bruto)[0].fillna("").astype(str).to_numpy(dtype=object))
+    if nome.is_unique:
+        return nome
+    ocorrencia = pd.Series(nome).groupby(nome).cumcount().astype(str).to_numpy(dtype=object)
+    return pd.Index(nome.to_numpy() + "\0" + ocorrencia)
+
+
+def linhas_diferentes(antes, agora):
+    """Máscara das linhas de `agora` com algum valor diferente da linha correspondente de `antes`
+    (mesmas colunas, linhas já alinhadas); nulos dos dois lados contam como iguais."""
+    diferente = np.zeros(len(agora), dtype=bool)
+    for col in agora.columns:
+        a, b = antes[col], agora[col]
+        # Texto em Arrow é comparado no próprio array (sem virar objetos Python); o resto, em numpy
+        if isinstance(a.dtype, pd.StringDtype) and a.dtype == b.dtype:
+            a, b = a.array, b.array
+        else:
+            a, b = a.to_numpy(), b.to_numpy()
+        pos = np.flatnonzero(np.asarray(a != b, dtype=bool))
+        diferente[pos[~(pd.isna(a[pos]) & pd.isna(b[pos]))]] = True
+    return diferente
+
+
+def descrever_mudanca(m):
+    """Texto curto de uma `Mudanca`, para notificações."""
+    def valor(v):
+        if m.coluna in COLS_TME:
+            return formatar_tempo(v)
+        return f"{v:.0%}" if m.coluna == "Nota (%)" else f"{v:.2f}"
+
+    situacao = {True: "bateu a meta de", False: "saiu da meta de", None: "ficou sem avaliação em"}[m.bateu]
+    return f"{m.nome} ({m.aba}) {situacao} {m.coluna}: {valor(m.antes)} → {valor(m.depois)}"
+
+
+class ProcessadorIncremental:
+    """Substitui `ler_planilha` (é chamável com o conteúdo baixado) guardando o estado de cada aba.
+
+    Depois de cada chamada, `alteradas(aba, anterior, novo)` diz quais posições mudaram entre os
+    dois frames (para atualizar índices sem remontá-los) e `mudancas(desde)` devolve o feed.
+    """
+
+    def __init__(self, leitor="openpyxl", abas=tuple(ABAS), feed_maximo=500):
+        self.leitor = leitor
+        self.abas = tuple(abas)
+        self._estados = {}
+        self._deltas = {}  # aba -> (frame anterior, frame novo, posições alteradas ou None)
+        self._feed = collections.deque(maxlen=feed_maximo)
+        self._seq = itertools.count(1)
+        self._lock = threading.Lock()
+
+    def __call__(self, conteudo):
+        return self.processar_brutas(ler_brutas(conteudo, self.leitor, self.abas))
+
+    def processar_brutas(self, xls):
+        """Como `processar_planilha`, a partir do dicionário aba -> DataFrame bruto."""
+        conferir_abas(xls, self.abas)
+        with self._lock:
+            frames = []
+            for aba in self.abas:
+                with medir("processar_aba", aba=aba) as m:
+                    frames.append(self._processar(aba, normalizar_bruto(xls[aba]), m))
+                    m.linhas = len(frames[-1])
+            return tuple(frames)
+
+    def _processar(self, aba, bruto, m):
+        chaves = chaves_agentes(bruto)
+        anterior = self._estados.get(aba)
+
+        if anterior is None or list(bruto.columns) != list(anterior.bruto.columns) or not len(anterior.chaves):
+            frame = processar_linhas(bruto, aba)
+            self._guardar(aba, _Estado(bruto, chaves, frame), anterior, None)
+            m.detalhes["reprocessadas"] = len(frame)
+            return frame
+
+        # Posição de cada agente na versão anterior (-1 = agente novo) e linhas com valores diferentes
+        pos_ant = anterior.chaves.get_indexer(chaves)
+        mesma_ordem = len(chaves) == len(anterior.chaves) and (pos_ant == np.arange(len(chaves))).all()
+        if mesma_ordem:
+            mudou = linhas_diferentes(anterior.bruto, bruto)
+        else:
+            novo = pos_ant < 0
+            mudou = novo.copy()
+            mudou[~novo] = linhas_diferentes(anterior.bruto.iloc[pos_ant[~novo]], bruto[~novo])
+        m.detalhes["reprocessadas"] = int(mudou.sum())
+
+        if mesma_ordem and not mudou.any():
+            frame = anterior.frame  # nada mudou nesta aba: o mesmo frame (e os mesmos índices) continua valendo
+        elif len(bruto) < LINHAS_MINIMAS_PARCIAL or mudou.sum() > FRACAO_MAXIMA_PARCIAL * len(bruto):
+            frame = processar_linhas(bruto, aba)
+            m.detalhes["reprocessadas"] = len(frame)
+        else:
+            partes = [anterior.frame.iloc[pos_ant[~mudou]].set_axis(bruto.index[~mudou])]
+            if mudou.any():
+                partes.append(processar_linhas(bruto[mudou], aba))
+            frame = pd.concat(partes).loc[bruto.index]
+            for col in CATEGORIAS:
+                # Categorias como as de um processamento completo: só as presentes, em ordem
+                col_cat = frame[col]
+                frame[col] = (
+                    col_cat.cat.remove_unused_categories()
+                    if isinstance(col_cat.dtype, pd.CategoricalDtype)
+                    else col_cat.astype("category")
+                )
+
+        alteradas = np.flatnonzero(mudou) if mesma_ordem else None
+        self._guardar(aba, _Estado(bruto, chaves, frame), anterior, alteradas)
+        # Agentes que já existiam e mudaram: compara o atingimento das metas antes/depois
+        comuns = np.flatnonzero(mudou & (pos_ant >= 0))
+        if len(comuns):
+            self._registrar_mudancas(aba, anterior.frame.iloc[pos_ant[comuns]], frame.iloc[comuns])
+        return frame
+
+    def _guardar(self, aba, estado, anterior, alteradas):
+        self._estados[aba] = estado
+        self._deltas[aba] = (anterior.frame if anterior is not None else None, estado.frame, alteradas)
+
+    def adotar(self, processados, publicados):
+        """Troca os frames guardados (`processados`, na ordem das abas) pelos equivalentes `publicados`.
+
+        O plano compartilhado passa os frames mapeados do Arrow: a cópia processada em memória é
+        liberada e `alteradas` continua reconhecendo os frames que as sessões recebem.
+        """
+        with self._lock:
+            for aba, processado, publicado in zip(self.abas, processados, publicados):
+                estado = self._estados.get(aba)
+                if estado is not None and estado.frame is processado:
+                    self._estados[aba] = estado._replace(frame=publicado)
+                anterior, novo, alteradas = self._deltas.get(aba, (None, None, None))
+                if novo is processado:
+                    self._deltas[aba] = (anterior, publicado, alteradas)
+
+    def _registrar_mudancas(self, aba, antes, depois):
+        metas = (
+            META_NOTA.get(aba, META_NOTA["Suporte"]), META_PERC,
+            converter_tempo(META_TME_CHAT), converter_tempo(META_TME_PBX),
+        )
+        # Antes e depois empilhados, só com as colunas das metas do feed: uma avaliação só. Os frames
+        # processados só têm os TMEs em segundos, e `avaliar_metas` só avalia uma meta de TME quando a
+        # coluna exibida também existe (a regra em si lê a de segundos)
+        fontes = [COLS_TME.get(col, col) for col in COLUNAS_FEED if COLS_TME.get(col, col) in depois.columns]
+        ambos = pd.concat([antes[fontes], depois[fontes]], ignore_index=True)
+        ambos = ambos.assign(**{col: ambos[seg] for col, seg in COLS_TME.items() if seg in fontes})
+        status = avaliar_metas(ambos, np.nan, np.nan, *metas)
+        n = len(depois)
+        nomes = depois["Nome"].to_numpy(dtype=object)
+        for col in [c for c in COLUNAS_FEED if c in status.columns]:
+            s = status[col].to_numpy(dtype=object, na_value=None)
+            valores = ambos[COLS_TME.get(col, col)].to_numpy(dtype=float)
+            for i in np.flatnonzero(s[:n] != s[n:]):
+                self._feed.append(Mudanca(
+                    next(self._seq), aba, nomes[i], col, s[n + i], float(valores[i]), float(valores[n + i])
+                ))
+
+    def alteradas(self, aba, anterior, novo):
+        """Posições que mudaram de `anterior` para `novo` (mesmas linhas, mesma ordem); None se não for o caso."""
+        with self._lock:
+            delta = self._deltas.get(aba)
+        if delta is None or delta[0] is not anterior or delta[1] is not novo:
+            return None
+        return delta[2]
+
+    @property
+    def ultima_seq(self):
+        with self._lock:
+            return self._feed[-1].seq if self._feed else 0
+
+    def mudancas(self, desde=0):
+        """Eventos do feed com `seq` maior que `desde`, do mais antigo ao mais novo."""
+        with self._lock:
+            return [m for m in self._feed if m.seq > desde]
+
+    def receber_mudancas(self, mudancas):
+        """Acrescenta ao feed eventos de outro processo (sem `seq`, que é renumerado aqui)."""
+        with self._lock:
+            for m in mudancas:
+                self._feed.append(Mudanca(next(self._seq), **m))
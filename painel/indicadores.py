@@ -0,0 +1,230 @@
+"""Indicadores calculados sobre os frames processados: filtro, KPIs, rankings e tabela de metas."""
+import collections
+
+import numpy as np
+import pandas as pd
+
+from painel.conversao import formatar_tempos
+from painel.mapeamento import COLUNA_FONTE, FILAS_CHAT
+from painel.metas import avaliar_metas
+
+Kpis = collections.namedtuple(
+    "Kpis", ["media_vol_chat", "media_vol_pbx", "total_chat", "nota_chat", "total_pbx", "nota_pbx"]
+)
+
+# Top N de cada gráfico, já na ordem de exibição (crescente)
+Rankings = collections.namedtuple("Rankings", ["nota_chat", "nota_pbx", "volume_chat", "volume_pbx"])
+
+# Ranking -> (coluna ordenada, coluna que precisa ser > 0 para o agente entrar)
+RANKINGS = {
+    "nota_chat": ("Chat (nota)", "Chat"),
+    "nota_pbx": ("PBX (nota)", "Total (PBX)"),
+    "volume_chat": ("Chat", None),
+    "volume_pbx": ("Total (PBX)", None),
+}
+
+# Colunas da tabela de metas: exibidas e as usadas só no cálculo
+COLUNAS_RESUMO = [
+    "Nome", "Equipe", "Horario", COLUNA_FONTE, "Chat", "Chat (nota)", "Nota (%)", "Chat (TME)", "Total (PBX)", "PBX (TME)"
+]
+COLUNAS_CALCULO = ["Chat (TME) [s]", "PBX (TME) [s]"]
+
+
+def _pertence(col, valores):
+    """`col.isin(valores)`; em colunas categóricas compara os códigos inteiros, sem tocar nos textos."""
+    if isinstance(col.dtype, pd.CategoricalDtype):
+        codigos = col.cat.categories.get_indexer(list(valores))
+        return np.isin(col.cat.codes.to_numpy(), codigos[codigos >= 0])
+    return col.astype(str).isin(valores).to_numpy()
+
+
+def opcoes(col):
+    """Valores distintos (texto, em ordem) de uma coluna de identidade, para os filtros."""
+    if isinstance(col.dtype, pd.CategoricalDtype):
+        return sorted(map(str, col.cat.remove_unused_categories().cat.categories))
+    return sorted(col.dropna().astype(str).unique())
+
+
+def filtrar(df, equipes=None, horarios=None):
+    """Linhas das equipes/horários selecionados (None = sem filtro naquela coluna)."""
+    mascara = np.ones(len(df), dtype=bool)
+    if equipes is not None:
+        mascara &= _pertence(df["Equipe"], equipes)
+    if horarios is not None:
+        mascara &= _pertence(df["Horario"], horarios)
+    return df[mascara].copy()
+
+
+def calcular_kpis(dff):
+    """Médias de volume (base das metas), totais e notas médias de quem atendeu."""
+    # Volumes ficam em float32 no frame; somas e médias em float64 para não perder precisão
+    chat = dff["Chat"].astype("float64")
+    pbx = dff["Total (PBX)"].astype("float64")
+    return Kpis(
+        media_vol_chat=chat.mean(),
+        media_vol_pbx=pbx.mean(),
+        total_chat=chat.sum(),
+        nota_chat=dff[chat > 0]["Chat (nota)"].mean(),
+        total_pbx=pbx.sum(),
+        nota_pbx=dff[pbx > 0]["PBX (nota)"].mean(),
+    )
+
+
+def calcular_rankings(dff, n=10):
+    tops = {}
+    for nome, (col, exige) in RANKINGS.items():
+        base = dff[dff[exige] > 0] if exige else dff
+        tops[nome] = base.nlargest(n, col).sort_values(col, kind="stable")
+    return Rankings(**tops)
+
+
+def montar_resumo(dff):
+    """(tabela de metas, colunas exibidas): só o necessário para metas + visão geral."""
+    base_cols = [c for c in COLUNAS_RESUMO + COLUNAS_CALCULO if c in dff.columns]
+    resumo = dff[base_cols].copy()
+    resumo["Chat (TME)"] = formatar_tempos(resumo["Chat (TME) [s]"])
+    resumo["PBX (TME)"] = formatar_tempos(resumo["PBX (TME) [s]"])
+
+    colunas_visiveis = [c for c in COLUNAS_RESUMO if c in resumo.columns]
+    colunas_calculo = [c for c in COLUNAS_CALCULO if c in resumo.columns]
+    return resumo[colunas_visiveis + colunas_calculo], colunas_visiveis
+
+
+def resultado_metas(dff, meta_nota, meta_perc, meta_tme_chat_seg, meta_tme_pbx_seg):
+    """Tabela de metas com uma coluna "Meta <coluna>" (True/False/NA) por regra, para relatórios."""
+    kpis = calcular_kpis(dff)
+    resumo, colunas_visiveis = montar_resumo(dff)
+    status = avaliar_metas(
+        resumo, kpis.media_vol_chat, kpis.media_vol_pbx, meta_nota, meta_perc, meta_tme_chat_seg, meta_tme_pbx_seg
+    )
+    resumo = resumo[colunas_visiveis]
+    for col in status.columns:
+        resumo[f"Meta {col}"] = status[col]
+    return resumo
+
+
+def montar_detalhe(dff, nome_aba):
+    """(tabela de detalhamento por fila, formatos do Styler) para a aba."""
+    # Define a ordem por aba
+    ordem = {
+        "Suporte": [
+            "Chat - Suporte", "Chat - Incidentes", "Chat - Visitas", "Chat - Migração BR", "Chat - Total",
+            "TME - Suporte", "TME - Incidentes", "TME - Visitas", "TME - Migração BR", "TME - Média",
+            "PBX - Recebidas", "PBX - Efetuadas", "PBX - Total", "PBX - TME",
+            "Chat - Nota", "Chat - % Nota", "PBX - Nota", "PBX - % Nota",
+        ],
+        "SAC": [
+            "Chat - Relacionamento", "Chat - Bloqueios", "Chat - Visitas", "Chat - Migração BR", "Chat - Total",
+            "TME - Relacionamento", "TME - Bloqueios", "TME - Visitas", "TME - Migração BR", "TME - Média",
+            "PBX - Recebidas", "PBX - Efetuadas", "PBX - Total", "PBX - TME",
+            "Chat - Nota", "Chat - % Nota", "PBX - Nota", "PBX - % Nota",
+        ],
+    }
+
+    # Mapeia colunas do seu DF -> nomes de exibição no detalhamento
+    filas = FILAS_CHAT.get(nome_aba, [])  # lista de tuplas: (label, col_qtd, col_tme)
+    if nome_aba not in ordem:
+        # Aba de outra operação (painel.registro): filas tiradas das colunas do frame, na mesma disposição
+        filas = [(c[len("Chat - "):], None, None) for c in dff.columns if c.startswith("Chat - ")]
+        ordem[nome_aba] = (
+            [f"Chat - {label}" for label, _, _ in filas] + ["Chat - Total"]
+            + [f"TME - {label}" for label, _, _ in filas] + ["TME - Média"]
+            + ["PBX - Recebidas", "PBX - Efetuadas", "PBX - Total", "PBX - TME"]
+            + ["Chat - Nota", "Chat - % Nota", "PBX - Nota", "PBX - % Nota"]
+        )
+
+    # Começa com "Nome/Equipe/Horario" (se você quiser ocultar, é só remover daqui)
+    identidade = [c for c in ["Nome", "Equipe", "Horario", COLUNA_FONTE] if c in dff.columns]
+    det = dff[identidade].copy()
+
+    # CHAT por fila (volumes)
+    for label, _, _ in filas:
+        src = f"Chat - {label}"           # já existe no DF
+        dst = f"Chat - {label}"           # nome de exibição
+        if src in dff.columns:
+            det[dst] = dff[src]
+        else:
+            det[dst] = 0
+
+    # CHAT total
+    det["Chat - Total"] = dff["Chat"] if "Chat" in dff.columns else 0
+
+    # TME por fila (em segundos; vira "HH:MM:SS" só na página exibida, ver `pagina_detalhe`)
+    for label, _, _ in filas:
+        src_s = f"TME - {label} [s]"      # já existe no DF
+        dst = f"TME - {label}"            # exibição
+        if src_s in dff.columns:
+            det[dst] = dff[src_s]
+        else:
+            det[dst] = 0
+
+    # TME média (tme_chat) -> do seu DF: "Chat (TME) [s]"
+    if "Chat (TME) [s]" in dff.columns:
+        det["TME - Média"] = dff["Chat (TME) [s]"]
+    else:
+        det["TME - Média"] = 0
+
+    # PBX volumes
+    det["PBX - Recebidas"] = dff["PBX Recebidas"] if "PBX Recebidas" in dff.columns else 0
+    det["PBX - Efetuadas"] = dff["PBX Efetuadas"] if "PBX Efetuadas" in dff.columns else 0
+    det["PBX - Total"] = dff["Total (PBX)"] if "Total (PBX)" in dff.columns else 0
+
+    # PBX TME
+    if "PBX (TME) [s]" in dff.columns:
+        det["PBX - TME"] = dff["PBX (TME) [s]"]
+    else:
+        det["PBX - TME"] = 0
+
+    # Notas e percentuais
+    det["Chat - Nota"] = dff["Chat (nota)"] if "Chat (nota)" in dff.columns else 0
+    det["Chat - % Nota"] = dff["Nota (%)"] if "Nota (%)" in dff.columns else 0.0
+    det["PBX - Nota"] = dff["PBX (nota)"] if "PBX (nota)" in dff.columns else 0
+    det["PBX - % Nota"] = dff["PBX Nota (%)"] if "PBX Nota (%)" in dff.columns else 0.0
+
+    # Ordena colunas exatamente como solicitado (mantendo Nome/Equipe/Horario no começo)
+    ordem_cols = ordem.get(nome_aba, [])
+    colunas_visiveis = identidade + ordem_cols
+
+    # Garante que só vai exibir o que existe
+    colunas_visiveis = [c for c in colunas_visiveis if c in det.columns]
+    det = det[colunas_visiveis]
+
+    # Formatação
+    fmt = {}
+    for c in det.columns:
+        if c.startswith("Chat - ") and c not in ["Chat - % Nota", "Chat - Nota"]:
+            fmt[c] = "{:.0f}"
+        if c.startswith("PBX - ") and c not in ["PBX - TME", "PBX - % Nota", "PBX - Nota"]:
+            fmt[c] = "{:.0f}"
+
+    fmt.update({
+        "Chat - Nota": "{:.2f}",
+        "Chat - % Nota": "{:.1%}",
+        "PBX - Nota": "{:.2f}",
+        "PBX - % Nota": "{:.1%}",
+    })
+
+    return det, fmt
+
+
+def colunas_tempo_detalhe(det):
+    """Colunas do detalhamento guardadas em segundos e exibidas como "HH:MM:SS"."""
+    return [c for c in det.columns if c.startswith("TME - ") or c == "PBX - TME"]
+
+
+def ordem_detalhe(det, coluna=None, crescente=True):
+    """Posições das linhas de `det` ordenadas por `coluna` (estável; None mantém a ordem original)."""
+    if coluna is None:
+        return np.arange(len(det))
+    valores = det[coluna]
+    if isinstance(valores.dtype, pd.CategoricalDtype):
+        valores = valores.astype(str)
+    ordem = valores.reset_index(drop=True).sort_values(ascending=crescente, kind="stable", na_position="last")
+    return ordem.index.to_numpy()
+
+
+def pagina_detalhe(det, ordem, pagina, tamanho):
+    """Linhas da `pagina` (a partir de 0) na `ordem` dada, com os TMEs já formatados."""
+    pag = det.iloc[ordem[pagina * tamanho:(pagina + 1) * tamanho]]
+    tempos = colunas_tempo_detalhe(pag)
+    return pag.assign(**{c: formatar_tempos(pag[c]).to_numpy() for c in tempos})
@@ -0,0 +1,218 @@
+"""Índices montados uma vez por versão dos dados, para filtrar e agregar sem varrer o frame."""
+import copy
+
+import numpy as np
+import pandas as pd
+
+from painel.indicadores import RANKINGS, Kpis, Rankings
+
+
+def _categorias(col):
+    """(códigos >= 0, rótulos em texto); valores ausentes ganham um rótulo None, que nenhum filtro seleciona."""
+    if isinstance(col.dtype, pd.CategoricalDtype):
+        codigos, categorias = col.cat.codes.to_numpy(), col.cat.categories
+    else:
+        codigos, categorias = pd.factorize(col, sort=True)
+    rotulos = np.array([str(c) for c in categorias] + [None], dtype=object)
+    return np.where(codigos < 0, len(categorias), codigos).astype(np.int64), rotulos
+
+
+class IndiceGrupos:
+    """Posições das linhas e agregados de Chat/Total (PBX) por par (Equipe, Horário).
+
+    Um filtro vira a união das posições dos grupos selecionados, e os KPIs (inclusive as
+    médias de volume usadas como meta) saem da soma dos agregados desses grupos.
+    """
+
+    def __init__(self, df):
+        self.n = len(df)
+        cod_eq, cat_eq = _categorias(df["Equipe"])
+        cod_hr, cat_hr = _categorias(df["Horario"])
+        grupo = cod_eq * len(cat_hr) + cod_hr
+        ids, inverso = np.unique(grupo, return_inverse=True)
+        # Código da equipe e do horário de cada grupo, e rótulo -> código para traduzir a seleção
+        self._ids, self._rotulos = ids, (cat_eq, cat_hr)
+        self._grupo_equipe, self._grupo_horario = ids // len(cat_hr), ids % len(cat_hr)
+        self._cod_equipe = {r: i for i, r in enumerate(cat_eq) if r is not None}
+        self._cod_horario = {r: i for i, r in enumerate(cat_hr) if r is not None}
+        self._n_equipes, self._n_horarios = len(cat_eq), len(cat_hr)
+
+        self._grupo_da_linha = inverso
+        # Posições agrupadas: as linhas do grupo g são ordem[inicio[g]:inicio[g] + contagem[g]]
+        self.ordem = np.argsort(inverso, kind="stable")
+        contagem = np.bincount(inverso, minlength=len(ids))
+        self.contagem = contagem
+        self.inicio = np.concatenate([[0], np.cumsum(contagem)[:-1]])
+        self.agregados = self._agregar(df, inverso, len(ids))
+
+    @staticmethod
+    def _agregar(df, grupos, total):
+        def somar(pesos):
+            return np.bincount(grupos, weights=pesos, minlength=total)
+
+        chat = df["Chat"].to_numpy(dtype="float64")
+        pbx = df["Total (PBX)"].to_numpy(dtype="float64")
+        nota_chat = df["Chat (nota)"].to_numpy(dtype="float64")
+        nota_pbx = df["PBX (nota)"].to_numpy(dtype="float64")
+        # Notas médias só de quem atendeu, ignorando NaN (como Series.mean)
+        valida_chat = (chat > 0) & ~np.isnan(nota_chat)
+        valida_pbx = (pbx > 0) & ~np.isnan(nota_pbx)
+        return {
+            "linhas": np.bincount(grupos, minlength=total).astype("float64"),
+            "soma_chat": somar(chat),
+            "soma_pbx": somar(pbx),
+            "com_nota_chat": somar(valida_chat.astype("float64")),
+            "soma_nota_chat": somar(np.where(valida_chat, nota_chat, 0.0)),
+            "com_nota_pbx": somar(valida_pbx.astype("float64")),
+            "soma_nota_pbx": somar(np.where(valida_pbx, nota_pbx, 0.0)),
+        }
+
+    def __len__(self):
+        return len(self.contagem)
+
+    def atualizado(self, df, posicoes):
+        """Índice de `df` quando, desde o frame deste índice, só as linhas `posicoes` mudaram (mesmas
+        linhas na mesma ordem) e nenhuma trocou de grupo; None se não der para aproveitar.
+
+        Só os agregados dos grupos tocados são recalculados, somando as linhas na mesma ordem da
+        montagem completa (o resultado é idêntico ao de `IndiceGrupos(df)`).
+        """
+        if len(df) != self.n:
+            return None
+        cod_eq, cat_eq = _categorias(df["Equipe"])
+        cod_hr, cat_hr = _categorias(df["Horario"])
+        if not all(np.array_equal(a, b) for a, b in zip((cat_eq, cat_hr), self._rotulos)):
+            return None
+        grupo = cod_eq[posicoes] * len(cat_hr) + cod_hr[posicoes]
+        if not np.array_equal(grupo, self._ids[self._grupo_da_linha[posicoes]]):
+            return None
+
+        novo = copy.copy(self)
+        tocados = np.zeros(len(self), dtype=bool)
+        tocados[self._grupo_da_linha[posicoes]] = True
+        linhas = self.linhas(tocados)
+        parciais = self._agregar(df.iloc[linhas], self._grupo_da_linha[linhas], len(self))
+        novo.agregados = {nome: np.where(tocados, parciais[nome], valores) for nome, valores in self.agregados.items()}
+        return novo
+
+    def posicoes(self, grupo):
+        return self.ordem[self.inicio[grupo]:self.inicio[grupo] + self.contagem[grupo]]
+
+    def selecionar(self, equipes=None, horarios=None):
+        """Máscara dos grupos (não das linhas) que entram no filtro."""
+        sel = np.ones(len(self), dtype=bool)
+        if equipes is not None:
+            sel &= self._marcar(self._cod_equipe, self._n_equipes, equipes)[self._grupo_equipe]
+        if horarios is not None:
+            sel &= self._marcar(self._cod_horario, self._n_horarios, horarios)[self._grupo_horario]
+        return sel
+
+    @staticmethod
+    def _marcar(codigos, total, valores):
+        marcados = np.zeros(total, dtype=bool)
+        marcados[[codigos[v] for v in map(str, valores) if v in codigos]] = True
+        return marcados
+
+    def linhas(self, sel):
+        """Posições (em ordem) das linhas dos grupos selecionados."""
+        if sel.all():
+            return np.arange(self.n)
+        # União das faixas de `ordem` dos grupos selecionados, sem laço em Python
+        inicios, tamanhos = self.inicio[sel], self.contagem[sel]
+        total = tamanhos.sum()
+        deslocamento = np.repeat(inicios - np.concatenate([[0], np.cumsum(tamanhos)[:-1]]), tamanhos)
+        return np.sort(self.ordem[np.arange(total) + deslocamento])
+
+    def mascara_linhas(self, sel):
+        """Máscara booleana das linhas dos grupos selecionados."""
+        return sel[self._grupo_da_linha]
+
+    def filtrar(self, df, equipes=None, horarios=None):
+        """Mesmo resultado de `indicadores.filtrar`, sem comparar linha a linha."""
+        return df.iloc[self.linhas(self.selecionar(equipes, horarios))].copy()
+
+    def kpis(self, equipes=None, horarios=None):
+        """Mesmos valores de `indicadores.calcular_kpis`, somando os agregados dos grupos."""
+        sel = self.selecionar(equipes, horarios)
+        a = {nome: valores[sel].sum() for nome, valores in self.agregados.items()}
+
+        def razao(num, den):
+            return num / den if den else float("nan")
+
+        return Kpis(
+            media_vol_chat=razao(a["soma_chat"], a["linhas"]),
+            media_vol_pbx=razao(a["soma_pbx"], a["linhas"]),
+            total_chat=a["soma_chat"],
+            nota_chat=razao(a["soma_nota_chat"], a["com_nota_chat"]),
+            total_pbx=a["soma_pbx"],
+            nota_pbx=razao(a["soma_nota_pbx"], a["com_nota_pbx"]),
+        )
+
+
+class IndiceRankings:
+    """Ordem decrescente de cada métrica de `RANKINGS`, só com os agentes elegíveis.
+
+    Empates seguem a ordem das linhas, como `nlargest(keep="first")`. O top N de um filtro
+    percorre a ordem pronta em blocos e para assim que junta N linhas do filtro.
+    """
+
+    def __init__(self, df):
+        self.ordens = {}
+        for nome, (col, exige) in RANKINGS.items():
+            valores = df[col].to_numpy(dtype="float64")
+            elegivel = ~np.isnan(valores)
+            if exige:
+                elegivel &= df[exige].to_numpy(dtype="float64") > 0
+            pos = np.flatnonzero(elegivel)
+            self.ordens[nome] = pos[np.lexsort((pos, -valores[pos]))]
+
+    def atualizado(self, df, posicoes):
+        """Ordens de `df` quando só as linhas `posicoes` mudaram (mesmas linhas na mesma ordem).
+
+        As linhas alteradas saem das ordens e voltam por busca binária, com o mesmo desempate por
+        posição; com muitas alterações, monta tudo de novo.
+        """
+        if len(posicoes) > max(len(df) // 8, 1):
+            return IndiceRankings(df)
+        novo = IndiceRankings.__new__(IndiceRankings)
+        novo.ordens = {}
+        alterada = np.zeros(len(df), dtype=bool)
+        alterada[posicoes] = True
+        for nome, (col, exige) in RANKINGS.items():
+            valores = df[col].to_numpy(dtype="float64")
+            ordem = self.ordens[nome]
+            ficam = ordem[~alterada[ordem]]
+            entram = posicoes[~np.isnan(valores[posicoes])]
+            if exige:
+                entram = entram[df[exige].to_numpy(dtype="float64")[entram] > 0]
+            entram = entram[np.lexsort((entram, -valores[entram]))]
+            chave = -valores[ficam]
+            inicio = np.searchsorted(chave, -valores[entram], "left")
+            fim = np.searchsorted(chave, -valores[entram], "right")
+            # Entre valores empatados, vale a posição da linha
+            onde = [i + np.searchsorted(ficam[i:f], p) for i, f, p in zip(inicio, fim, entram)]
+            novo.ordens[nome] = np.insert(ficam, np.array(onde, dtype=np.int64), entram)
+        return novo
+
+    def top(self, nome, n, linhas=None):
+        """Posições do top `n` (maior primeiro); `linhas` é a máscara do filtro (None = todas)."""
+        ordem = self.ordens[nome]
+        if linhas is None:
+            return ordem[:n]
+        achadas, inicio, bloco = [], 0, max(4 * n, 256)
+        faltam = n
+        while faltam > 0 and inicio < len(ordem):
+            trecho = ordem[inicio:inicio + bloco]
+            trecho = trecho[linhas[trecho]][:faltam]
+            achadas.append(trecho)
+            faltam -= len(trecho)
+            inicio += bloco
+            bloco *= 2
+        return np.concatenate(achadas) if achadas else ordem[:0]
+
+    def rankings(self, df, n=10, linhas=None):
+        """Mesmo resultado de `indicadores.calcular_rankings` sobre o frame filtrado."""
+        return Rankings(**{
+            nome: df.iloc[self.top(nome, n, linhas)].sort_values(col, kind="stable")
+            for nome, (col, _) in RANKINGS.items()
+        })
@@ -0,0 +1,181 @@
+"""Leitores da planilha: só as abas e colunas que o processamento usa.
+
+Todos os leitores têm a mesma assinatura, `ler(conteudo, colunas_por_aba, grupos_id)`, e devolvem
+aba -> DataFrame bruto pronto para `processar_aba`:
+
+- "openpyxl": xlsx em streaming (read-only), o padrão;
+- "calamine": xlsx pelo motor em Rust (`pip install python-calamine`);
+- "csv" (experimental): um CSV por aba (export gviz do Google Sheets); `conteudo` é aba -> bytes.
+  A equivalência só foi conferida contra CSVs gerados pelo pandas, não contra um export gviz real,
+  que tipa cada coluna pelo tipo da maioria e pode esvaziar as células de outro tipo;
+- "completa": `pd.read_excel(sheet_name=None)`, a leitura original, como referência.
+"""
+import importlib.util
+import io
+import json
+import logging
+import os
+import urllib.parse
+
+import pandas as pd
+
+from openpyxl import load_workbook
+from openpyxl.cell.cell import TYPE_ERROR, TYPE_NUMERIC
+from pandas.io.parsers import TextParser
+
+log = logging.getLogger(__name__)
+
+
+def _valor(cell):
+    """Mesma conversão de célula do leitor openpyxl do pandas (vazio vira "", erro vira NaN)."""
+    if cell.value is None:
+        return ""
+    if cell.data_type == TYPE_ERROR:
+        return float("nan")
+    if cell.data_type == TYPE_NUMERIC:
+        val = int(cell.value)
+        return val if val == cell.value else float(cell.value)
+    return cell.value
+
+
+def _ler_aba(ws, colunas, grupos_id):
+    ws.reset_dimensions()
+    linhas = ws.iter_rows()
+    cabecalho = [_valor(c) for c in next(linhas, ())]
+    nomes = [str(v).lower().strip() for v in cabecalho]
+
+    # Sem as colunas de identificação pelo nome, `get_id_cols` cai na posição: lê tudo.
+    if all(any(c in nomes for c in grupo) for grupo in grupos_id):
+        vistos = set()
+        idx = [i for i, n in enumerate(nomes) if n in colunas and not (n in vistos or vistos.add(n))]
+    else:
+        idx = None
+
+    dados, index = [], []
+    for pos, linha in enumerate(linhas):
+        if idx is None:
+            vals = [_valor(c) for c in linha]
+        else:
+            vals = [_valor(linha[i]) if i < len(linha) else "" for i in idx]
+        # Linhas vazias (nas colunas lidas) são descartadas durante a leitura
+        if vals.count("") == len(vals):
+            continue
+        dados.append(vals)
+        index.append(pos)
+
+    cab = cabecalho if idx is None else [cabecalho[i] for i in idx]
+    largura = max([len(cab)] + [len(v) for v in dados])
+    linhas_tp = [r + [""] * (largura - len(r)) for r in [cab] + dados]
+    df = TextParser(linhas_tp, header=0, skip_blank_lines=False).read()
+    df.index = index
+    return df
+
+
+def ler_abas(conteudo, colunas_por_aba, grupos_id=()):
+    """Lê só as abas de `colunas_por_aba` e, em cada uma, só as colunas listadas (nomes normalizados).
+
+    `grupos_id` são as listas de candidatos de identificação (nome/equipe/horário); se algum grupo
+    não aparecer no cabeçalho, a aba é lida inteira para o fallback por posição continuar valendo.
+    Abas ausentes simplesmente não aparecem no dicionário devolvido.
+    """
+    wb = load_workbook(io.BytesIO(conteudo), read_only=True, data_only=True, keep_links=False)
+    try:
+        return {
+            aba: _ler_aba(wb[aba], set(colunas), grupos_id)
+            for aba, colunas in colunas_por_aba.items()
+            if aba in wb.sheetnames
+        }
+    finally:
+        wb.close()
+
+
+def _selecionar(df, colunas, grupos_id):
+    """Mesma seleção de `_ler_aba` aplicada a um frame já lido: colunas usadas, sem linhas vazias."""
+    nomes = [str(c).lower().strip() for c in df.columns]
+    if all(any(c in nomes for c in grupo) for grupo in grupos_id):
+        vistos = set()
+        idx = [i for i, n in enumerate(nomes) if n in colunas and not (n in vistos or vistos.add(n))]
+        df = df.iloc[:, idx]
+    return df.dropna(how="all")
+
+
+def ler_abas_calamine(conteudo, colunas_por_aba, grupos_id=()):
+    """Leitor xlsx pelo motor calamine (Rust); mesma saída de `ler_abas`."""
+    xl = pd.ExcelFile(io.BytesIO(conteudo), engine="calamine")
+    try:
+        return {
+            aba: _selecionar(xl.parse(aba), set(colunas), grupos_id)
+            for aba, colunas in colunas_por_aba.items()
+            if aba in xl.sheet_names
+        }
+    finally:
+        xl.close()
+
+
+def ler_abas_csv(conteudo, colunas_por_aba, grupos_id=()):
+    """Leitor de CSV por aba; `conteudo` é um dicionário aba -> bytes do CSV."""
+    return {
+        aba: _selecionar(pd.read_csv(io.BytesIO(conteudo[aba])), set(colunas), grupos_id)
+        for aba, colunas in colunas_por_aba.items()
+        if aba in conteudo
+    }
+
+
+def ler_abas_completa(conteudo, colunas_por_aba, grupos_id=()):
+    """Leitura original: todas as abas e colunas via `pd.read_excel`."""
+    return pd.read_excel(io.BytesIO(conteudo), sheet_name=None)
+
+
+LEITORES = {
+    "openpyxl": ler_abas,
+    "calamine": ler_abas_calamine,
+    "csv": ler_abas_csv,
+    "completa": ler_abas_completa,
+}
+
+# Módulo opcional de que cada leitor depende
+_DEPENDENCIAS = {"openpyxl": "openpyxl", "calamine": "python_calamine", "completa": "openpyxl"}
+
+# Ordem de preferência do modo "auto" quando não há medição no host
+PREFERENCIA = ["calamine", "openpyxl"]
+
+# Leitores que só valem se pedidos pelo nome: o modo "auto" nunca os escolhe
+EXPERIMENTAIS = {"csv"}
+
+# Medição gravada por benchmarks/bench_leitores.py: na raiz do repositório, qualquer que seja o diretório de trabalho
+MEDICAO = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), ".leitor.json")
+
+
+def leitor_disponivel(nome):
+    modulo = _DEPENDENCIAS.get(nome)
+    return nome in LEITORES and (modulo is None or importlib.util.find_spec(modulo) is not None)
+
+
+def leitores_disponiveis():
+    return [nome for nome in LEITORES if leitor_disponivel(nome)]
+
+
+def escolher_leitor(nome="auto", medicao=MEDICAO):
+    """Nome do leitor a usar. "auto" usa o mais rápido medido no host (arquivo `medicao`, gravado
+    por benchmarks/bench_leitores.py) ou, sem medição, o primeiro disponível de `PREFERENCIA`."""
+    if nome == "auto":
+        if medicao and os.path.exists(medicao):
+            with open(medicao, encoding="utf-8") as f:
+                nome = json.load(f).get("leitor", "auto")
+        if not leitor_disponivel(nome) or nome in EXPERIMENTAIS:
+            nome = next(n for n in PREFERENCIA if leitor_disponivel(n))
+    elif not leitor_disponivel(nome):
+        log.warning("Leitor %r indisponível; usando openpyxl", nome)
+        nome = "openpyxl"
+    elif nome in EXPERIMENTAIS:
+        log.warning("Leitor %r é experimental: a equivalência com o export real não foi conferida", nome)
+    return nome
+
+
+def urls_csv(sheet_id, abas):
+    """URL de export em CSV (gviz, experimental) de cada aba de uma planilha do Google Sheets.
+
+    `headers=1` fixa o cabeçalho na primeira linha; sem ele, o gviz adivinha quantas linhas juntar nele.
+    """
+    base = f"https://docs.google.com/spreadsheets/d/{sheet_id}/gviz/tq?tqx=out:csv&headers=1&sheet="
+    return {aba: base + urllib.parse.quote(aba) for aba in abas}
@@ -0,0 +1,61 @@
+"""Mapeamento das colunas da planilha para as colunas do painel (por aba)."""
+
+# Abas lidas da planilha, na ordem em que o painel as exibe
+ABAS = ["Suporte", "SAC"]
+
+# Identificação: (candidatos por nome, índice de fallback, valor padrão)
+ID_COLS = [
+    (["nome", "colaborador", "atendente"], 0, "N/A"),
+    (["equipe", "time", "squad"], 3, "Geral"),
+    (["horario", "turno", "escala"], 4, "-"),
+]
+
+# --- Mapeamentos de filas (por aba) ---
+FILAS_CHAT = {
+    "Suporte": [
+        ("Suporte", "qtde_chat_suporte", "tme_chat_suporte"),
+        ("Incidentes", "qtde_chat_incidentes", "tme_chat_incidentes"),
+        ("Visitas", "qtde_chat_visitas", "tme_chat_visitas"),
+        ("Migração BR", "qtde_chat_migracao_br", "tme_chat_migracao_br"),
+    ],
+    "SAC": [
+        ("Relacionamento", "qtde_chat_relacionamento", "tme_chat_relacionamento"),
+        ("Bloqueios", "qtde_chat_bloqueios", "tme_chat_bloqueios"),
+        ("Visitas", "qtde_chat_visitas", "tme_chat_visitas"),
+        ("Migração BR", "qtde_chat_migracao_br", "tme_chat_migracao_br"),
+    ],
+}
+
+COLS_PBX = [
+    ("PBX Recebidas", "qtde_pbx_r"),
+    ("PBX Efetuadas", "qtde_pbx_e"),
+]
+
+# Notas (Chat e PBX; a de PBX aparece no detalhamento)
+COLS_NOTA = [
+    ("Chat (nota)", "nota_chat"),
+    ("PBX (nota)", "nota_pbx"),
+]
+
+COLS_PERC = [
+    ("Nota (%)", "%_nota_chat"),
+    ("PBX Nota (%)", "%_nota_pbx"),
+]
+
+# Coluna que identifica a fonte de cada linha quando várias planilhas são juntadas (ver painel.registro)
+COLUNA_FONTE = "Fonte"
+
+
+def filas_da_aba(nome_aba, filas=None):
+    """Filas de chat da aba: `filas` (lista de (label, col_qtd, col_tme)) ou as de FILAS_CHAT."""
+    return FILAS_CHAT.get(nome_aba, []) if filas is None else filas
+
+
+def colunas_usadas(nome_aba, filas=None):
+    """Colunas (já normalizadas) que `processar_aba` lê de uma aba."""
+    cols = [c for cands, _, _ in ID_COLS for c in cands]
+    cols += ["qtde_chat_total", "total_pbx", "tme_chat", "tme_pbx"]
+    cols += [col for _, col in COLS_NOTA + COLS_PERC + COLS_PBX]
+    for _, col_qtd, col_tme in filas_da_aba(nome_aba, filas):
+        cols += [col_qtd, col_tme]
+    return cols
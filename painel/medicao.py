@@ -0,0 +1,111 @@
+"""Cronômetros por etapa do pipeline, com log estruturado e histórico recente em memória."""
+import collections
+import contextlib
+import json
+import logging
+import threading
+import time
+
+log = logging.getLogger(__name__)
+
+# Quantas medições recentes ficam guardadas por etapa
+ULTIMAS = 200
+
+
+class Medicao:
+    """Uma execução de etapa; quem mede pode preencher `linhas` e `detalhes` durante o bloco."""
+
+    __slots__ = ("etapa", "sessao", "inicio", "segundos", "linhas", "detalhes")
+
+    def __init__(self, etapa, sessao=None, linhas=None, detalhes=None):
+        self.etapa = etapa
+        self.sessao = sessao
+        self.inicio = time.time()
+        self.segundos = None
+        self.linhas = linhas
+        self.detalhes = detalhes or {}
+
+    def como_dict(self):
+        return {
+            "etapa": self.etapa,
+            "sessao": self.sessao,
+            "inicio": self.inicio,
+            "ms": round(self.segundos * 1000, 3),
+            "linhas": self.linhas,
+            **self.detalhes,
+        }
+
+
+class Registro:
+    """Últimas medições por etapa e contadores de cache (acerto/falta) do processo."""
+
+    def __init__(self, ultimas=ULTIMAS):
+        self._ultimas = ultimas
+        self._medicoes = collections.defaultdict(lambda: collections.deque(maxlen=self._ultimas))
+        self._contadores = collections.Counter()
+        self._lock = threading.Lock()
+
+    def registrar(self, medicao):
+        with self._lock:
+            self._medicoes[medicao.etapa].append(medicao)
+        if log.isEnabledFor(logging.INFO):
+            log.info(json.dumps(medicao.como_dict(), ensure_ascii=False, default=str))
+
+    def contar(self, nome, resultado):
+        """Soma 1 em `nome`/`resultado` (ex.: "load_data", "acerto")."""
+        with self._lock:
+            self._contadores[(nome, resultado)] += 1
+
+    def contadores(self):
+        """{nome: {resultado: quantidade}}."""
+        with self._lock:
+            itens = list(self._contadores.items())
+        saida = collections.defaultdict(dict)
+        for (nome, resultado), qtd in sorted(itens):
+            saida[nome][resultado] = qtd
+        return dict(saida)
+
+    def ultimas(self, n=None, sessao=None):
+        """Medições mais recentes (todas as etapas), da mais nova para a mais antiga."""
+        with self._lock:
+            todas = [m for fila in self._medicoes.values() for m in fila]
+        if sessao is not None:
+            todas = [m for m in todas if m.sessao == sessao]
+        todas.sort(key=lambda m: m.inicio, reverse=True)
+        return todas[:n] if n else todas
+
+    def resumo(self, n=None):
+        """Por etapa, sobre as `n` últimas medições: (etapa, execuções, última, média, máx) em ms."""
+        with self._lock:
+            filas = {etapa: list(fila)[-n:] if n else list(fila) for etapa, fila in self._medicoes.items()}
+        linhas = []
+        for etapa, fila in sorted(filas.items()):
+            if not fila:
+                continue
+            ms = [m.segundos * 1000 for m in fila]
+            linhas.append((etapa, len(ms), ms[-1], sum(ms) / len(ms), max(ms)))
+        return linhas
+
+    def limpar(self):
+        with self._lock:
+            self._medicoes.clear()
+            self._contadores.clear()
+
+
+# Registro do processo (as etapas rodam tanto nas sessões quanto na thread de atualização)
+REGISTRO = Registro()
+
+
+@contextlib.contextmanager
+def medir(etapa, sessao=None, linhas=None, registro=None, **detalhes):
+    """Cronometra o bloco e registra a medição (mesmo se o bloco levantar exceção)."""
+    m = Medicao(etapa, sessao, linhas, detalhes)
+    t0 = time.perf_counter()
+    try:
+        yield m
+    except BaseException:
+        m.detalhes["erro"] = True
+        raise
+    finally:
+        m.segundos = time.perf_counter() - t0
+        (registro or REGISTRO).registrar(m)
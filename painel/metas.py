@@ -0,0 +1,59 @@
+"""Regras de metas individuais, avaliadas por coluna inteira (sem laço por linha)."""
+import numpy as np
+import pandas as pd
+
+# Metas padrão (as mesmas que o painel sugere na barra lateral)
+META_NOTA = {"Suporte": 4.45, "SAC": 4.55}
+META_PERC = 0.50
+META_TME_CHAT = "00:01:00"
+META_TME_PBX = "00:00:10"
+
+VERDE = "background-color: #d4edda; color: green"
+VERMELHO = "background-color: #f8d7da; color: red"
+
+# Coluna exibida -> coluna com o valor em segundos usado na regra de TME
+COLS_TME = {
+    "Chat (TME)": "Chat (TME) [s]",
+    "PBX (TME)": "PBX (TME) [s]",
+}
+
+
+def _tme_ok(seg, meta_seg):
+    """TME dentro da meta; 0 significa "sem dado" e fica sem avaliação (NA)."""
+    ok = pd.Series((seg > 0) & (seg <= meta_seg), index=seg.index, dtype="boolean")
+    return ok.mask(seg == 0)
+
+
+def avaliar_metas(df, media_vol_chat, media_vol_pbx, meta_nota, meta_perc, meta_tme_chat_seg, meta_tme_pbx_seg):
+    """Atingimento por coluna exibida: True (bateu), False (não bateu) ou NA (sem avaliação)."""
+    regras = {
+        "Chat": lambda: df["Chat"] >= media_vol_chat,
+        "Chat (nota)": lambda: df["Chat (nota)"] >= meta_nota,
+        "Nota (%)": lambda: df["Nota (%)"] >= meta_perc,
+        "Chat (TME)": lambda: _tme_ok(df["Chat (TME) [s]"], meta_tme_chat_seg),
+        "Total (PBX)": lambda: df["Total (PBX)"] >= media_vol_pbx,
+        "PBX (TME)": lambda: _tme_ok(df["PBX (TME) [s]"], meta_tme_pbx_seg),
+    }
+    status = pd.DataFrame(index=df.index)
+    for col, regra in regras.items():
+        if col in df.columns and COLS_TME.get(col, col) in df.columns:
+            status[col] = regra().astype("boolean")
+    return status
+
+
+def estilos_metas(df, status):
+    """CSS por célula (mesmo shape de `df`) para `Styler.apply(..., axis=None)`."""
+    estilos = pd.DataFrame("", index=df.index, columns=df.columns)
+    for col in status.columns:
+        ok = status[col]
+        estilos[col] = np.where(ok.isna(), "", np.where(ok.fillna(False), VERDE, VERMELHO))
+    return estilos
+
+
+def status_em_texto(status, ok="🟢", falha="🔴"):
+    """Status como texto, para exibir sem Styler (tabelas grandes)."""
+    texto = pd.DataFrame(index=status.index)
+    for col in status.columns:
+        s = status[col]
+        texto[col] = np.where(s.isna(), "", np.where(s.fillna(False), ok, falha))
+    return texto
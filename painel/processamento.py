@@ -0,0 +1,133 @@
+"""Transformação das abas brutas da planilha nos frames do painel."""
+import pandas as pd
+
+from painel.conversao import nota_em_escala_5, porcentagem_em_fracao, tempo_em_segundos, to_num
+from painel.leitura import LEITORES
+from painel.mapeamento import ABAS, COLS_NOTA, COLS_PBX, COLS_PERC, ID_COLS, colunas_usadas, filas_da_aba
+from painel.medicao import medir
+
+
+def col_exists(df, name):
+    return name in df.columns
+
+
+def get_id_cols(df):
+    cols = list(df.columns)
+
+    def pick_by_candidates(cands, fallback_idx, default_val):
+        for c in cands:
+            if c in cols:
+                return df[c]
+        if len(cols) > fallback_idx:
+            return df.iloc[:, fallback_idx]
+        return pd.Series([default_val] * len(df))
+
+    nome, equipe, horario = (pick_by_candidates(*c) for c in ID_COLS)
+    return nome, equipe, horario
+
+
+# Tipos compactos dos frames processados. Notas e % ficam em float64: em float32, 4.45 vira
+# 4.4499998 e a comparação com a meta muda de lado. Nome é quase único por linha; como categoria
+# só ganharia um array de códigos.
+CATEGORIAS = ["Equipe", "Horario"]
+TIPO_VOLUME = "float32"  # contagens: inteiros exatos até 2**24, sem truncar valores fracionados
+TIPO_SEGUNDOS = "int32"
+
+
+def colunas_volume(nome_aba, filas=None):
+    cols = ["Chat", "Total (PBX)"] + [label for label, _ in COLS_PBX]
+    return cols + [f"Chat - {label}" for label, _, _ in filas_da_aba(nome_aba, filas)]
+
+
+def compactar(data, nome_aba, filas=None):
+    """Identidade em categorias, volumes em float32 e segundos em int32 (no lugar)."""
+    for col in CATEGORIAS:
+        data[col] = data[col].astype("category")
+    for col in colunas_volume(nome_aba, filas):
+        data[col] = data[col].astype(TIPO_VOLUME)
+    for col in data.columns:
+        if col.endswith("[s]"):
+            data[col] = data[col].astype(TIPO_SEGUNDOS)
+    return data
+
+
+def normalizar_bruto(df):
+    """Aba bruta sem linhas/colunas vazias e com os nomes de coluna normalizados."""
+    df = df.dropna(how="all", axis=1).dropna(how="all", axis=0)
+    df.columns = [str(c).lower().strip() for c in df.columns]
+    return df
+
+
+def processar_aba(df, nome_aba, filas=None):
+    return processar_linhas(normalizar_bruto(df), nome_aba, filas)
+
+
+def processar_linhas(df, nome_aba, filas=None):
+    """Conversão de uma aba já normalizada; cada linha sai só dos próprios valores (vale para um subconjunto).
+
+    `filas` troca as filas de chat de FILAS_CHAT (abas de outras operações, ver painel.registro).
+    """
+    data = pd.DataFrame()
+
+    # Identificação
+    nome, equipe, horario = get_id_cols(df)
+    data["Nome"] = nome.astype(str)
+    data["Equipe"] = equipe.astype(str)
+    data["Horario"] = horario.astype(str)
+
+    # Totais (base das metas)
+    data["Chat"] = to_num(df["qtde_chat_total"]) if col_exists(df, "qtde_chat_total") else 0
+    data["Total (PBX)"] = to_num(df["total_pbx"]) if col_exists(df, "total_pbx") else 0
+
+    # Notas (0-10 -> 0-5) e % avaliadas: normalização em lote, uma vez por coluna
+    for label, col in COLS_NOTA:
+        data[label] = nota_em_escala_5(to_num(df[col])) if col_exists(df, col) else 0
+    for label, col in COLS_PERC:
+        data[label] = porcentagem_em_fracao(df[col]) if col_exists(df, col) else 0.0
+
+    # TMEs totais (base das metas)
+    data["Chat (TME) [s]"] = tempo_em_segundos(df["tme_chat"]) if col_exists(df, "tme_chat") else 0
+    data["PBX (TME) [s]"] = tempo_em_segundos(df["tme_pbx"]) if col_exists(df, "tme_pbx") else 0
+
+    # Detalhamento por fila (somente exibição)
+    for label, col_qtd, col_tme in filas_da_aba(nome_aba, filas):
+        data[f"Chat - {label}"] = to_num(df[col_qtd]) if col_exists(df, col_qtd) else 0
+        data[f"TME - {label} [s]"] = tempo_em_segundos(df[col_tme]) if col_exists(df, col_tme) else 0
+
+    for label, col_qtd in COLS_PBX:
+        data[label] = to_num(df[col_qtd]) if col_exists(df, col_qtd) else 0
+
+    return compactar(data, nome_aba, filas)
+
+
+def conferir_abas(xls, abas=tuple(ABAS)):
+    if any(aba not in xls for aba in abas):
+        nomes = " e/ou ".join(f"'{aba}'" for aba in abas)
+        raise Exception(f"As abas {nomes} não foram encontradas na planilha.")
+
+
+def processar_planilha(xls, abas=tuple(ABAS)):
+    """Frames processados (na ordem de `abas`) a partir do dicionário aba -> DataFrame bruto."""
+    conferir_abas(xls, abas)
+
+    frames = []
+    for aba in abas:
+        with medir("processar_aba", aba=aba) as m:
+            frames.append(processar_aba(xls[aba], aba))
+            m.linhas = len(frames[-1])
+    return tuple(frames)
+
+
+def ler_brutas(conteudo, leitor="openpyxl", abas=tuple(ABAS), filas=None):
+    """aba -> DataFrame bruto, com o leitor de `painel.leitura` indicado (`filas`: aba -> filas de chat)."""
+    filas = filas or {}
+    colunas = {aba: colunas_usadas(aba, filas.get(aba)) for aba in abas}
+    with medir("leitura", leitor=leitor) as m:
+        xls = LEITORES[leitor](conteudo, colunas, [cands for cands, _, _ in ID_COLS])
+        m.linhas = sum(len(df) for df in xls.values())
+    return xls
+
+
+def ler_planilha(conteudo, leitor="openpyxl", abas=tuple(ABAS)):
+    """Frames processados direto do conteúdo baixado, com o leitor de `painel.leitura` indicado."""
+    return processar_planilha(ler_brutas(conteudo, leitor, abas), abas)
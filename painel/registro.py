@@ -0,0 +1,198 @@
+"""Registro de fontes: várias planilhas (operações, meses), baixadas em paralelo e juntadas por aba.
+
+O registro é um JSON:
+
+    {"fontes": [
+        {"nome": "Atendimento 2026-10", "planilha": "<ID da planilha | URL | caminho.xlsx>",
+         "abas": ["Suporte", "SAC"]},
+        {"nome": "Cobrança 2026-10", "planilha": "cobranca-2026-10.xlsx", "abas": ["Cobrança"],
+         "filas": {"Cobrança": [["Negociação", "qtde_chat_negociacao", "tme_chat_negociacao"]]}}
+    ]}
+
+`filas` segue o formato de FILAS_CHAT (label, coluna da quantidade, coluna do TME) e vale só para
+as abas daquela fonte; abas sem entrada usam FILAS_CHAT. No painel, cada aba junta as linhas de
+todas as fontes que a têm, marcadas pela coluna `COLUNA_FONTE`.
+"""
+import collections
+import hashlib
+import json
+import logging
+import multiprocessing
+import os
+import re
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import pandas as pd
+
+from painel.fonte import PlanilhaRemota
+from painel.mapeamento import COLUNA_FONTE
+from painel.medicao import REGISTRO, medir
+from painel.processamento import CATEGORIAS, conferir_abas, ler_brutas, processar_aba
+from painel.snapshot import SnapshotsLocais
+
+log = logging.getLogger(__name__)
+
+FonteRegistrada = collections.namedtuple("FonteRegistrada", ["nome", "url", "abas", "filas"])
+
+
+def url_planilha(planilha):
+    """Caminho local ou URL passam direto; um ID do Google Sheets vira a URL de exportação em xlsx."""
+    if os.path.exists(planilha) or "://" in planilha:
+        return planilha
+    return f"https://docs.google.com/spreadsheets/d/{planilha}/export?format=xlsx"
+
+
+def ler_registro(caminho):
+    """Fontes do registro JSON, na ordem do arquivo."""
+    with open(caminho, encoding="utf-8") as f:
+        dados = json.load(f)
+    fontes = []
+    for item in dados["fontes"]:
+        filas = {aba: [tuple(fila) for fila in lista] for aba, lista in item.get("filas", {}).items()}
+        fontes.append(FonteRegistrada(item["nome"], url_planilha(item["planilha"]), tuple(item["abas"]), filas))
+    if len({f.nome for f in fontes}) != len(fontes):
+        raise ValueError(f"Nomes de fonte repetidos em {caminho}")
+    return fontes
+
+
+def abas_registro(fontes):
+    """Abas exibidas: todas as das fontes, na ordem em que aparecem pela primeira vez."""
+    return list(dict.fromkeys(aba for fonte in fontes for aba in fonte.abas))
+
+
+def pasta_fonte(nome):
+    """Nome de pasta (snapshots) para uma fonte: o nome, sem o que não cabe num caminho."""
+    return re.sub(r"[^\w.-]+", "_", nome).strip("._") or "_"
+
+
+def ler_fonte(conteudo, leitor, abas, filas):
+    """aba -> frame bruto das `abas` de uma planilha baixada, lida uma vez só (roda num processo do pool)."""
+    xls = ler_brutas(conteudo, leitor, abas, filas)
+    conferir_abas(xls, abas)
+    return {aba: xls[aba] for aba in abas}
+
+
+def processar_fonte(conteudo, leitor, abas, filas):
+    """Frames das `abas` de uma planilha baixada, lida uma vez e processada aba por aba."""
+    brutas = ler_fonte(conteudo, leitor, abas, filas)
+    return tuple(processar_aba(brutas[aba], aba, filas.get(aba)) for aba in abas)
+
+
+def juntar(partes):
+    """Um frame a partir de (nome da fonte, frame) da mesma aba, com a coluna `COLUNA_FONTE`.
+
+    Colunas que faltam numa fonte (filas diferentes) valem 0, no tipo que têm nas outras.
+    """
+    tipos = {}
+    for _, df in partes:
+        for col, tipo in df.dtypes.items():
+            tipos.setdefault(col, tipo)
+    faltantes = [col for col in tipos if any(col not in df.columns for _, df in partes)]
+    juntos = pd.concat(
+        [df.assign(**{COLUNA_FONTE: nome}) for nome, df in partes], ignore_index=True
+    )
+    for col in faltantes:
+        juntos[col] = juntos[col].fillna(0).astype(tipos[col])
+    for col in [*CATEGORIAS, COLUNA_FONTE]:
+        juntos[col] = juntos[col].astype(str).astype("category")
+    identidade = ["Nome", *CATEGORIAS, COLUNA_FONTE]
+    return juntos[identidade + [c for c in juntos.columns if c not in identidade]]
+
+
+class FontesMultiplas:
+    """Fonte com a interface de `PlanilhaRemota` (`carregar`, `versao`, `criado_em`, `restaurado`).
+
+    Cada fonte do registro tem a própria `PlanilhaRemota` (download condicional, hash e snapshots
+    em `snapshots_dir/<nome da fonte>`). Em `carregar`, as fontes são conferidas ao mesmo tempo num
+    pool de threads, e as planilhas que mudaram são processadas num pool de processos: uma tarefa lê
+    a planilha (uma vez só) e, com as abas brutas, uma tarefa por aba as processa em paralelo. O
+    resultado tem um frame por aba de `abas_registro`, juntando as fontes.
+
+    Com `paralelo=False`, faz o mesmo em sequência, no próprio processo (a referência dos benchmarks).
+    Com um processo só (`processos=1` ou uma CPU), as fontes são processadas nas próprias threads.
+    `processar` não é usado: cada aba é processada com as filas da sua fonte.
+    """
+
+    def __init__(self, fontes, leitor="openpyxl", snapshots_dir=None, snapshots_manter=5, processos=None, paralelo=True):
+        self.fontes = list(fontes)
+        self.abas = abas_registro(self.fontes)
+        if leitor == "csv":
+            # O registro aponta para xlsx: não há um CSV por aba para o leitor "csv"
+            log.warning("Leitor 'csv' não se aplica ao registro de fontes; usando openpyxl")
+            leitor = "openpyxl"
+        self.leitor = leitor
+        self.processos = processos or os.cpu_count()
+        self.paralelo = paralelo
+        pastas = [pasta_fonte(fonte.nome) for fonte in self.fontes]
+        if snapshots_dir is not None and len(set(pastas)) != len(pastas):
+            raise ValueError(f"Nomes de fonte que dão a mesma pasta de snapshots: {pastas}")
+        self.planilhas = [
+            PlanilhaRemota(
+                fonte.url,
+                snapshots=None if snapshots_dir is None else SnapshotsLocais(
+                    os.path.join(snapshots_dir, pasta), abas=fonte.abas, manter=snapshots_manter
+                ),
+            )
+            for fonte, pasta in zip(self.fontes, pastas)
+        ]
+        self.versao = None
+        self.resultado = None
+        self.criado_em = None
+        self.restaurado = False
+        self._pool = None
+        self._lock = threading.Lock()
+
+    def _executor(self):
+        if self._pool is None:
+            # "spawn": o servidor tem threads, e um fork herdaria locks presos
+            self._pool = ProcessPoolExecutor(self.processos, mp_context=multiprocessing.get_context("spawn"))
+        return self._pool
+
+    def fechar(self):
+        if self._pool is not None:
+            self._pool.shutdown(cancel_futures=True)
+            self._pool = None
+
+    def _processar(self, fonte, conteudo):
+        """Frames das abas de `fonte`; no modo paralelo, lida numa tarefa e processada numa por aba."""
+        with medir("processar_fonte", fonte=fonte.nome, abas=len(fonte.abas)) as m:
+            if self.paralelo and self.processos > 1:
+                pool = self._executor()
+                brutas = pool.submit(ler_fonte, conteudo, self.leitor, fonte.abas, fonte.filas).result()
+                tarefas = [pool.submit(processar_aba, brutas[aba], aba, fonte.filas.get(aba)) for aba in fonte.abas]
+                frames = tuple(t.result() for t in tarefas)
+            else:
+                frames = processar_fonte(conteudo, self.leitor, fonte.abas, fonte.filas)
+            m.linhas = sum(len(df) for df in frames)
+        return frames
+
+    def _carregar_fonte(self, i):
+        fonte, planilha = self.fontes[i], self.planilhas[i]
+        return planilha.carregar(lambda conteudo: self._processar(fonte, conteudo), revalidar=False)
+
+    def carregar(self, processar=None, revalidar=False):
+        """Frames juntados por aba; os mesmos objetos enquanto nenhuma fonte mudar."""
+        with self._lock, medir("fontes", linhas=len(self.fontes)):
+            if self.paralelo:
+                with ThreadPoolExecutor(len(self.fontes), thread_name_prefix="painel-fonte") as threads:
+                    resultados = list(threads.map(self._carregar_fonte, range(len(self.fontes))))
+            else:
+                resultados = [self._carregar_fonte(i) for i in range(len(self.fontes))]
+            self.restaurado = any(p.restaurado for p in self.planilhas)
+
+            versao = hashlib.sha256("\0".join(p.versao for p in self.planilhas).encode()).hexdigest()
+            if versao == self.versao:
+                return self.resultado
+            REGISTRO.contar("fontes", "nova")
+            with medir("juntar_fontes") as m:
+                por_aba = {aba: [] for aba in self.abas}
+                for fonte, frames in zip(self.fontes, resultados):
+                    for aba, df in zip(fonte.abas, frames):
+                        por_aba[aba].append((fonte.nome, df))
+                self.resultado = tuple(juntar(por_aba[aba]) for aba in self.abas)
+                m.linhas = sum(len(df) for df in self.resultado)
+            self.versao = versao
+            self.criado_em = time.time()
+        return self.resultado
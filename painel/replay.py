@@ -0,0 +1,90 @@
+"""Replay local de eventos: reenvia um arquivo JSON por linha para o painel em modo de eventos.
+
+Os eventos vão para o arquivo seguido pelo painel (PAINEL_EVENTOS) ou para o socket dele
+(PAINEL_EVENTOS_ENDERECO), respeitando os intervalos entre os `ts` (divididos por --velocidade).
+Um arquivo de teste sai de `python benchmarks/gerador.py <agentes> eventos.jsonl`.
+
+Uso: python -m painel.replay <eventos.jsonl> (--arquivo destino.jsonl | --socket host:porta) [--velocidade 60]
+"""
+import argparse
+import json
+import socket
+import sys
+import time
+
+from painel.eventos import endereco_socket
+
+# Mais que isso entre dois eventos (já dividido pela velocidade) é encurtado: pausas longas do log não travam o teste
+ESPERA_MAXIMA = 5.0
+
+
+def _instantes(linhas):
+    """`ts` de cada linha (None quando falta ou a linha não é JSON)."""
+    for linha in linhas:
+        try:
+            ts = json.loads(linha).get("ts")
+        except (ValueError, AttributeError):
+            ts = None
+        yield linha, ts if isinstance(ts, (int, float)) else None
+
+
+def reproduzir(linhas, enviar, velocidade=1.0, lote=100):
+    """Chama `enviar(bloco)` com blocos de linhas, esperando entre eles o intervalo dos `ts`; devolve quantas enviou."""
+    bloco, enviadas, anterior = [], 0, None
+    for linha, ts in _instantes(linhas):
+        if velocidade > 0 and ts is not None and anterior is not None and ts > anterior:
+            if bloco:
+                enviar(bloco)
+                enviadas, bloco = enviadas + len(bloco), []
+            time.sleep(min((ts - anterior) / velocidade, ESPERA_MAXIMA))
+        anterior = ts if ts is not None else anterior
+        bloco.append(linha)
+        if len(bloco) >= lote:
+            enviar(bloco)
+            enviadas, bloco = enviadas + len(bloco), []
+    if bloco:
+        enviar(bloco)
+        enviadas += len(bloco)
+    return enviadas
+
+
+def _juntar(bloco):
+    return b"".join(linha if linha.endswith(b"\n") else linha + b"\n" for linha in bloco)
+
+
+def _para_arquivo(caminho):
+    def enviar(bloco):
+        with open(caminho, "ab") as f:
+            f.write(_juntar(bloco))
+
+    return enviar
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(prog="python -m painel.replay", description=__doc__.split("\n")[0])
+    ap.add_argument("entrada", help="arquivo de eventos (JSON por linha)")
+    destino = ap.add_mutually_exclusive_group(required=True)
+    destino.add_argument("--arquivo", help="arquivo de eventos seguido pelo painel (as linhas são anexadas)")
+    destino.add_argument("--socket", help="host:porta do painel")
+    ap.add_argument("--velocidade", type=float, default=1.0, help="multiplica o ritmo dos `ts` (0 = sem esperar)")
+    ap.add_argument("--lote", type=int, default=100, help="linhas por escrita/envio")
+    args = ap.parse_args(argv)
+
+    try:
+        with open(args.entrada, "rb") as f:
+            linhas = [linha for linha in f if linha.strip()]
+        inicio = time.perf_counter()
+        if args.arquivo:
+            enviadas = reproduzir(linhas, _para_arquivo(args.arquivo), args.velocidade, args.lote)
+        else:
+            with socket.create_connection(endereco_socket(args.socket)) as conexao:
+                enviadas = reproduzir(linhas, lambda bloco: conexao.sendall(_juntar(bloco)), args.velocidade, args.lote)
+    except (OSError, ValueError) as e:
+        print(f"Erro no replay de {args.entrada}: {e}", file=sys.stderr)
+        return 1
+    print(f"{enviadas} eventos enviados em {time.perf_counter() - inicio:.1f} s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
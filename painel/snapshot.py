@@ -0,0 +1,63 @@
+"""Snapshots em Parquet dos frames processados, para reinícios "quentes"."""
+import json
+import os
+import shutil
+import time
+
+import pandas as pd
+
+
+class SnapshotsLocais:
+    """Guarda cada versão processada em `pasta/<data>_<hash>/<aba>.parquet`.
+
+    A gravação é feita numa pasta temporária e renomeada no fim, então um leitor nunca
+    vê um snapshot pela metade. Só os `manter` snapshots mais recentes são mantidos.
+    """
+
+    def __init__(self, pasta, abas, manter=5):
+        self.pasta = pasta
+        self.abas = tuple(abas)
+        self.manter = manter
+
+    def _listar(self):
+        if not os.path.isdir(self.pasta):
+            return []
+        nomes = [n for n in os.listdir(self.pasta) if not n.startswith(".")]
+        return sorted(n for n in nomes if os.path.exists(os.path.join(self.pasta, n, "meta.json")))
+
+    def salvar(self, versao, frames):
+        """Grava os frames (na ordem de `abas`) como um novo snapshot e aplica a retenção."""
+        nome = f"{time.strftime('%Y%m%dT%H%M%S')}_{versao[:12]}"
+        destino = os.path.join(self.pasta, nome)
+        if os.path.exists(destino):
+            return destino
+        tmp = os.path.join(self.pasta, f".tmp_{nome}_{os.getpid()}")
+        os.makedirs(tmp, exist_ok=True)
+        try:
+            for aba, df in zip(self.abas, frames):
+                df.to_parquet(os.path.join(tmp, f"{aba}.parquet"))
+            with open(os.path.join(tmp, "meta.json"), "w", encoding="utf-8") as f:
+                json.dump({"versao": versao, "criado_em": time.time(), "abas": list(self.abas)}, f)
+            os.replace(tmp, destino)
+        finally:
+            shutil.rmtree(tmp, ignore_errors=True)
+        self.limpar()
+        return destino
+
+    def limpar(self):
+        """Remove snapshots além dos `manter` mais recentes."""
+        for nome in self._listar()[: -max(self.manter, 1)]:
+            shutil.rmtree(os.path.join(self.pasta, nome), ignore_errors=True)
+
+    def ultimo(self):
+        """(versao, frames, criado_em) do snapshot mais recente, ou None se não houver."""
+        for nome in reversed(self._listar()):
+            caminho = os.path.join(self.pasta, nome)
+            try:
+                with open(os.path.join(caminho, "meta.json"), encoding="utf-8") as f:
+                    meta = json.load(f)
+                frames = tuple(pd.read_parquet(os.path.join(caminho, f"{aba}.parquet")) for aba in self.abas)
+            except (OSError, ValueError):
+                continue  # snapshot corrompido/incompleto: tenta o anterior
+            return meta["versao"], frames, meta["criado_em"]
+        return None
@@ -0,0 +1,167 @@
+"""Cache LRU das visões derivadas (filtro, indicadores, metas, gráficos, detalhamento), compartilhado entre sessões."""
+import collections
+import threading
+
+from painel.graficos import GRAFICOS_RANKING, altura_ranking, figura_ranking, figura_tendencia
+from painel.indicadores import RANKINGS, montar_detalhe, montar_resumo, ordem_detalhe
+from painel.indices import IndiceGrupos, IndiceRankings
+from painel.medicao import REGISTRO, medir
+from painel.metas import avaliar_metas
+
+# O que o render_tab precisa de uma seleção de equipes/horários (independe das metas)
+Visao = collections.namedtuple("Visao", ["dff", "kpis", "resumo", "colunas_visiveis"])
+
+
+def chave_filtro(equipes, horarios):
+    """A ordem da seleção no multiselect não muda o resultado do filtro."""
+    return tuple(sorted(map(str, equipes))), tuple(sorted(map(str, horarios)))
+
+
+class CacheVisoes:
+    """Visões calculadas por (versão dos dados, aba, filtro[, metas]), com descarte LRU.
+
+    Os valores são compartilhados entre sessões e não podem ser alterados por quem os lê.
+    Uma visão só é recalculada quando a combinação ainda não está no cache; trocar só as
+    metas reaproveita o filtro, os KPIs e os rankings.
+    """
+
+    def __init__(self, maximo=256):
+        self.maximo = maximo
+        self._itens = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._itens)
+
+    def obter(self, chave, calcular):
+        with self._lock:
+            if chave in self._itens:
+                self._itens.move_to_end(chave)
+                REGISTRO.contar("visoes", "acerto")
+                return self._itens[chave]
+        # Calcula fora do lock: duas sessões na mesma chave podem calcular em dobro, sem bloquear as outras
+        valor = calcular()
+        REGISTRO.contar("visoes", "falta")
+        self._guardar(chave, valor)
+        return valor
+
+    def _guardar(self, chave, valor):
+        with self._lock:
+            self._itens[chave] = valor
+            self._itens.move_to_end(chave)
+            while len(self._itens) > self.maximo:
+                self._itens.popitem(last=False)
+
+    def descartar_outras_versoes(self, versao):
+        """Remove as visões de versões antigas dos dados (chamado quando uma versão nova é publicada)."""
+        with self._lock:
+            for chave in [c for c in self._itens if c[0] != versao]:
+                del self._itens[chave]
+
+    def indice(self, versao, aba, df):
+        """Índice Equipe×Horário da versão (montado uma vez, compartilhado por todos os filtros)."""
+        def calcular():
+            with medir("indice_grupos", linhas=len(df), aba=aba):
+                return IndiceGrupos(df)
+
+        return self.obter((versao, aba, "indice"), calcular)
+
+    def avancar(self, anterior, versao, aba, df, posicoes):
+        """Deriva os índices de `versao` dos de `anterior` quando só as linhas `posicoes` de `df` mudaram.
+
+        Índices que não estão no cache, ou que não dá para atualizar, ficam para a montagem normal.
+        """
+        for tipo, etapa in (("indice", "indice_grupos"), ("indice_rankings", "indice_rankings")):
+            with self._lock:
+                antigo = self._itens.get((anterior, aba, tipo))
+            if antigo is None or (versao, aba, tipo) in self._itens:
+                continue
+            with medir(f"{etapa}_incremental", linhas=len(posicoes), aba=aba):
+                novo = antigo.atualizado(df, posicoes)
+            if novo is not None:
+                REGISTRO.contar("visoes", "incremental")
+                self._guardar((versao, aba, tipo), novo)
+
+    def visao(self, versao, aba, df, equipes, horarios):
+        def calcular():
+            indice = self.indice(versao, aba, df)
+            with medir("filtro", aba=aba) as m:
+                dff = indice.filtrar(df, equipes, horarios)
+                m.linhas = len(dff)
+            with medir("kpis", linhas=len(dff), aba=aba):
+                kpis = indice.kpis(equipes, horarios)
+            resumo, colunas_visiveis = montar_resumo(dff)
+            return Visao(dff, kpis, resumo, colunas_visiveis)
+
+        return self.obter((versao, aba, "visao", chave_filtro(equipes, horarios)), calcular)
+
+    def indice_rankings(self, versao, aba, df):
+        def calcular():
+            with medir("indice_rankings", linhas=len(df), aba=aba):
+                return IndiceRankings(df)
+
+        return self.obter((versao, aba, "indice_rankings"), calcular)
+
+    def rankings(self, versao, aba, df, equipes, horarios, n=10):
+        """Top `n` de cada ranking para a seleção, a partir das ordens prontas da versão."""
+        def calcular():
+            grupos = self.indice(versao, aba, df)
+            sel = grupos.selecionar(equipes, horarios)
+            linhas = None if sel.all() else grupos.mascara_linhas(sel)
+            indice = self.indice_rankings(versao, aba, df)
+            with medir("rankings", aba=aba):
+                return indice.rankings(df, n, linhas)
+
+        return self.obter((versao, aba, "rankings", chave_filtro(equipes, horarios), n), calcular)
+
+    def grafico(self, versao, aba, df, equipes, horarios, nome, n=10):
+        """Figura do ranking `nome` (Top `n`) da seleção, pronta para o st.plotly_chart."""
+        def calcular():
+            ranking = getattr(self.rankings(versao, aba, df, equipes, horarios, n), nome)
+            if ranking.empty:
+                return None
+            _, cor, formato = GRAFICOS_RANKING[nome]
+            return figura_ranking(ranking, RANKINGS[nome][0], cor, formato, altura_ranking(n))
+
+        return self.obter((versao, aba, "grafico", chave_filtro(equipes, horarios), nome, n), calcular)
+
+    def tendencia(self, versao, aba, historico, visao, selecao, metrica, inicio, fim):
+        """Figura da tendência por "Equipe" ou "Agente" (None sem histórico para a seleção)."""
+        def calcular():
+            if visao == "Agente":
+                tendencia, cor = historico.tendencia_agentes(aba, selecao, metrica, inicio, fim), "Nome"
+            else:
+                tendencia, cor = historico.tendencia_equipes(aba, selecao, metrica, inicio, fim), "Equipe"
+            return None if tendencia.empty else figura_tendencia(tendencia, "dia", metrica, cor)
+
+        # Os arquivos do período entram na chave: uma carga nova no histórico gera outra figura
+        chave = (tuple(sorted(map(str, selecao))), metrica, inicio, fim, historico.assinatura(aba, inicio, fim))
+        return self.obter((versao, aba, "tendencia", visao) + chave, calcular)
+
+    def status_metas(self, versao, aba, df, equipes, horarios, metas):
+        """Atingimento (`avaliar_metas`) da visão; `metas` = (nota, %, TME chat, TME PBX)."""
+        visao = self.visao(versao, aba, df, equipes, horarios)
+
+        def calcular():
+            with medir("avaliar_metas", linhas=len(visao.resumo), aba=aba):
+                return avaliar_metas(visao.resumo, visao.kpis.media_vol_chat, visao.kpis.media_vol_pbx, *metas)
+
+        return self.obter((versao, aba, "metas", chave_filtro(equipes, horarios), tuple(metas)), calcular)
+
+    def detalhe(self, versao, aba, df, equipes, horarios):
+        """(tabela de detalhamento por fila, formatos) da visão; os TMEs ficam em segundos."""
+        visao = self.visao(versao, aba, df, equipes, horarios)
+
+        def calcular():
+            with medir("detalhe", linhas=len(visao.dff), aba=aba):
+                return montar_detalhe(visao.dff, aba)
+
+        return self.obter((versao, aba, "detalhe", chave_filtro(equipes, horarios)), calcular)
+
+    def ordem_detalhe(self, versao, aba, df, equipes, horarios, coluna=None, crescente=True):
+        """Posições do detalhamento ordenado por `coluna`; as páginas saem daqui sem reordenar a tabela."""
+        det, _ = self.detalhe(versao, aba, df, equipes, horarios)
+        return self.obter(
+            (versao, aba, "ordem_detalhe", chave_filtro(equipes, horarios), coluna, crescente),
+            lambda: ordem_detalhe(det, coluna, crescente),
+        )
@@ -0,0 +1,101 @@
+"""`PlanoCompartilhado`: o feed de mudanças de metas do coordenador chega aos outros processos."""
+import hashlib
+import json
+import os
+import time
+
+import pandas as pd
+
+from painel.compartilhado import MUDANCAS, PlanoCompartilhado
+from painel.incremental import ProcessadorIncremental
+
+ABAS = ("Suporte",)
+
+
+def bruto(notas):
+    n = len(notas)
+    return pd.DataFrame({
+        "Nome": [f"Agente {i}" for i in range(n)],
+        "Equipe": ["Equipe 1"] * n,
+        "Horario": ["08:00-14:00"] * n,
+        "qtde_chat_total": [100] * n,
+        "nota_chat": notas,
+        "%_nota_chat": ["60%"] * n,
+        "tme_chat": ["00:00:30"] * n,
+        "tme_pbx": ["-"] * n,
+        "total_pbx": [0] * n,
+    }).astype(object)
+
+
+class Planilha:
+    """Fonte em memória: uma versão nova a cada troca de `notas`."""
+
+    def __init__(self, notas):
+        self.notas = notas
+        self.versao = self.resultado = self.criado_em = None
+        self.restaurado = False
+
+    def carregar(self, processar, revalidar=False):
+        versao = hashlib.sha256(repr(self.notas).encode()).hexdigest()
+        if versao != self.versao:
+            self.resultado = processar.processar_brutas({"Suporte": bruto(self.notas)})
+            self.versao, self.criado_em = versao, time.time()
+        return self.resultado
+
+
+def sem_seq(mudancas):
+    return [m._replace(seq=0) for m in mudancas]
+
+
+def test_replica_recebe_o_feed_do_coordenador(tmp_path):
+    pasta = str(tmp_path)
+    planilha = Planilha([4.0, 4.9, 4.9])
+    coordenador, proc_coord = PlanoCompartilhado(pasta, planilha, ABAS), ProcessadorIncremental(abas=ABAS)
+    replica, proc_replica = PlanoCompartilhado(pasta, Planilha([]), ABAS), ProcessadorIncremental(abas=ABAS)
+
+    coordenador.carregar(proc_coord)
+    replica.carregar(proc_replica)
+    assert coordenador.coordenador and not replica.coordenador
+    assert proc_replica.mudancas() == []
+
+    planilha.notas = [4.9, 4.0, 4.9]  # Agente 0 bateu a nota, Agente 1 saiu
+    coordenador.carregar(proc_coord)
+    replica.carregar(proc_replica)
+    assert len(proc_coord.mudancas()) == 2
+    assert sem_seq(proc_replica.mudancas()) == sem_seq(proc_coord.mudancas())
+
+    # Duas versões publicadas entre duas cargas da réplica: nenhum evento se perde nem se repete
+    vistas = proc_replica.ultima_seq
+    planilha.notas = [4.9, 4.9, 4.9]
+    coordenador.carregar(proc_coord)
+    planilha.notas = [4.9, 4.9, 4.0]
+    coordenador.carregar(proc_coord)
+    replica.carregar(proc_replica)
+    replica.carregar(proc_replica)
+    assert sem_seq(proc_replica.mudancas(vistas)) == sem_seq(proc_coord.mudancas()[2:])
+    assert [m.nome for m in proc_replica.mudancas(vistas)] == ["Agente 1", "Agente 2"]
+
+
+def test_novo_coordenador_publica_so_o_proprio_feed(tmp_path):
+    pasta = str(tmp_path)
+    planilha = Planilha([4.0, 4.9])
+    coordenador, proc_coord = PlanoCompartilhado(pasta, planilha, ABAS), ProcessadorIncremental(abas=ABAS)
+    replica, proc_replica = PlanoCompartilhado(pasta, planilha, ABAS), ProcessadorIncremental(abas=ABAS)
+    coordenador.carregar(proc_coord)
+    replica.carregar(proc_replica)
+    planilha.notas = [4.9, 4.9]
+    coordenador.carregar(proc_coord)
+    replica.carregar(proc_replica)
+    assert len(proc_replica.mudancas()) == 1
+
+    # O coordenador morre: a réplica assume, processa do zero e publica só o que ela mesma gerar
+    coordenador._lock.close()
+    coordenador._lock = None
+    planilha.notas = [4.9, 4.0]
+    replica.carregar(proc_replica)
+    assert replica.coordenador
+    planilha.notas = [4.0, 4.0]
+    replica.carregar(proc_replica)
+    with open(os.path.join(pasta, replica.versao[:12], MUDANCAS), encoding="utf-8") as f:
+        publicadas = json.load(f)["mudancas"]
+    assert [(m["nome"], m["bateu"]) for m in publicadas] == [("Agente 0", False)]
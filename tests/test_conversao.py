@@ -0,0 +1,89 @@
+"""Casos de borda das conversões em lote de `painel.conversao` (e a equivalência com as versões por célula)."""
+import datetime
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from painel.conversao import (
+    converter_tempo,
+    limpar_porcentagem,
+    nota_em_escala_5,
+    porcentagem_em_fracao,
+    tempo_em_segundos,
+    to_num,
+)
+
+# Casos de borda que precisam bater com a versão por célula
+BORDA_TEMPO = [
+    None, np.nan, pd.NaT, "-", "", "   ", "00:01:00", "1:2:3", " 01:02:03 ", "01 : 02 : 03",
+    "-1:00:00", "+1:00:00", "1_0:00:00", "01:02:03.5", "01:02", "01:02:03:04", "abc", "a:b:c",
+    "123456789012:00:00", datetime.time(1, 2, 3, 500000), datetime.datetime(1900, 1, 1, 1, 0, 7),
+    pd.Timestamp("2026-02-01 00:10:00"), datetime.timedelta(seconds=75), datetime.timedelta(days=1),
+    pd.Timedelta(seconds=30), 0, 12.5, np.float64(3.0), True,
+]
+
+BORDA_PORCENTAGEM = [
+    None, np.nan, "", " ", "%", "50%", "50,5%", " 0,5 ", "0.5", "1", "1%", "100%", "1,5", "-20%",
+    "1e2", ".5", "5.", "+7", "inf", "nan", "1_0", "abc", "1.2.3", "50 %", 0, 1, 50, 0.25, 75.0,
+    True, np.float64(0.3), np.int64(40), datetime.time(0, 0),
+]
+
+BORDA_NOTA = [
+    [0, 1, 4.5, 5, 5.0001, 6, 10, 47, 100],
+    [1, 2, 3, 4, 5],
+    [1.0, 4.9],
+    [6, 8],
+    ["4,5", "x", None, "9", 3],
+]
+
+
+@pytest.mark.parametrize(
+    "valor, segundos",
+    [
+        # vazios
+        (None, 0), (np.nan, 0), (pd.NaT, 0), ("", 0), ("   ", 0), ("-", 0),
+        # malformados
+        ("abc", 0), ("a:b:c", 0), ("01:02", 0), ("01:02:03:04", 0), ("01:02:03.5", 0),
+        # acima de 24h
+        ("25:00:00", 90_000), ("123:04:05", 443_045),
+        # negativos (só as horas levam o sinal, como no int() por parte)
+        ("-1:00:00", -3_600), ("+1:00:00", 3_600),
+        # já em timedelta: só o que str() escreve como "H:MM:SS"
+        (datetime.timedelta(seconds=75), 75), (datetime.timedelta(days=1), 0), (pd.Timedelta(seconds=30), 0),
+        # horas do Excel
+        (datetime.time(1, 2, 3), 3_723), ("00:01:00", 60), (" 01:02:03 ", 3_723),
+    ],
+)
+def test_tempo_em_segundos_casos(valor, segundos):
+    assert converter_tempo(valor) == segundos
+    assert tempo_em_segundos(pd.Series([valor], dtype=object)).tolist() == [segundos]
+
+
+def test_tempo_em_segundos_coluna_timedelta():
+    assert tempo_em_segundos(pd.Series(pd.to_timedelta([30, 90], unit="s"))).tolist() == [0, 0]
+
+
+def test_tempo_em_segundos_igual_por_celula():
+    s = pd.Series(BORDA_TEMPO, dtype=object)
+    np.testing.assert_array_equal(tempo_em_segundos(s), s.apply(converter_tempo).to_numpy(dtype=np.int64))
+
+
+@pytest.mark.parametrize(
+    "valor, fracao",
+    [("", 0.0), (None, 0.0), ("abc", 0.0), ("50%", 0.5), ("50,5%", 0.505), (" 0,5 ", 0.5), ("100%", 1.0), (75.0, 75.0)],
+)
+def test_porcentagem_em_fracao_casos(valor, fracao):
+    assert porcentagem_em_fracao(pd.Series([valor], dtype=object)).tolist() == pytest.approx([fracao])
+
+
+@pytest.mark.parametrize("serie", [pd.Series(BORDA_PORCENTAGEM, dtype=object), pd.Series([10, 0.5, np.nan, 100])])
+def test_porcentagem_em_fracao_igual_por_celula(serie):
+    esperado = serie.apply(limpar_porcentagem).to_numpy(dtype=float)
+    np.testing.assert_array_equal(porcentagem_em_fracao(serie), esperado)
+
+
+@pytest.mark.parametrize("valores", BORDA_NOTA)
+def test_nota_em_escala_5_igual_por_celula(valores):
+    base = to_num(pd.Series(valores))
+    pd.testing.assert_series_equal(nota_em_escala_5(base), base.apply(lambda x: x / 10 if x > 5 else x))
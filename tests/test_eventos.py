@@ -0,0 +1,65 @@
+"""`FonteEventos`: durações malformadas e eventos recebidos pelo socket com arquivo."""
+import json
+import socket
+import time
+
+import pytest
+
+from painel.eventos import EventoInvalido, FonteEventos, ler_evento
+
+
+def evento(**campos):
+    return {"aba": "Suporte", "tipo": "chat", "nome": "Ana", **campos}
+
+
+@pytest.mark.parametrize("duracao", ["abc", "01:02", "a:b:c", "01:02:03.5", "-1:00:00", -5, "nan"])
+def test_duracao_malformada_descarta_o_evento(duracao):
+    fonte = FonteEventos(abas=["Suporte"])
+    assert fonte.aplicar([evento(duracao=120), evento(duracao=duracao)]) == (1, 1)
+    df = fonte.carregar()[0]
+    assert df["Chat"].tolist() == [1]
+    assert df["Chat (TME) [s]"].tolist() == [120]
+
+
+@pytest.mark.parametrize("duracao, segundos", [("00:02:00", 120), (" 0:1:30 ", 90), (60, 60), (None, None)])
+def test_duracao_valida(duracao, segundos):
+    fonte = FonteEventos(abas=["Suporte"])
+    assert fonte.aplicar([evento(duracao=duracao)]) == (1, 0)
+    agregados = fonte._agregados["Suporte"]
+    c = agregados.campo
+    assert agregados.valores[0, c["chat_tme_n"]] == (segundos is not None)
+    assert agregados.valores[0, c["chat_tme"]] == (segundos or 0)
+
+
+def test_ler_evento_rejeita_linha_sem_agente():
+    with pytest.raises(EventoInvalido):
+        ler_evento(json.dumps({"aba": "Suporte", "tipo": "chat", "nome": " "}))
+
+
+def test_socket_anexa_ao_arquivo_com_um_so_handle(tmp_path, monkeypatch):
+    arquivo = tmp_path / "eventos.jsonl"
+    aberturas = []
+
+    def abrir(caminho, modo="r", *args, **kwargs):
+        aberturas.append(modo)
+        return open(caminho, modo, *args, **kwargs)
+
+    monkeypatch.setattr("painel.eventos.open", abrir, raising=False)
+    fonte = FonteEventos(abas=["Suporte"], arquivo=str(arquivo), endereco=("127.0.0.1", 0)).iniciar()
+    try:
+        with socket.create_connection(fonte._servidor.server_address[:2]) as s:
+            for i in range(200):
+                s.sendall(json.dumps(evento(nome=f"Agente {i}", duracao=60)).encode() + b"\n")
+                time.sleep(0.001)
+            s.sendall(json.dumps(evento(nome="Agente 200")).encode())  # sem "\n": anexada ao fechar
+        for _ in range(100):
+            if fonte.eventos == 201:
+                break
+            time.sleep(0.05)
+        assert fonte.eventos == 201 and fonte.invalidos == 0
+        assert len(fonte.carregar()[0]) == 201
+        assert arquivo.read_bytes().count(b"\n") == 201
+        assert aberturas.count("ab") == 2  # o `touch` de `iniciar` e o handle do socket
+    finally:
+        fonte.parar()
+    assert fonte._saida is None
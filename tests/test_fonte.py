@@ -0,0 +1,127 @@
+"""`PlanilhaRemota` contra um servidor HTTP local que serve a planilha de tests/dados com ETag e Last-Modified."""
+import email.utils
+import hashlib
+import http.server
+import os
+import threading
+
+import pytest
+
+from painel.fonte import PlanilhaRemota
+from painel.mapeamento import ABAS
+from painel.processamento import ler_planilha
+
+PLANILHA = os.path.join(os.path.dirname(__file__), "dados", "planilha.xlsx")
+
+
+class Servidor(http.server.ThreadingHTTPServer):
+    """Serve `conteudo` em qualquer caminho; responde 304 a If-None-Match / If-Modified-Since que batem."""
+
+    def __init__(self, conteudo):
+        super().__init__(("127.0.0.1", 0), Resposta)
+        self.pedidos = []  # (cabeçalhos condicionais, status) de cada GET
+        self.etags = True
+        self.trocar(conteudo, 1_700_000_000)
+
+    def trocar(self, conteudo, modificado):
+        self.conteudo = conteudo
+        self.etag = '"%s"' % hashlib.sha256(conteudo).hexdigest()[:16]
+        self.modificado = email.utils.formatdate(modificado, usegmt=True)
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.server_address[1]}/planilha.xlsx"
+
+
+class Resposta(http.server.BaseHTTPRequestHandler):
+    def do_GET(self):
+        srv = self.server
+        condicionais = {h: self.headers[h] for h in ("If-None-Match", "If-Modified-Since") if h in self.headers}
+        if srv.etags:
+            igual = condicionais.get("If-None-Match") == srv.etag
+        else:
+            igual = condicionais.get("If-Modified-Since") == srv.modificado
+        srv.pedidos.append((condicionais, 304 if igual else 200))
+        if igual:
+            self.send_response(304)
+            self.end_headers()
+            return
+        self.send_response(200)
+        if srv.etags:
+            self.send_header("ETag", srv.etag)
+        self.send_header("Last-Modified", srv.modificado)
+        self.send_header("Content-Length", str(len(srv.conteudo)))
+        self.end_headers()
+        self.wfile.write(srv.conteudo)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def servidor():
+    with open(PLANILHA, "rb") as f:
+        srv = Servidor(f.read())
+    threading.Thread(target=srv.serve_forever, daemon=True).start()
+    yield srv
+    srv.shutdown()
+    srv.server_close()
+
+
+@pytest.fixture
+def processar():
+    chamadas = []
+
+    def processar(conteudo):
+        chamadas.append(len(conteudo))
+        return ler_planilha(conteudo, "openpyxl", ABAS)
+
+    processar.chamadas = chamadas
+    return processar
+
+
+def test_get_condicional_responde_304_sem_reprocessar(servidor, processar):
+    planilha = PlanilhaRemota(servidor.url)
+    primeiro = planilha.carregar(processar)
+    assert len(primeiro) == len(ABAS) and all(len(df) > 0 for df in primeiro)
+
+    assert planilha.carregar(processar) is primeiro
+    assert processar.chamadas == [len(servidor.conteudo)]
+    (cond1, status1), (cond2, status2) = servidor.pedidos
+    assert (cond1, status1) == ({}, 200)
+    assert cond2 == {"If-None-Match": servidor.etag, "If-Modified-Since": servidor.modificado}
+    assert status2 == 304
+
+
+def test_last_modified_sem_etag(servidor, processar):
+    servidor.etags = False
+    planilha = PlanilhaRemota(servidor.url)
+    primeiro = planilha.carregar(processar)
+    assert planilha.carregar(processar) is primeiro
+    assert servidor.pedidos[-1] == ({"If-Modified-Since": servidor.modificado}, 304)
+    assert len(processar.chamadas) == 1
+
+
+def test_mesmo_conteudo_com_validadores_novos_nao_reprocessa(servidor, processar):
+    planilha = PlanilhaRemota(servidor.url)
+    primeiro = planilha.carregar(processar)
+    versao = planilha.versao
+
+    # O export do Sheets troca ETag/Last-Modified a cada pedido mesmo sem mudança: 200 com os mesmos bytes
+    servidor.trocar(servidor.conteudo, 1_700_000_060)
+    servidor.etag = '"outro"'
+    assert planilha.carregar(processar) is primeiro
+    assert servidor.pedidos[-1][1] == 200
+    assert planilha.versao == versao
+    assert len(processar.chamadas) == 1
+
+
+def test_conteudo_novo_e_processado(servidor, processar):
+    planilha = PlanilhaRemota(servidor.url)
+    primeiro = planilha.carregar(processar)
+
+    servidor.trocar(servidor.conteudo + b"\0", 1_700_000_120)  # bytes a mais no fim: o zip ainda abre
+    segundo = planilha.carregar(processar)
+    assert segundo is not primeiro
+    assert len(processar.chamadas) == 2
+    assert planilha.versao == hashlib.sha256(servidor.conteudo).hexdigest()
@@ -0,0 +1,83 @@
+"""Tendências do histórico: só a última carga de cada dia entra."""
+import datetime
+import glob
+import os
+
+import pandas as pd
+
+from painel.historico import Historico
+
+
+def carga(chat):
+    return pd.DataFrame({
+        "Nome": ["Ana", "Bruno"],
+        "Equipe": pd.Categorical(["A", "A"]),
+        "Horario": pd.Categorical(["08-14", "08-14"]),
+        "Chat": [chat, chat * 2.0],
+    })
+
+
+def test_tendencia_usa_a_ultima_carga_do_dia(tmp_path):
+    historico = Historico(str(tmp_path))
+    for dia, hora, chat in [(1, 9, 1.0), (1, 18, 10.0), (1, 12, 5.0), (2, 8, 20.0), (2, 8.5, 30.0)]:
+        quando = datetime.datetime(2026, 9, dia) + datetime.timedelta(hours=hora)
+        historico.registrar(f"v{dia}-{hora}", (carga(chat),), ["Suporte"], quando=quando.timestamp())
+
+    inicio, fim = datetime.date(2026, 9, 1), datetime.date(2026, 9, 2)
+    equipes = historico.tendencia_equipes("Suporte", ["A"], "Chat", inicio, fim)
+    assert equipes["Chat"].tolist() == [30.0, 90.0]
+    agentes = historico.tendencia_agentes("Suporte", ["Bruno"], "Chat", inicio, fim)
+    assert agentes["Chat"].tolist() == [20.0, 60.0]
+
+    assert len(historico.assinatura("Suporte", inicio, fim)) == 2
+    # Um arquivo por dia, com a última linha de cada agente
+    assert len(historico.consultar("Suporte", inicio, fim)) == 2 * 2
+    assert len(glob.glob(os.path.join(str(tmp_path), "aba=Suporte", "*", "*", "*.parquet"))) == 2
+
+
+def test_agente_ausente_na_ultima_carga_fica_com_a_anterior(tmp_path):
+    historico = Historico(str(tmp_path))
+    dia = datetime.datetime(2026, 9, 1)
+    historico.registrar("v1", (carga(1.0),), ["Suporte"], quando=(dia + datetime.timedelta(hours=9)).timestamp())
+    historico.registrar("v2", (carga(5.0).iloc[:1],), ["Suporte"], quando=(dia + datetime.timedelta(hours=18)).timestamp())
+    df = historico.consultar("Suporte", dia.date(), dia.date()).sort_values("Nome")
+    assert df["Chat"].tolist() == [5.0, 2.0]
+    assert df["versao"].tolist() == ["v2", "v1"]
+
+
+def test_assinatura_muda_a_cada_carga_nova(tmp_path):
+    historico = Historico(str(tmp_path))
+    dia = datetime.datetime(2026, 9, 1, 9)
+    historico.registrar("v1", (carga(1.0),), ["Suporte"], quando=dia.timestamp())
+    antes = historico.assinatura("Suporte", dia.date(), dia.date())
+    historico.registrar("v1", (carga(1.0),), ["Suporte"], quando=dia.timestamp() + 60)  # mesma versão: ignorada
+    assert historico.assinatura("Suporte", dia.date(), dia.date()) == antes
+    historico.registrar("v2", (carga(2.0),), ["Suporte"], quando=dia.timestamp() + 120)
+    depois = historico.assinatura("Suporte", dia.date(), dia.date())
+    assert depois != antes and depois[0][1] == "v2"
+    # Outra instância (outro processo) lê o mesmo manifesto
+    assert Historico(str(tmp_path)).assinatura("Suporte", dia.date(), dia.date()) == depois
+
+
+def test_retencao_apaga_dias_antigos(tmp_path):
+    historico = Historico(str(tmp_path), manter_dias=30)
+    for dia in [datetime.datetime(2026, 7, 1, 9), datetime.datetime(2026, 8, 20, 9), datetime.datetime(2026, 9, 1, 9)]:
+        historico.registrar(f"v{dia:%m%d}", (carga(1.0),), ["Suporte"], quando=dia.timestamp())
+    assert historico.dias("Suporte") == [datetime.date(2026, 8, 20), datetime.date(2026, 9, 1)]
+    assert not os.path.exists(os.path.join(str(tmp_path), "aba=Suporte", "mes=2026-07"))
+
+
+def test_migra_historico_de_um_arquivo_por_carga(tmp_path):
+    pasta = os.path.join(str(tmp_path), "aba=Suporte", "mes=2026-09", "dia=2026-09-01")
+    os.makedirs(pasta)
+    for hora, chat in [(9, 1.0), (18, 10.0)]:
+        momento = pd.Timestamp(2026, 9, 1, hora)
+        dados = carga(chat).assign(capturado_em=momento, versao=f"v{hora}")
+        dados.to_parquet(os.path.join(pasta, f"{hora:02d}0000_v{hora}.parquet"), index=False)
+
+    historico = Historico(str(tmp_path))
+    assert historico.dias("Suporte") == [datetime.date(2026, 9, 1)]
+    assert os.listdir(pasta) == ["fechamento.parquet"]
+    dia = datetime.date(2026, 9, 1)
+    assert historico.tendencia_agentes("Suporte", ["Ana"], "Chat", dia, dia)["Chat"].tolist() == [10.0]
+    assert historico.assinatura("Suporte", dia, dia)[0][1] == "v18"
@@ -0,0 +1,146 @@
+"""`ProcessadorIncremental`: frames iguais aos do processamento completo, feed de metas e índices atualizados."""
+import numpy as np
+import pandas as pd
+import pytest
+
+from painel import incremental
+from painel.incremental import ProcessadorIncremental
+from painel.indices import IndiceGrupos, IndiceRankings
+from painel.processamento import processar_planilha
+
+ABAS = ("Suporte",)
+
+
+def bruto(n, semente=0):
+    """Aba bruta como a planilha traz: textos de TME e porcentagem misturados, algumas linhas vazias."""
+    rng = np.random.default_rng(semente)
+    seg = rng.integers(1, 240, n)
+    df = pd.DataFrame({
+        "Nome": [f"Agente {i}" for i in range(n)],
+        "Equipe": rng.choice(["Equipe 1", "Equipe 2", "Equipe 3"], n),
+        "Horario": rng.choice(["08:00-14:00", "14:00-20:00"], n),
+        "qtde_chat_total": rng.integers(0, 300, n),
+        "nota_chat": rng.choice([4.2, 4.5, 4.8, 9.1], n),
+        "%_nota_chat": rng.choice(["45%", "60,5%", "0,3", "-"], n),
+        "tme_chat": [f"00:{s // 60:02d}:{s % 60:02d}" for s in seg],
+        "tme_pbx": rng.choice(["00:00:05", "00:00:30", "-"], n),
+        "total_pbx": rng.integers(0, 40, n),
+    }).astype(object)
+    df.iloc[::7] = None
+    return df
+
+
+def alterar(df, linhas, semente=1):
+    rng = np.random.default_rng(semente)
+    df = df.copy()
+    df.loc[df.index[linhas], "qtde_chat_total"] = rng.integers(0, 300, len(linhas))
+    df.loc[df.index[linhas], "nota_chat"] = rng.choice([3.9, 4.9, 9.5], len(linhas))
+    df.loc[df.index[linhas], "tme_chat"] = [f"00:0{s // 60}:{s % 60:02d}" for s in rng.integers(1, 240, len(linhas))]
+    return df
+
+
+def completo(df):
+    return processar_planilha({"Suporte": df}, ABAS)[0]
+
+
+@pytest.fixture(params=["parcial", "inteira"])
+def caminho(request, monkeypatch):
+    """Os dois caminhos de uma versão nova: só as linhas alteradas, ou a aba inteira de novo."""
+    if request.param == "parcial":
+        monkeypatch.setattr(incremental, "LINHAS_MINIMAS_PARCIAL", 0)
+    else:
+        monkeypatch.setattr(incremental, "FRACAO_MAXIMA_PARCIAL", 0.0)
+    return request.param
+
+
+@pytest.mark.parametrize(
+    "mudar",
+    [
+        lambda df: alterar(df, [1, 2, 10, 30]),
+        lambda df: df,  # nada mudou
+        lambda df: alterar(df, [3]).iloc[::-1],  # outra ordem
+        lambda df: pd.concat([alterar(df, [4]), df.iloc[[1]].assign(Nome="Agente novo")], ignore_index=True),
+        lambda df: alterar(df.drop(index=[5, 6]), [8]),  # agentes removidos
+    ],
+    ids=["alteradas", "igual", "reordenada", "agente_novo", "removidos"],
+)
+def test_igual_ao_processamento_completo(caminho, mudar):
+    v1 = bruto(60)
+    v2 = mudar(v1)
+    processador = ProcessadorIncremental(abas=ABAS)
+    pd.testing.assert_frame_equal(processador.processar_brutas({"Suporte": v1})[0], completo(v1))
+    pd.testing.assert_frame_equal(processador.processar_brutas({"Suporte": v2})[0], completo(v2))
+
+
+def test_nomes_vazios(caminho):
+    v1 = bruto(40)
+    v1.loc[[1, 2, 3], "Nome"] = [None, np.nan, ""]
+    v2 = alterar(v1, [2, 3, 4])
+    processador = ProcessadorIncremental(abas=ABAS)
+    for versao in (v1, v2):
+        pd.testing.assert_frame_equal(processador.processar_brutas({"Suporte": versao})[0], completo(versao))
+
+
+def test_feed_de_metas_nos_dois_sentidos():
+    v1 = bruto(20)
+    v1.loc[1:5, ["nota_chat", "tme_chat", "%_nota_chat"]] = [
+        [4.0, "00:00:30", "60%"],
+        [4.9, "00:00:30", "60%"],
+        [4.9, "00:00:30", "60%"],
+        [4.9, "00:02:00", "60%"],
+        [4.9, "00:00:30", "60%"],
+    ]
+    v2 = v1.copy()
+    v2.loc[1, "nota_chat"] = 4.9  # bateu a nota
+    v2.loc[2, "nota_chat"] = 4.0  # saiu da nota
+    v2.loc[3, "tme_chat"] = "00:02:00"  # saiu do TME
+    v2.loc[4, "tme_chat"] = "00:00:45"  # bateu o TME
+    v2.loc[5, "tme_chat"] = "-"  # TME sem dado: sem avaliação
+
+    processador = ProcessadorIncremental(abas=ABAS)
+    processador.processar_brutas({"Suporte": v1})
+    assert processador.mudancas() == []
+    processador.processar_brutas({"Suporte": v2})
+
+    feed = {(m.nome, m.coluna): (m.bateu, m.antes, m.depois) for m in processador.mudancas()}
+    assert feed == {
+        ("Agente 1", "Chat (nota)"): (True, 4.0, 4.9),
+        ("Agente 2", "Chat (nota)"): (False, 4.9, 4.0),
+        ("Agente 3", "Chat (TME)"): (False, 30.0, 120.0),
+        ("Agente 4", "Chat (TME)"): (True, 120.0, 45.0),
+        ("Agente 5", "Chat (TME)"): (None, 30.0, 0.0),
+    }
+    assert [m.seq for m in processador.mudancas()] == sorted(m.seq for m in processador.mudancas())
+    ultima = processador.ultima_seq
+    processador.processar_brutas({"Suporte": v2})
+    assert processador.mudancas(ultima) == []
+
+
+def test_indices_atualizados_iguais_aos_montados(caminho):
+    v1 = bruto(200)
+    v2 = alterar(v1, [1, 9, 50, 51, 120])
+    processador = ProcessadorIncremental(abas=ABAS)
+    antes = processador.processar_brutas({"Suporte": v1})[0]
+    depois = processador.processar_brutas({"Suporte": v2})[0]
+    posicoes = processador.alteradas("Suporte", antes, depois)
+    assert posicoes is not None and len(posicoes) > 0
+
+    grupos, ref_grupos = IndiceGrupos(antes).atualizado(depois, posicoes), IndiceGrupos(depois)
+    assert grupos.agregados.keys() == ref_grupos.agregados.keys()
+    for nome, valores in ref_grupos.agregados.items():
+        np.testing.assert_array_equal(grupos.agregados[nome], valores)
+    np.testing.assert_array_equal(grupos.ordem, ref_grupos.ordem)
+
+    rankings, ref_rankings = IndiceRankings(antes).atualizado(depois, posicoes), IndiceRankings(depois)
+    for nome, ordem in ref_rankings.ordens.items():
+        np.testing.assert_array_equal(rankings.ordens[nome], ordem)
+
+
+def test_indice_de_grupos_nao_aproveita_troca_de_grupo():
+    v1 = bruto(50)
+    v2 = v1.copy()
+    v2.loc[1, "Equipe"] = "Equipe 2" if v1.loc[1, "Equipe"] != "Equipe 2" else "Equipe 3"
+    processador = ProcessadorIncremental(abas=ABAS)
+    antes = processador.processar_brutas({"Suporte": v1})[0]
+    depois = processador.processar_brutas({"Suporte": v2})[0]
+    assert IndiceGrupos(antes).atualizado(depois, processador.alteradas("Suporte", antes, depois)) is None
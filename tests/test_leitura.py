@@ -0,0 +1,20 @@
+"""`escolher_leitor`: medição num caminho fixo e o leitor "csv" fora do modo "auto"."""
+import json
+import os
+
+from painel import leitura
+from painel.leitura import escolher_leitor
+
+
+def test_medicao_na_raiz_do_repositorio():
+    # O mesmo caminho que benchmarks/bench_leitores.py grava, qualquer que seja o diretório de trabalho
+    raiz = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    assert leitura.MEDICAO == os.path.join(raiz, ".leitor.json")
+    assert escolher_leitor.__defaults__ == ("auto", leitura.MEDICAO)
+
+
+def test_auto_nao_escolhe_leitor_experimental(tmp_path):
+    medicao = tmp_path / ".leitor.json"
+    medicao.write_text(json.dumps({"leitor": "csv"}), encoding="utf-8")
+    assert escolher_leitor("auto", medicao=str(medicao)) in leitura.PREFERENCIA
+    assert escolher_leitor("csv", medicao=str(medicao)) == "csv"
@@ -0,0 +1,61 @@
+"""`FontesMultiplas`: pastas de snapshots pelo nome da fonte e uma leitura da planilha por fonte."""
+import logging
+import os
+
+import pytest
+
+import painel.registro
+from painel.mapeamento import ABAS, COLUNA_FONTE
+from painel.registro import FonteRegistrada, FontesMultiplas, pasta_fonte
+
+PLANILHA = os.path.join(os.path.dirname(__file__), "dados", "planilha.xlsx")
+
+
+def fonte(nome, abas=tuple(ABAS)):
+    return FonteRegistrada(nome, PLANILHA, tuple(abas), {})
+
+
+@pytest.mark.parametrize(
+    "nome, pasta",
+    [("Atendimento 2026-10", "Atendimento_2026-10"), ("Cobrança/Parceiros", "Cobrança_Parceiros"), ("../..", "_")],
+)
+def test_pasta_fonte(nome, pasta):
+    assert pasta_fonte(nome) == pasta
+
+
+def test_snapshots_por_nome_da_fonte(tmp_path):
+    fontes = FontesMultiplas([fonte("Atendimento 2026-10"), fonte("Parceiros", ABAS[:1])], snapshots_dir=str(tmp_path))
+    frames = fontes.carregar()
+    assert sorted(os.listdir(tmp_path)) == ["Atendimento_2026-10", "Parceiros"]
+    assert frames[0][COLUNA_FONTE].cat.categories.tolist() == ["Atendimento 2026-10", "Parceiros"]
+
+    # Reordenar o registro não troca os snapshots de fonte
+    invertidas = FontesMultiplas([fonte("Parceiros", ABAS[:1]), fonte("Atendimento 2026-10")], snapshots_dir=str(tmp_path))
+    assert [p.snapshots.pasta for p in invertidas.planilhas] == [
+        os.path.join(str(tmp_path), "Parceiros"), os.path.join(str(tmp_path), "Atendimento_2026-10")
+    ]
+
+
+def test_nomes_que_dao_a_mesma_pasta(tmp_path):
+    with pytest.raises(ValueError):
+        FontesMultiplas([fonte("Atendimento 2026"), fonte("Atendimento/2026")], snapshots_dir=str(tmp_path))
+
+
+def test_leitor_csv_avisa_e_usa_openpyxl(caplog):
+    with caplog.at_level(logging.WARNING, logger="painel.registro"):
+        fontes = FontesMultiplas([fonte("A")], leitor="csv")
+    assert fontes.leitor == "openpyxl"
+    assert "csv" in caplog.text
+
+
+def test_planilha_lida_uma_vez_por_fonte(monkeypatch):
+    leituras = []
+    ler_brutas = painel.registro.ler_brutas
+
+    def contar(conteudo, leitor, abas, filas):
+        leituras.append(tuple(abas))
+        return ler_brutas(conteudo, leitor, abas, filas)
+
+    monkeypatch.setattr(painel.registro, "ler_brutas", contar)
+    FontesMultiplas([fonte("A"), fonte("B")], paralelo=False).carregar()
+    assert leituras == [tuple(ABAS), tuple(ABAS)]